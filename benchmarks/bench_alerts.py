@@ -0,0 +1,76 @@
+"""Compares syncing supervisor alerts one call at a time with AlertReconciler.
+
+Each run syncs an empty domain to --alerts alerts, then changes half of them,
+removes a quarter and adds a quarter, against a stand-in that adds --rest-latency
+seconds to every REST call.
+
+Run from the repository root:
+    python -m benchmarks.bench_alerts --alerts 500 --rest-latency 0.02
+"""
+import argparse
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.alerts import AlertReconciler
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.standin import Five9StandIn
+
+
+def desired_sets(alerts):
+    initial = [
+        {"name": f"alert-{index}", "threshold": 10, "skillId": str(index % 20)}
+        for index in range(alerts)
+    ]
+    changed = [
+        {**alert, "threshold": 20} if index % 2 else alert
+        for index, alert in enumerate(initial[: alerts * 3 // 4])
+    ] + [
+        {"name": f"new-alert-{index}", "threshold": 5, "skillId": "1"}
+        for index in range(alerts // 4)
+    ]
+    return initial, changed
+
+
+def sync_serially(client, reconciler, desired):
+    """One blocking call per change, as syncing was done before"""
+    changes = reconciler.diff(client.supervisor.GetAlerts.invoke(), desired)
+    for change in changes:
+        if change.action == "create":
+            client.supervisor.CreateAlert.invoke(change.desired)
+        elif change.action == "update":
+            client.supervisor.UpdateAlert.invoke(change.alert_id, change.desired)
+        else:
+            client.supervisor.DeleteAlert.invoke(change.alert_id)
+    return len(changes)
+
+
+def sync_reconciled(client, reconciler, desired):
+    results = reconciler.reconcile(desired)
+    assert all(result.ok for result in results), [r for r in results if not r.ok][:3]
+    return len(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=500)
+    parser.add_argument("--rest-latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    for label, sync in (("serial", sync_serially), ("reconciled", sync_reconciled)):
+        with Five9StandIn(rest_latency=args.rest_latency) as standin:
+            client = Five9RestClient(
+                username="bench", password="bench", **standin.client_options()
+            )
+            reconciler = AlertReconciler(client, concurrency=args.concurrency)
+            for phase, desired in zip(("initial", "changed"), desired_sets(args.alerts)):
+                started = time.perf_counter()
+                changes = sync(client, reconciler, desired)
+                elapsed = time.perf_counter() - started
+                print(f"{label:<10} {phase:<8} {changes:>5} changes  {elapsed:>7.2f} s")
+            # the stand-in now holds exactly the desired set
+            assert not reconciler.diff(list(standin.alerts.values()), desired)
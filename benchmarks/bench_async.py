@@ -0,0 +1,60 @@
+"""Compares sequential invoke() calls with concurrent ainvoke() calls on one loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_async --calls 500 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.async_transport import Five9AsyncHttpTransport
+from five9_agent_sup_rest.methods.supervisor_methods import DomainQueues
+from five9_agent_sup_rest.transport import Five9HttpTransport
+
+from benchmarks.standin import StandInServer, StandInSessionConfig
+
+
+def run_sequential(method, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        method.invoke()
+    return calls / (time.perf_counter() - started)
+
+
+async def run_concurrent(method, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            return await method.ainvoke()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    await method.config.async_transport.close()
+    return calls / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    with StandInServer() as server:
+        config = StandInSessionConfig(
+            server.base_url,
+            transport=Five9HttpTransport(verify=False),
+            async_transport=Five9AsyncHttpTransport(verify=False),
+            # every call goes to the stand-in, the queues are not cached
+            reference_data_ttl={"DomainQueues": None},
+        )
+        method = DomainQueues(config)
+
+        print(f"invoke()  sequential        {run_sequential(method, args.calls):>10.1f} calls/s")
+        rate = asyncio.run(run_concurrent(method, args.calls, args.concurrency))
+        print(f"ainvoke() concurrency {args.concurrency:<5} {rate:>10.1f} calls/s")
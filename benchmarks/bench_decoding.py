@@ -0,0 +1,73 @@
+"""Measures websocket frame decoding throughput and allocations per frame.
+
+Compares the original json.loads of every frame with Five9FrameDecoder, both for
+frames that are fully decoded and for frames routed to the generic handler, which
+are only peeked.
+
+Run from the repository root:
+    python -m benchmarks.bench_decoding --queues 2000 --frames 2000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from five9_agent_sup_rest.decoding import Five9FrameDecoder
+
+
+def make_statistics_frame(eventId, queues):
+    rows = [
+        {
+            "id": str(queue_id),
+            "callsInQueue": queue_id % 7,
+            "callbacksInQueue": 0,
+            "longestQueueTime": queue_id * 3,
+            "currentLongestQueueTime": queue_id * 2,
+            "agentsLoggedIn": 12,
+            "agentsReady": 4,
+        }
+        for queue_id in range(queues)
+    ]
+    return json.dumps(
+        {
+            "context": {"eventId": eventId, "eventReason": "UPDATED"},
+            "payLoad": [{"dataSource": "ACD_STATUS", "data": rows}],
+        }
+    )
+
+
+def measure(label, decode, frame, frames):
+    started = time.perf_counter()
+    for _ in range(frames):
+        decode(frame)
+    rate = frames / (time.perf_counter() - started)
+
+    tracemalloc.start()
+    sample = min(frames, 50)
+    for _ in range(sample):
+        decode(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<34} {rate:>10.1f} frames/s  peak {peak / 1024:>9.1f} KiB/frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queues", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    frame = make_statistics_frame("5000", args.queues)
+    print(f"frame size: {len(frame) / 1024:.1f} KiB")
+
+    decoder = Five9FrameDecoder()
+    stdlib_decoder = Five9FrameDecoder(loads=json.loads)
+
+    def peek_and_defer(raw):
+        return decoder.lazy(raw, decoder.peek_event_id(raw))
+
+    measure("json.loads (original)", json.loads, frame, args.frames)
+    measure("Five9FrameDecoder stdlib decode", stdlib_decoder.decode, frame, args.frames)
+    measure("Five9FrameDecoder default decode", decoder.decode, frame, args.frames)
+    measure("peek + lazy (generic handler)", peek_and_defer, frame, args.frames)
@@ -0,0 +1,88 @@
+"""Measures the socket reader's cost per frame, from peeking the eventId to queueing
+the event for its handler.
+
+Frames are read from an in-memory websocket, so the time covers routing, queueing
+and running the handlers without any network I/O.  Handled frames go to the 1202 handler, unhandled frames carry eventIds
+with no handler and go to the fallback handler.  Each case runs with the socket
+metrics disabled and enabled, to show the cost of the instrumentation.
+
+Run from the repository root:
+    python -m benchmarks.bench_dispatch --frames 200000
+"""
+import argparse
+import asyncio
+import json
+import time
+import types
+
+from five9_agent_sup_rest.client import Five9Socket
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+
+
+class InMemoryWebSocket:
+    def __init__(self, frames):
+        self.frames = frames
+
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+
+
+def make_client(metrics_enabled):
+    client = types.SimpleNamespace(
+        session_configuration=types.SimpleNamespace(
+            host="127.0.0.1", port=443, username="bench"
+        ),
+        socket_json_loads=None,
+        socket_reconnect_options={},
+        socket_dispatch_options={},
+        socket_metrics_options={"enabled": metrics_enabled},
+        metrics=Five9MetricsRegistry(),
+        login_state_cache=LoginStateCache(),
+        custom_socket_handlers=[],
+    )
+    client.socket_handler_registry = SocketHandlerRegistry(client)
+    return client
+
+
+def frame(eventId):
+    return json.dumps(
+        {"context": {"eventId": eventId, "eventReason": "BENCH"}, "payLoad": "x" * 200}
+    )
+
+
+async def measure(label, frames, metrics_enabled):
+    from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+
+    socket = Five9Socket(make_client(metrics_enabled), "supervisor", "bench")
+    socket.build_handlers()
+    socket.dispatcher = Five9EventDispatcher(
+        metrics=socket.metrics, **socket.client.socket_dispatch_options
+    )
+
+    started = time.perf_counter()
+    await socket.handle_messages(InMemoryWebSocket(frames))
+    elapsed = time.perf_counter() - started
+    channels = len(socket.dispatcher.channels)
+    await socket.dispatcher.close()
+
+    label = f"{label}, metrics {'on' if metrics_enabled else 'off'}"
+    print(
+        f"{label:<40} {elapsed / len(frames) * 1e6:>8.2f} us/frame"
+        f"  {channels:>4} handler queues"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200000)
+    args = parser.parse_args()
+
+    handled = [frame("1202")] * args.frames
+    unhandled = [frame(str(9000 + index % 200)) for index in range(args.frames)]
+
+    for metrics_enabled in (False, True):
+        asyncio.run(measure("handled eventId", handled, metrics_enabled))
+        asyncio.run(measure("unhandled eventIds (200)", unhandled, metrics_enabled))
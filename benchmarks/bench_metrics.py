@@ -0,0 +1,78 @@
+"""Measures the per-call cost of the REST call metrics.
+
+Times Five9MetricsRegistry.record() on its own, then GetAlerts calls against the
+local stand-in with metrics enabled and disabled, alternating rounds so drift in
+the machine affects both alike.  The overhead is reported against the mean call;
+on a loaded machine the end-to-end difference is within the noise of the calls,
+and record() against the call time is the more precise figure.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics --calls 2000 --rounds 5
+"""
+import argparse
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.methods.supervisor_methods import GetAlerts
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+from five9_agent_sup_rest.transport import Five9HttpTransport
+
+from benchmarks.standin import StandInServer, StandInSessionConfig
+
+
+def time_record(iterations):
+    metrics = Five9MetricsRegistry()
+    started = time.perf_counter()
+    for i in range(iterations):
+        metrics.record("Supervisor:GetAlerts", 200, (i % 100) / 1000, 0, 250)
+    return (time.perf_counter() - started) / iterations
+
+
+def time_calls(method, calls):
+    request = method.build_request()
+    started = time.perf_counter()
+    for _ in range(calls):
+        method.send(request)
+    return (time.perf_counter() - started) / calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    record_seconds = time_record(200_000)
+    print(f"record()            {record_seconds * 1e6:>8.2f} us")
+
+    with StandInServer(use_tls=True) as server:
+        transport = Five9HttpTransport(verify=False)
+        methods = {
+            enabled: GetAlerts(
+                StandInSessionConfig(
+                    server.base_url,
+                    transport=transport,
+                    metrics=Five9MetricsRegistry(enabled=enabled),
+                )
+            )
+            for enabled in (False, True)
+        }
+        # warm the connection
+        time_calls(methods[False], 50)
+
+        totals = {False: 0.0, True: 0.0}
+        for round_index in range(args.rounds):
+            order = (False, True) if round_index % 2 == 0 else (True, False)
+            for enabled in order:
+                totals[enabled] += time_calls(methods[enabled], args.calls)
+        transport.close()
+
+    disabled = totals[False] / args.rounds
+    enabled = totals[True] / args.rounds
+    print(f"call, disabled      {disabled * 1e6:>8.1f} us")
+    print(f"call, enabled       {enabled * 1e6:>8.1f} us")
+    print(f"measured overhead   {(enabled - disabled) / disabled * 100:>8.2f} %")
+    print(f"record() / call     {record_seconds / disabled * 100:>8.2f} %")
@@ -0,0 +1,91 @@
+"""Compares creating every REST method per client with lazily created namespaces.
+
+Each run builds REST namespaces for many clients over a catalog of generated
+supervisor methods, in a fresh process, and reports construction time and RSS per
+client.  Every client calls the same three methods.
+
+Run from the repository root:
+    python -m benchmarks.bench_namespaces --clients 1000 --catalog 20 500
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from five9_agent_sup_rest.client import METHOD_REGISTRIES, Five9RestClient
+from five9_agent_sup_rest.methods.base import Five9Request, SupervisorRestMethod
+
+from benchmarks.bench_sessions import rss_bytes
+from benchmarks.standin import StandInSessionConfig
+
+
+def generate_catalog(size):
+    return {
+        f"GeneratedMethod{index}": type(
+            f"GeneratedMethod{index}",
+            (SupervisorRestMethod,),
+            {"build_request": lambda self: Five9Request("GET", "/generated")},
+        )
+        for index in range(size)
+    }
+
+
+class EagerNamespace:
+    """The namespace as it was before, every method created up front"""
+
+    def __init__(self, target_module, session_configuration):
+        for name, method_class in METHOD_REGISTRIES[target_module].items():
+            setattr(self, name, method_class(session_configuration))
+
+
+def measure(mode, clients, catalog):
+    METHOD_REGISTRIES["generated_methods"] = generate_catalog(catalog)
+    namespace_class = EagerNamespace if mode == "eager" else Five9RestClient.RESTNamespace
+    called = list(METHOD_REGISTRIES["generated_methods"])[:3]
+
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    namespaces = []
+    for _ in range(clients):
+        # one session configuration per client, as each client logs in separately
+        namespace = namespace_class("generated_methods", StandInSessionConfig(""))
+        for name in called:
+            getattr(namespace, name)
+        namespaces.append(namespace)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "catalog": catalog,
+        "us_per_client": elapsed / clients * 1e6,
+        "rss_per_client_kib": (rss_bytes() - rss_before) / clients / 1024,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--catalog", type=int, nargs="+", default=[20, 500])
+    parser.add_argument("--mode", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.clients, args.catalog[0])))
+        sys.exit(0)
+
+    for catalog in args.catalog:
+        for mode in ("eager", "lazy"):
+            child = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_namespaces", "--mode", mode,
+                 "--clients", str(args.clients), "--catalog", str(catalog)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            print(
+                f"catalog {result['catalog']:>5}  {result['mode']:<5}"
+                f"  {result['us_per_client']:>9.1f} us/client"
+                f"  RSS {result['rss_per_client_kib']:>8.1f} KiB/client"
+            )
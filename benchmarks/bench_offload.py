@@ -0,0 +1,170 @@
+"""Compares running a CPU heavy handler on the socket's event loop with running it
+in a process pool.
+
+--frames 5000 statistics snapshots of --queues queues arrive --interval seconds
+apart, and the handler computes service level figures from every queue's recent
+wait times, 10 to 15 ms of pure Python per snapshot by default.  Each mode replays
+the same frames through Five9Socket and reports the time until every snapshot is
+handled, how far the reader fell behind the arrival schedule and the longest
+stall of a 5 ms ticker on the loop, which stands in for the ping loop.
+
+Modes: the handler on the loop, a ProcessPoolEventHandler with one worker (every
+snapshot in order) and one with --workers workers keyed by the snapshot's
+partition, so snapshots of a partition stay in order.
+
+Run from the repository root:
+    python -m benchmarks.bench_offload --frames 100 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import types
+
+from five9_agent_sup_rest.client import Five9Socket
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.methods.default_socket_handlers import (
+    ProcessPoolEventHandler,
+    SocketEventHandler,
+)
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+from five9_agent_sup_rest.offload import process_pool, shutdown_process_pools
+
+
+PARTITION_PATTERN = re.compile(r'"partition"\s*:\s*(\d+)')
+
+
+def snapshot_frame(sequence, queues, partitions):
+    return json.dumps(
+        {
+            "context": {
+                "eventId": "5000",
+                "eventReason": "UPDATED",
+                "partition": sequence % partitions,
+            },
+            "payLoad": [
+                {
+                    "dataSource": "ACD_STATUS",
+                    "data": [
+                        {
+                            "id": str(queue_id),
+                            "waitTimes": [
+                                (queue_id * 31 + sample * 17 + sequence) % 300
+                                for sample in range(50)
+                            ],
+                        }
+                        for queue_id in range(1, queues + 1)
+                    ],
+                }
+            ],
+        }
+    )
+
+
+def service_levels(event):
+    """Share of each queue's calls answered within 20, 30 and 60 seconds, and the
+    90th percentile wait"""
+    levels = {}
+    for row in event["payLoad"][0]["data"]:
+        waits = sorted(row["waitTimes"])
+        levels[row["id"]] = (
+            [sum(1 for wait in waits if wait <= limit) / len(waits) for limit in (20, 30, 60)],
+            waits[int(len(waits) * 0.9)],
+        )
+    return len(levels)
+
+
+class InlineHandler(SocketEventHandler):
+    eventId = "5000"
+
+    async def handle(self, event):
+        return service_levels(event)
+
+
+class OffloadedHandler(ProcessPoolEventHandler):
+    eventId = "5000"
+
+    @staticmethod
+    def process_event(event):
+        return service_levels(event)
+
+
+class KeyedOffloadedHandler(OffloadedHandler):
+    workers = 4
+
+    def dispatch_key(self, event):
+        # read from the raw frame, so the reader does not decode the snapshot
+        return PARTITION_PATTERN.search(event.raw).group(1)
+
+
+def make_client(handler):
+    client = types.SimpleNamespace(
+        session_configuration=types.SimpleNamespace(
+            host="127.0.0.1", port=443, username="bench"
+        ),
+        socket_json_loads=None,
+        socket_reconnect_options={},
+        socket_dispatch_options={"queue_size": 10000},
+        socket_metrics_options={},
+        socket_record_path=None,
+        socket_record_options={},
+        metrics=Five9MetricsRegistry(),
+        login_state_cache=LoginStateCache(),
+        custom_socket_handlers=[handler],
+    )
+    client.socket_handler_registry = SocketHandlerRegistry(
+        client, client.custom_socket_handlers
+    )
+    return client
+
+
+async def tick(stalls):
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        stalls.append(time.perf_counter() - started - 0.005)
+
+
+async def run(label, handler, frames):
+    socket = Five9Socket(make_client(handler), "supervisor", "bench")
+    stalls = []
+    ticker = asyncio.create_task(tick(stalls))
+    stats = await socket.replay(frames, speed=1)
+    ticker.cancel()
+    print(
+        f"{label:<24} {stats['elapsed']:>7.2f}s handled"
+        f"  behind {stats['behind']:>6.2f}s"
+        f"  longest loop stall {max(stalls) * 1000:>7.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--queues", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    KeyedOffloadedHandler.workers = args.workers
+    frames = [
+        (
+            1_700_000_000 + sequence * args.interval,
+            snapshot_frame(sequence, args.queues, args.workers),
+        )
+        for sequence in range(args.frames)
+    ]
+    started = time.perf_counter()
+    service_levels(json.loads(frames[0][1]))
+    print(f"decode and handle one snapshot {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    # started before timing, spawning the pool processes takes a moment
+    pool = process_pool()
+    list(pool.map(abs, range(100)))
+
+    asyncio.run(run("on the event loop", InlineHandler, frames))
+    asyncio.run(run("process pool, 1 worker", OffloadedHandler, frames))
+    asyncio.run(run(f"process pool, {args.workers} workers", KeyedOffloadedHandler, frames))
+    shutdown_process_pools()
@@ -0,0 +1,73 @@
+"""Measures sustained throughput against a server that throttles above a fixed rate.
+
+Workers call GetAlerts in a loop and retry throttled calls straight away, as a bulk
+job would, against a stand-in that answers calls above --server-limit per second
+with a 429 and Retry-After: 1.  Each limiter setting reports the successful calls
+per second, the throttled responses and the time callers spent waiting.
+
+Run from the repository root:
+    python -m benchmarks.bench_rate_limit --server-limit 50 --duration 5
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.standin import Five9StandIn
+
+
+async def hammer(client, workers, duration):
+    method = client.supervisor.GetAlerts
+    deadline = time.monotonic() + duration
+    succeeded = 0
+
+    async def worker():
+        nonlocal succeeded
+        while time.monotonic() < deadline:
+            response = await method.asend(method.build_request())
+            if response.status_code < 400:
+                succeeded += 1
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    await client.aclose()
+    return succeeded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server-limit", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.basicConfig(level=logging.ERROR)
+
+    settings = {
+        "no limiter": {"throttle_statuses": ()},
+        "Retry-After only": {},
+        "adaptive from 2x": {"rate": args.server_limit * 2},
+        "fixed at 90%": {"rate": args.server_limit * 0.9, "adaptive": False},
+    }
+    for label, options in settings.items():
+        with Five9StandIn(rest_rate_limit=args.server_limit) as standin:
+            client = Five9RestClient(
+                username="bench",
+                password="bench",
+                rate_limit_options=options,
+                # the workers retry themselves, the limiter alone is measured
+                retry_options={"max_attempts": 1},
+                **standin.client_options(),
+            )
+            succeeded = asyncio.run(hammer(client, args.workers, args.duration))
+            stats = client.rate_limiter.stats()
+            print(
+                f"{label:<18} {succeeded / args.duration:>7.1f} ok/s"
+                f"  {standin.throttled:>6} throttled"
+                f"  waited {stats['wait_seconds']:>8.1f} s total"
+                f"  max wait {stats['max_wait']:>5.2f} s"
+            )
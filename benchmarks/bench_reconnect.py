@@ -0,0 +1,62 @@
+"""Measures how long a supervisor socket takes to recover from dropped connections.
+
+Each round closes the websocket on the stand-in and waits for the socket to
+reconnect; with --revoke the token is also revoked, so the client logs in again.
+
+Run from the repository root:
+    python -m benchmarks.bench_reconnect --rounds 20
+"""
+import argparse
+import asyncio
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.standin import Five9StandIn
+
+
+async def run_rounds(standin, client, rounds, revoke):
+    socket = client.supervisor_socket
+    run_task = asyncio.create_task(socket.run())
+
+    while not socket.connected:
+        await asyncio.sleep(0.01)
+
+    for _ in range(rounds):
+        reconnects = socket.reconnect_metrics.reconnects
+        await asyncio.to_thread(standin.drop_connections, revoke)
+        while socket.reconnect_metrics.reconnects == reconnects:
+            await asyncio.sleep(0.005)
+
+    await socket.stop()
+    await run_task
+    return socket.reconnect_metrics.snapshot()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--revoke", action="store_true")
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    with Five9StandIn() as standin:
+        client = Five9RestClient(
+            username="bench", password="bench", **standin.client_options()
+        )
+        client.initialize_supervisor_session()
+
+        started = time.perf_counter()
+        metrics = asyncio.run(run_rounds(standin, client, args.rounds, args.revoke))
+        elapsed = time.perf_counter() - started
+
+        print(f"rounds               {args.rounds:>10}")
+        print(f"reconnects           {metrics['reconnects']:>10}")
+        print(f"relogins             {metrics['relogins']:>10}")
+        print(f"failed attempts      {metrics['failed_attempts']:>10}")
+        print(f"mean time to recover {metrics['mean_time_to_recover'] * 1000:>10.1f} ms")
+        print(f"max time to recover  {metrics['max_time_to_recover'] * 1000:>10.1f} ms")
+        print(f"elapsed              {elapsed:>10.2f} s")
@@ -0,0 +1,128 @@
+"""Replays a websocket frame log through the queue statistics alert handlers.
+
+Without --log, a log is generated: a 5000 snapshot of --queues queues followed by
+--updates 5012 ACD_STATUS updates --interval seconds apart, as the stand-in sends
+them.  The log is replayed through the StatsEvent5000Handler and
+StatsEvent5012Handler of examples/queue_alert_demo.py, once as fast as the socket
+reads it and once at --speed times real time, and the handler time and how far
+the replay fell behind its schedule are reported.  Record a production log with
+the socket_record_path client argument to benchmark against real traffic.
+
+Run from the repository root:
+    python -m benchmarks.bench_replay --queues 200 --updates 500 --speed 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import types
+
+from five9_agent_sup_rest.client import Five9Socket
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+from five9_agent_sup_rest.recording import Five9FrameRecorder, read_frames
+
+from benchmarks.standin import Five9StandIn
+from examples.queue_alert_demo import (
+    QueueStatistics,
+    StatsEvent5000Handler,
+    StatsEvent5012Handler,
+)
+
+
+def write_log(path, queues, updates, interval):
+    standin = Five9StandIn(queues=queues)
+    started = 1_700_000_000.0
+    with Five9FrameRecorder(path) as recorder:
+        snapshot = {
+            "context": {"eventId": "5000", "eventReason": "UPDATED"},
+            "payLoad": [{"dataSource": "ACD_STATUS", "data": standin.acd_status_rows()}],
+        }
+        recorder.record(json.dumps(snapshot), started)
+        for sequence in range(1, updates + 1):
+            received_at = started + sequence * interval
+            update = {
+                "context": {
+                    "eventId": "5012",
+                    "eventReason": "UPDATED",
+                    "timestamp": int((received_at - 0.05) * 1000),
+                },
+                "payLoad": [
+                    {
+                        "dataSource": "ACD_STATUS",
+                        "added": [],
+                        "updated": standin.acd_status_rows(sequence),
+                        "removed": [],
+                    }
+                ],
+            }
+            recorder.record(json.dumps(update), received_at)
+
+
+def make_client(queues):
+    client = types.SimpleNamespace(
+        session_configuration=types.SimpleNamespace(
+            host="127.0.0.1", port=443, username="bench"
+        ),
+        socket_json_loads=None,
+        socket_reconnect_options={},
+        socket_dispatch_options={},
+        socket_metrics_options={},
+        socket_record_path=None,
+        socket_record_options={},
+        metrics=Five9MetricsRegistry(),
+        login_state_cache=LoginStateCache(),
+        custom_socket_handlers=[StatsEvent5000Handler, StatsEvent5012Handler],
+        # the handlers fetch the queue names over REST on first use
+        extensions={
+            "queue_statistics": QueueStatistics(
+                queue_mapping_info=[
+                    {"id": str(queue_id), "name": f"Queue {queue_id}"}
+                    for queue_id in range(1, queues + 1)
+                ]
+            )
+        },
+    )
+    client.socket_handler_registry = SocketHandlerRegistry(
+        client, client.custom_socket_handlers
+    )
+    return client
+
+
+async def replay(frames, speed, queues):
+    socket = Five9Socket(make_client(queues), "supervisor", "bench")
+    stats = await socket.replay(frames, speed=speed)
+    handler_seconds = socket.metrics.snapshot()["events"]["5012"]["handler_seconds"]
+
+    label = "max speed" if not speed else f"{speed:g}x real time"
+    print(
+        f"{label:<16} {stats['frames']:>7} frames {stats['elapsed']:>7.2f}s"
+        f" {stats['frames_per_second']:>9.0f} frames/s"
+        f"  5012 handler mean {handler_seconds['mean'] * 1e3:>6.2f} ms"
+        f" p99 <= {handler_seconds['p99'] * 1e3:>6.2f} ms"
+        f"  behind {stats['behind']:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", default=None, help="frame log to replay")
+    parser.add_argument("--queues", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--speed", type=float, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.log
+        if path is None:
+            path = os.path.join(directory, "frames.log.gz")
+            write_log(path, args.queues, args.updates, args.interval)
+            print(f"generated log    {os.path.getsize(path) / 1024:>7.0f} KiB")
+        # read once so decompression is not part of the replay
+        frames = list(read_frames(path))
+
+        asyncio.run(replay(frames, None, args.queues))
+        asyncio.run(replay(frames, args.speed, args.queues))
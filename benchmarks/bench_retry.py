@@ -0,0 +1,81 @@
+"""Measures REST call tail latency and failures against a flaky server.
+
+The stand-in answers --fail-rate of calls with a 503 and holds --hang-rate of calls
+for --hang-seconds.  GetAlerts is called --calls times without retries and with
+the retry policy and a short per-call timeout; each setting reports the p50, p99
+and max latency of a call, including its retries, and the calls that failed.
+
+Run from the repository root:
+    python -m benchmarks.bench_retry --calls 500 --fail-rate 0.05 --hang-rate 0.01
+"""
+import argparse
+import logging
+import statistics
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.exceptions import Five9RequestError
+
+from benchmarks.standin import Five9StandIn
+
+
+def run_calls(client, calls, timeout):
+    method = client.supervisor.GetAlerts
+    latencies = []
+    failed = 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            response = method.send(method.build_request(), timeout=timeout)
+            if response.status_code >= 400:
+                failed += 1
+        except Five9RequestError:
+            failed += 1
+        latencies.append(time.perf_counter() - started)
+    return latencies, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    parser.add_argument("--hang-rate", type=float, default=0.01)
+    parser.add_argument("--hang-seconds", type=float, default=3)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.basicConfig(level=logging.CRITICAL)
+
+    settings = {
+        "no retries": ({"max_attempts": 1}, None),
+        "retries": ({}, None),
+        f"retries, {args.timeout}s timeout": ({}, (args.timeout, args.timeout)),
+    }
+    for label, (retry_options, timeout) in settings.items():
+        with Five9StandIn(
+            fail_rate=args.fail_rate,
+            hang_rate=args.hang_rate,
+            hang_seconds=args.hang_seconds,
+            seed=args.seed,
+        ) as standin:
+            client = Five9RestClient(
+                username="bench",
+                password="bench",
+                retry_options=retry_options,
+                **standin.client_options(),
+            )
+            latencies, failed = run_calls(client, args.calls, timeout)
+            client.close()
+
+        latencies.sort()
+        print(
+            f"{label:<26}"
+            f" p50 {statistics.median(latencies) * 1000:>7.1f} ms"
+            f"  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.1f} ms"
+            f"  max {latencies[-1] * 1000:>7.1f} ms"
+            f"  {failed:>4} failed"
+        )
@@ -0,0 +1,126 @@
+"""Measures memory and CPU per session for Five9SessionManager.
+
+Each session count runs in a fresh process against a stand-in served from another
+process, so the numbers only include the client side.
+
+Run from the repository root:
+    python -m benchmarks.bench_sessions --sessions 1 10 100
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.manager import Five9SessionManager
+
+from benchmarks.standin import Five9StandIn
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def measure_sessions(port, sessions, window):
+    standin = Five9StandIn(port=port)
+    manager = Five9SessionManager(**standin.manager_options())
+
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            manager.add_session(f"session-{index}", username=f"user{index}", password="x")
+            for index in range(sessions)
+        )
+    )
+    connected = await manager.wait_connected(timeout=120)
+    startup = time.perf_counter() - started
+
+    cpu_before = time.process_time()
+    messages_before = sum(
+        status["sockets"]["supervisor"]["messages_received"]
+        for status in manager.health().values()
+    )
+    await asyncio.sleep(window)
+    cpu = time.process_time() - cpu_before
+    messages = (
+        sum(
+            status["sockets"]["supervisor"]["messages_received"]
+            for status in manager.health().values()
+        )
+        - messages_before
+    )
+    rss_after = rss_bytes()
+
+    await manager.close(logout=False)
+    return {
+        "sessions": sessions,
+        "connected": connected,
+        "startup_s": startup,
+        "rss_per_session_kib": (rss_after - rss_before) / sessions / 1024,
+        "cpu_per_session_pct": cpu / window / sessions * 100,
+        "events_per_sec": messages / window,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--stats-interval", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.port:
+        result = asyncio.run(measure_sessions(args.port, args.sessions[0], args.window))
+        print(json.dumps(result))
+        sys.exit(0)
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.standin", "--port", str(port),
+         "--stats-interval", str(args.stats_interval)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        server.stdout.readline()
+        for sessions in args.sessions:
+            child = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_sessions", "--port", str(port),
+                 "--sessions", str(sessions), "--window", str(args.window)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            print(
+                f"{result['sessions']:>4} sessions  connected {result['connected']!s:<5}"
+                f"  startup {result['startup_s']:>6.2f} s"
+                f"  RSS {result['rss_per_session_kib']:>8.1f} KiB/session"
+                f"  CPU {result['cpu_per_session_pct']:>6.3f} %/session"
+                f"  {result['events_per_sec']:>7.1f} events/s"
+            )
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,92 @@
+"""Measures cold-start time to the first successful REST call, with and without the
+session cache.
+
+Every start runs in a fresh process against a stand-in served from another process,
+so the time includes imports, login or cache validation, and session start.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --runs 5 --login-latency 0.3
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+started = time.perf_counter()
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.session_cache import Five9SessionCache
+
+from benchmarks.bench_sessions import free_port
+from benchmarks.standin import Five9StandIn
+
+
+def first_call(port, cache_directory):
+    standin = Five9StandIn(port=port)
+    options = standin.client_options()
+    if cache_directory:
+        options["session_cache"] = Five9SessionCache(directory=cache_directory)
+
+    client = Five9RestClient(username="bench", password="bench", **options)
+    client.initialize_supervisor_session()
+    client.supervisor.DomainQueues.invoke()
+    return time.perf_counter() - started
+
+
+def run_starts(port, runs, cache_directory):
+    timings = []
+    for _ in range(runs):
+        command = [sys.executable, "-m", "benchmarks.bench_startup", "--port", str(port)]
+        if cache_directory:
+            command += ["--cache-directory", cache_directory]
+        child = subprocess.run(command, capture_output=True, text=True, check=True)
+        timings.append(json.loads(child.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--login-latency", type=float, default=0.3)
+    parser.add_argument("--port", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--cache-directory", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.port:
+        print(json.dumps(first_call(args.port, args.cache_directory)))
+        sys.exit(0)
+
+    os.environ.setdefault("FIVE9_SESSION_CACHE_KEY", Five9SessionCache.generate_key())
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.standin", "--port", str(port),
+         "--login-latency", str(args.login_latency)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        server.stdout.readline()
+        with tempfile.TemporaryDirectory() as cache_directory:
+            for label, directory in (("login", None), ("cached", cache_directory)):
+                # the first cached start logs in and fills the cache
+                timings = run_starts(port, args.runs + (directory is not None), directory)
+                if directory is not None:
+                    timings = timings[1:]
+                print(
+                    f"{label:<7} first call  median {statistics.median(timings) * 1000:>8.1f} ms"
+                    f"  min {min(timings) * 1000:>8.1f} ms"
+                )
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,108 @@
+"""Measures the websocket volume a statistics subscription saves.
+
+A stand-in served from another process sends every supervisor socket a burst of
+5012 events for --queues queues with --acd-columns extra ACD_STATUS columns and
+--agents AGENT_STATE rows, as a large domain streams them.  The burst is read
+twice through a handler that only uses ACD_STATUS callsInQueue: once with the
+default subscription, everything, and once subscribed to ACD_STATUS for
+--skills skills and the one column.  Reported are the bytes per frame, the
+client's CPU time per frame and the frames read per second.
+
+Run from the repository root:
+    python -m benchmarks.bench_statistics_subscription --queues 500 --agents 1000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.standin import Five9StandIn
+from benchmarks.suite import standin_process
+
+
+async def read_burst(port, username, frames, statistics_subscription):
+    client = Five9RestClient(
+        username=username,
+        password="bench",
+        statistics_subscription=statistics_subscription,
+        **Five9StandIn(port=port).client_options(),
+    )
+    client.initialize_supervisor_session()
+    socket = client.get_socket("supervisor")
+    calls_in_queue = {}
+
+    async def on_statistics(event):
+        for data_source in event["payLoad"]:
+            if data_source["dataSource"] == "ACD_STATUS":
+                for row in data_source["updated"]:
+                    calls_in_queue[row["id"]] = row["callsInQueue"]
+
+    socket.subscribe("5012", on_statistics)
+
+    run_task = asyncio.create_task(socket.run(reconnect=False))
+    # the 1010 connected event is the first frame, the burst follows it
+    while socket.messages_received < 1:
+        await asyncio.sleep(0.001)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    while socket.messages_received < frames + 1:
+        await asyncio.sleep(0.001)
+    await socket.dispatcher.join()
+    elapsed = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    await socket.stop()
+    await run_task
+    await client.aclose()
+    client.close()
+
+    received = socket.metrics.snapshot()["events"]["5012"]
+    return {
+        "bytes_per_frame": received["bytes_received"] / frames,
+        "cpu_ms_per_frame": cpu_seconds / frames * 1000,
+        "frames_per_sec": frames / elapsed,
+        "queues_seen": len(calls_in_queue),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queues", type=int, default=500)
+    parser.add_argument("--acd-columns", type=int, default=20)
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--skills", type=int, default=50, help="skills subscribed to")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.basicConfig(level=logging.ERROR)
+
+    subscriptions = {
+        "everything": None,
+        "subscribed": {
+            "data_sources": ["ACD_STATUS"],
+            "skills": [f"Queue {queue_id}" for queue_id in range(1, args.skills + 1)],
+            "columns": {"ACD_STATUS": ["callsInQueue"]},
+        },
+    }
+    standin_arguments = [
+        "--queues", str(args.queues),
+        "--acd-columns", str(args.acd_columns),
+        "--agents", str(args.agents),
+        "--burst-frames", str(args.frames),
+    ]
+    with standin_process(standin_arguments) as port:
+        for label, statistics_subscription in subscriptions.items():
+            result = asyncio.run(
+                read_burst(port, label, args.frames, statistics_subscription)
+            )
+            print(
+                f"{label:<12} {result['bytes_per_frame'] / 1024:>9.1f} KiB/frame"
+                f" {result['cpu_ms_per_frame']:>8.3f} ms CPU/frame"
+                f" {result['frames_per_sec']:>8.0f} frames/s"
+                f" {result['queues_seen']:>5} queues seen"
+            )
@@ -0,0 +1,106 @@
+"""Measures QueueTimeSeries updates and rolling aggregates for a large domain.
+
+A snapshot of --queues queues is followed by --samples one second 5012 updates
+that each change --changed of the queues, filling the 15 minute history.  Reported
+are the time per update, the time of each aggregate over the whole history across
+every queue, and the memory held.  For comparison, the mean and slope are also
+computed in pure Python from a deque of samples per queue.
+
+Run from the repository root:
+    python -m benchmarks.bench_timeseries --queues 5000
+"""
+import argparse
+import collections
+import random
+import time
+
+from five9_agent_sup_rest.timeseries import QueueTimeSeries
+
+
+def update(queue_ids, changed, second, rng):
+    return {
+        "updated": [
+            {
+                "id": queue_id,
+                "callsInQueue": rng.randrange(20),
+                "longestQueueTime": rng.randrange(600),
+            }
+            for queue_id in rng.sample(queue_ids, changed)
+        ]
+    }
+
+
+def timed(function, repeat=5):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def python_mean_and_slope(history):
+    means = {}
+    slopes = {}
+    for queue_id, samples in history.items():
+        n = len(samples)
+        mean_t = sum(t for t, _ in samples) / n
+        mean_v = sum(v for _, v in samples) / n
+        means[queue_id] = mean_v
+        sxx = sum((t - mean_t) ** 2 for t, _ in samples)
+        slopes[queue_id] = (
+            sum((t - mean_t) * (v - mean_v) for t, v in samples) / sxx if sxx else None
+        )
+    return means, slopes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queues", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=900)
+    parser.add_argument("--changed", type=int, default=500, help="queues per update")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queue_ids = [str(queue_id) for queue_id in range(1, args.queues + 1)]
+    series = QueueTimeSeries(capacity=args.samples, initial_queues=args.queues)
+    series.load_snapshot(
+        [{"id": queue_id, "callsInQueue": 0, "longestQueueTime": 0} for queue_id in queue_ids],
+        at=1_700_000_000,
+    )
+    # the pure Python comparison, a deque of (time, calls) per queue
+    history = {
+        queue_id: collections.deque([(1_700_000_000, 0)], maxlen=args.samples)
+        for queue_id in queue_ids
+    }
+    current = dict.fromkeys(queue_ids, 0)
+
+    update_seconds = 0.0
+    for second in range(1, args.samples):
+        delta = update(queue_ids, args.changed, second, rng)
+        started = time.perf_counter()
+        series.apply_delta(delta, at=1_700_000_000 + second)
+        update_seconds += time.perf_counter() - started
+        for row in delta["updated"]:
+            current[row["id"]] = row["callsInQueue"]
+        for queue_id, value in current.items():
+            history[queue_id].append((1_700_000_000 + second, value))
+
+    print(
+        f"{args.queues} queues, {args.samples} samples, {series.nbytes / 2**20:.1f} MiB"
+        f", update of {args.changed} queues {update_seconds / (args.samples - 1) * 1000:.3f} ms"
+    )
+    aggregates = {
+        "mean": lambda: series.mean("callsInQueue"),
+        "max": lambda: series.max("callsInQueue"),
+        "slope": lambda: series.slope("callsInQueue"),
+        "ewma (halflife 60s)": lambda: series.ewma("callsInQueue", halflife=60),
+        "p90 longestQueueTime": lambda: series.percentile("longestQueueTime", 90),
+        "mean, last 5 minutes": lambda: series.mean("callsInQueue", seconds=300),
+    }
+    for name, aggregate in aggregates.items():
+        seconds, _ = timed(aggregate)
+        print(f"{name:<24} {seconds * 1000:>9.2f} ms")
+
+    seconds, (means, slopes) = timed(lambda: python_mean_and_slope(history), repeat=1)
+    print(f"{'python mean and slope':<24} {seconds * 1000:>9.2f} ms")
+    vectorized_slopes = series.by_queue(series.slope("callsInQueue"))
+    assert abs(vectorized_slopes["1"] - slopes["1"]) < 1e-6
@@ -0,0 +1,66 @@
+"""Compares a new requests.Session per call against the pooled Five9HttpTransport.
+
+Run from the repository root:
+    python -m benchmarks.bench_transport --calls 500
+"""
+import argparse
+import statistics
+import time
+
+import requests
+import urllib3
+
+from five9_agent_sup_rest.transport import Five9HttpTransport
+
+from benchmarks.standin import StandInServer
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_calls(send, url, calls):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        prepared_request = requests.Request("GET", url).prepare()
+        call_started = time.perf_counter()
+        send(prepared_request).json()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return {
+        "calls_per_sec": calls / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def report(label, result):
+    print(
+        f"{label:<22} {result['calls_per_sec']:>10.1f} calls/s"
+        f"  p50 {result['p50_ms']:>7.2f} ms  p99 {result['p99_ms']:>7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--no-tls", action="store_true", help="Use plain HTTP")
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    with StandInServer(use_tls=not args.no_tls) as server:
+        url = f"{server.base_url}/supsvcs/rs/svc/orgs/1/skills"
+
+        def send_per_call_session(prepared_request):
+            return requests.Session().send(prepared_request, verify=False)
+
+        transport = Five9HttpTransport(verify=False)
+
+        report("session per call", run_calls(send_per_call_session, url, args.calls))
+        report("pooled transport", run_calls(transport.send, url, args.calls))
+        transport.close()
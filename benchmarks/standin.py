@@ -0,0 +1,663 @@
+"""Local stand-ins for Five9 used by the benchmarks.
+
+StandInServer answers every request with a small JSON body over HTTP/1.1 keep-alive
+connections, optionally wrapped in TLS with a throwaway self-signed certificate, so
+connection reuse can be measured without a live Five9 tenant.
+
+Five9StandIn also implements login, the REST paths of agent_methods.py and
+supervisor_methods.py and the supervisor and agent websockets, so full client
+sessions can run against it.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+from five9_agent_sup_rest.rate_limit import Five9RateLimiter
+from five9_agent_sup_rest.reference_data import ReferenceDataCache
+from five9_agent_sup_rest.retry import RetryPolicy
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if length:
+            self.rfile.read(length)
+
+        body = json.dumps({"path": self.path, "method": self.command}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_PUT = _respond
+    do_POST = _respond
+    do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        logging.debug(f"StandIn - {format % args}")
+
+
+def generate_self_signed_certificate(directory):
+    """Creates a throwaway certificate for localhost using the openssl CLI"""
+    certfile = os.path.join(directory, "standin.crt")
+    keyfile = os.path.join(directory, "standin.key")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", keyfile, "-out", certfile, "-days", "1",
+            "-subj", "/CN=localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class StandInServer:
+    """Runs the stand-in on a background thread, bound to an ephemeral port"""
+
+    def __init__(self, use_tls=True, handler_class=StandInRequestHandler):
+        self.use_tls = use_tls
+        self.httpd = StandInHTTPServer(("127.0.0.1", 0), handler_class)
+
+        if self.use_tls:
+            self.cert_dir = tempfile.TemporaryDirectory()
+            certfile, keyfile = generate_self_signed_certificate(self.cert_dir.name)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            # handshake in the per-connection thread, not in accept()
+            self.httpd.socket = context.wrap_socket(
+                self.httpd.socket, server_side=True, do_handshake_on_connect=False
+            )
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def host(self):
+        return self.httpd.server_address[0]
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    @property
+    def base_url(self):
+        scheme = "https" if self.use_tls else "http"
+        return f"{scheme}://{self.host}:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.use_tls:
+            self.cert_dir.cleanup()
+
+
+class StandInSessionConfig:
+    """Session configuration pointing REST methods at a stand-in server, no login"""
+
+    def __init__(
+        self,
+        base_api_url,
+        transport=None,
+        async_transport=None,
+        retry_policy=None,
+        metrics=None,
+        reference_data_ttl=None,
+    ):
+        self.observers = []
+        self.base_api_url = base_api_url
+        self.orgId = "1"
+        self.userId = "1"
+        self.farmId = "1"
+        self.tokenId = "standin-token"
+        self.api_header = {
+            "Authorization": f"Bearer-{self.tokenId}",
+            "farmId": self.farmId,
+            "Accept": "application/json, text/javascript",
+        }
+        self.transport = transport
+        self.async_transport = async_transport
+        self.login_state_cache = LoginStateCache()
+        self.reference_data_cache = ReferenceDataCache(ttls=reference_data_ttl)
+        self.rate_limiter = Five9RateLimiter()
+        self.metrics = metrics or Five9MetricsRegistry()
+        # no retries unless asked for, so benchmarks count every failed call
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+
+    def subscribe_observer(self, observer):
+        self.observers.append(observer)
+
+    def refresh_session(self, stale_token):
+        return False
+
+
+class Five9StandIn:
+    """Stand-in for the Five9 login endpoint, REST host and websockets.
+
+    REST calls and websockets are served on one TLS port, as the data center host
+    is, and the login response points the client back at it.  Supervisors and
+    agents start in SELECT_STATION and move to WORKING on session_start.  Each
+    websocket receives a 1010 on connect, a 1202 for every ping, burst_frames 5012
+    ACD_STATUS updates straight after connecting and one every stats_interval
+    seconds when stats_interval is set.  Supervisor alerts are kept in memory.
+
+    Payload sizes follow queues (rows per 5012 and skills), dispositions and
+    payload_bytes, padding added to every queue, disposition and alert returned.
+    acd_columns adds columns to every ACD_STATUS row and agents adds an
+    AGENT_STATE dataSource with that many rows.  5012 events honor the statistics
+    view and filter settings each supervisor sets.
+    With notices, each session start leaves the user in ACCEPT_NOTICE until that
+    many maintenance notices are accepted.
+
+    login_latency and rest_latency add a delay to the login and to every other REST
+    call, and rest_rate_limit throttles REST calls above that many per second with
+    a 429.  fail_rate and hang_rate answer that fraction of REST calls with a 503
+    or after hang_seconds, and token_ttl expires session tokens so REST calls get a
+    401 until the client logs in again.
+
+    Requires aiohttp.  Runs its own event loop on a background thread so it can be
+    used from synchronous code; use it as a context manager or run the module as a
+    script to serve from a separate process.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.host = kwargs.get("host", "127.0.0.1")
+        self.port = kwargs.get("port", 0)
+        self.use_tls = kwargs.get("use_tls", True)
+        self.queues = kwargs.get("queues", 50)
+        self.stats_interval = kwargs.get("stats_interval", None)
+        # 5012 events sent back to back when a websocket connects
+        self.burst_frames = kwargs.get("burst_frames", 0)
+        self.dispositions = kwargs.get("dispositions", 20)
+        # columns added to every ACD_STATUS row, the real dataSource has about 20
+        self.acd_columns = kwargs.get("acd_columns", 0)
+        # rows of the AGENT_STATE dataSource, 0 leaves it out of 5012 events
+        self.agents = kwargs.get("agents", 0)
+        # characters of padding in every queue, disposition and alert returned
+        self.payload_bytes = kwargs.get("payload_bytes", 0)
+        # maintenance notices to accept after every session start
+        self.notices = kwargs.get("notices", 0)
+        # seconds added to every login, the real login endpoint is far slower than
+        # a local one
+        self.login_latency = kwargs.get("login_latency", 0)
+        # seconds added to every REST call other than login
+        self.rest_latency = kwargs.get("rest_latency", 0)
+        # REST calls per second answered before the stand-in throttles with a 429
+        self.rest_rate_limit = kwargs.get("rest_rate_limit", None)
+        self.rate_window = (0, 0)
+        self.throttled = 0
+        # fraction of REST calls answered with a 503
+        self.fail_rate = kwargs.get("fail_rate", 0)
+        # fraction of REST calls answered only after hang_seconds
+        self.hang_rate = kwargs.get("hang_rate", 0)
+        self.hang_seconds = kwargs.get("hang_seconds", 10)
+        # seconds a login token is accepted for, None for no expiry
+        self.token_ttl = kwargs.get("token_ttl", None)
+        self.token_issued = {}
+        self.random = random.Random(kwargs.get("seed", None))
+        self.failed = 0
+        self.hung = 0
+        self.expired = 0
+
+        self.login_states = {}
+        self.pending_notices = {}
+        # statistics "view" and "filter" settings by user id
+        self.statistics_settings = {}
+        self.alerts = {}
+        self.alert_ids = itertools.count(1)
+        self.valid_tokens = set()
+        # service of every logout received, "supsvcs" or "appsvcs"
+        self.logouts = []
+        self.websockets = set()
+        self.loop = None
+        self.thread = None
+        self.started = threading.Event()
+
+    @property
+    def base_url(self):
+        scheme = "https" if self.use_tls else "http"
+        return f"{scheme}://{self.host}:{self.port}"
+
+    @property
+    def login_url(self):
+        return f"{self.base_url}/appsvcs/rs/svc/auth/login"
+
+    def client_options(self):
+        """Five9RestClient arguments for connecting to this stand-in"""
+        socket_ssl_context = None
+        if self.use_tls:
+            socket_ssl_context = ssl.create_default_context()
+            socket_ssl_context.check_hostname = False
+            socket_ssl_context.verify_mode = ssl.CERT_NONE
+        return {
+            "login_url": self.login_url,
+            "transport_options": {"verify": False},
+            "async_transport_options": {"verify": False},
+            "socket_ssl_context": socket_ssl_context,
+        }
+
+    def manager_options(self):
+        """Five9SessionManager arguments for connecting to this stand-in"""
+        client_options = self.client_options()
+        return {
+            "transport_options": client_options.pop("transport_options"),
+            "async_transport_options": client_options.pop("async_transport_options"),
+            "client_options": client_options,
+        }
+
+    def padded(self, item):
+        if self.payload_bytes:
+            item["description"] = "x" * self.payload_bytes
+        return item
+
+    def queue_list(self):
+        return [
+            self.padded({"id": str(queue_id), "name": f"Queue {queue_id}"})
+            for queue_id in range(1, self.queues + 1)
+        ]
+
+    def disposition_list(self):
+        return [
+            self.padded({"id": str(index), "name": f"Disposition {index}", "type": "FINAL"})
+            for index in range(1, self.dispositions + 1)
+        ]
+
+    def statistics_update(self, sequence, user_id=None):
+        settings = self.statistics_settings.get(user_id, {})
+        view = settings.get("view", {})
+        data_sources = view.get("dataSources", None)
+        columns = view.get("columns", None) or {}
+        skill_ids = set(settings.get("filter", {}).get("skillIds", None) or ())
+
+        payload = []
+        for data_source, rows in (
+            ("ACD_STATUS", self.acd_status_rows(sequence)),
+            ("AGENT_STATE", self.agent_state_rows(sequence)),
+        ):
+            if not rows or (data_sources is not None and data_source not in data_sources):
+                continue
+            if data_source == "ACD_STATUS" and skill_ids:
+                rows = [row for row in rows if row["id"] in skill_ids]
+            if data_source in columns:
+                kept = {"id", *columns[data_source]}
+                rows = [{key: row[key] for key in row if key in kept} for row in rows]
+            payload.append(
+                {"dataSource": data_source, "added": [], "updated": rows, "removed": []}
+            )
+        return {
+            "context": {
+                "eventId": "5012",
+                "eventReason": "UPDATED",
+                "timestamp": int(time.time() * 1000),
+            },
+            "payLoad": payload,
+        }
+
+    def acd_status_rows(self, sequence=0):
+        rows = []
+        for queue_id in range(1, self.queues + 1):
+            row = {
+                "id": str(queue_id),
+                "callsInQueue": (queue_id + sequence) % 5,
+                "longestQueueTime": (queue_id * 7 + sequence) % 600,
+            }
+            for column in range(self.acd_columns):
+                row[f"column{column}"] = (queue_id * column + sequence) % 1000
+            rows.append(row)
+        return rows
+
+    def agent_state_rows(self, sequence=0):
+        return [
+            {
+                "id": str(agent_id),
+                "state": ("READY", "ON_CALL", "NOT_READY")[(agent_id + sequence) % 3],
+                "reasonCode": str((agent_id + sequence) % 7),
+                "stateSince": 1_700_000_000_000 + sequence * 1000,
+            }
+            for agent_id in range(1, self.agents + 1)
+        ]
+
+    def build_app(self):
+        from aiohttp import web
+
+        routes = web.RouteTableDef()
+
+        @routes.post("/appsvcs/rs/svc/auth/login")
+        async def login(request):
+            credentials = (await request.json())["passwordCredentials"]
+            if self.login_latency:
+                await asyncio.sleep(self.login_latency)
+            user_id = str(zlib.crc32(credentials["username"].encode()))
+            self.login_states.setdefault(user_id, "SELECT_STATION")
+            token = f"token-{user_id}-{uuid.uuid4().hex[:8]}"
+            self.valid_tokens.add(token)
+            self.token_issued[token] = time.monotonic()
+            response = web.json_response(
+                {
+                    "tokenId": token,
+                    "userId": user_id,
+                    "orgId": "1",
+                    "context": {"farmId": "1"},
+                    "metadata": {
+                        "dataCenters": [
+                            {"apiUrls": [{"host": self.host, "port": self.port}]}
+                        ]
+                    },
+                }
+            )
+            response.set_cookie("Authorization", f"Bearer-{token}")
+            return response
+
+        @routes.get("/appsvcs/rs/svc/auth/metadata")
+        async def metadata(request):
+            token = request.headers.get("Authorization", "").removeprefix("Bearer-")
+            if token not in self.valid_tokens:
+                raise web.HTTPUnauthorized()
+            return web.json_response(
+                {"dataCenters": [{"apiUrls": [{"host": self.host, "port": self.port}]}]}
+            )
+
+        @routes.get(r"/{service:(supsvcs|appsvcs)}/rs/svc/{users:(supervisors|agents)}/{user_id}/login_state")
+        async def login_state(request):
+            state = self.login_states.get(request.match_info["user_id"], "SELECT_STATION")
+            return web.json_response(state)
+
+        @routes.put(r"/{service:(supsvcs|appsvcs)}/rs/svc/{users:(supervisors|agents)}/{user_id}/session_start")
+        async def session_start(request):
+            user_id = request.match_info["user_id"]
+            if self.notices:
+                self.pending_notices[user_id] = {str(index) for index in range(1, self.notices + 1)}
+                self.login_states[user_id] = "ACCEPT_NOTICE"
+            else:
+                self.login_states[user_id] = "WORKING"
+            return web.json_response({})
+
+        @routes.get(r"/{service:(supsvcs|appsvcs)}/rs/svc/{users:(supervisors|agents)}/{user_id}/maintenance_notices")
+        async def maintenance_notices(request):
+            pending = self.pending_notices.get(request.match_info["user_id"], ())
+            return web.json_response(
+                [
+                    {"id": notice_id, "accepted": False, "text": "Scheduled maintenance"}
+                    for notice_id in sorted(pending)
+                ]
+            )
+
+        @routes.put(r"/{service:(supsvcs|appsvcs)}/rs/svc/{users:(supervisors|agents)}/{user_id}/maintenance_notices/{notice_id}/accept")
+        async def accept_maintenance_notice(request):
+            user_id = request.match_info["user_id"]
+            pending = self.pending_notices.get(user_id, set())
+            pending.discard(request.match_info["notice_id"])
+            if not pending and self.login_states.get(user_id) == "ACCEPT_NOTICE":
+                self.login_states[user_id] = "WORKING"
+            return web.json_response({})
+
+        @routes.post(r"/{service:(supsvcs|appsvcs)}/rs/svc/auth/logout")
+        async def logout(request):
+            token = request.headers.get("Authorization", "").removeprefix("Bearer-")
+            self.valid_tokens.discard(token)
+            self.logouts.append(request.match_info["service"])
+            if token.startswith("token-"):
+                # tokens are token-<userId>-<nonce>
+                self.login_states.pop(token.split("-")[1], None)
+            return web.json_response({})
+
+        @routes.post("/supsvcs/rs/svc/supervisors/{user_id}/migrate")
+        async def migrate(request):
+            return web.json_response({"host": self.host, "port": self.port})
+
+        @routes.get("/supsvcs/rs/svc/orgs/{org_id}/skills")
+        async def skills(request):
+            # the queue list only changes with its size, so that doubles as the
+            # ETag and conditional requests are answered with a 304
+            etag = f'"queues-{self.queues}-{self.payload_bytes}"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.json_response(self.queue_list(), headers={"ETag": etag})
+
+        @routes.get("/supsvcs/rs/svc/orgs/{org_id}/dispositions")
+        async def dispositions(request):
+            return web.json_response(self.disposition_list())
+
+        @routes.get("/supsvcs/rs/svc/supervisors/{user_id}/statistics/{settings:(view|filter)}_settings")
+        async def get_statistics_settings(request):
+            settings = self.statistics_settings.get(request.match_info["user_id"], {})
+            return web.json_response(settings.get(request.match_info["settings"], {}))
+
+        @routes.put("/supsvcs/rs/svc/supervisors/{user_id}/statistics/{settings:(view|filter)}_settings")
+        async def set_statistics_settings(request):
+            settings = self.statistics_settings.setdefault(request.match_info["user_id"], {})
+            settings[request.match_info["settings"]] = await request.json()
+            return web.Response(status=204)
+
+        @routes.get(r"/{service:(supsvcs|appsvcs)}/{ws:(sws|ws)}/{socket_name}")
+        async def websocket(request):
+            token = request.headers.get("Authorization", "").removeprefix("Bearer-")
+            if token not in self.valid_tokens:
+                raise web.HTTPUnauthorized()
+
+            # tokens are token-<userId>-<nonce>
+            user_id = token.split("-")[1] if token.startswith("token-") else None
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            self.websockets.add(ws)
+            await ws.send_json({"context": {"eventId": "1010", "eventReason": "CONNECTED"}, "payLoad": ""})
+
+            for sequence in range(1, self.burst_frames + 1):
+                await ws.send_json(self.statistics_update(sequence, user_id))
+
+            stats_task = None
+            if self.stats_interval:
+                stats_task = asyncio.ensure_future(self.push_statistics(ws, user_id))
+            try:
+                async for message in ws:
+                    if message.data == "ping":
+                        await ws.send_json({"context": {"eventId": "1202", "eventReason": "PONG"}, "payLoad": "pong"})
+            finally:
+                self.websockets.discard(ws)
+                if stats_task:
+                    stats_task.cancel()
+            return ws
+
+        @routes.get("/supsvcs/rs/svc/alerts")
+        async def get_alerts(request):
+            return web.json_response([self.padded(dict(alert)) for alert in self.alerts.values()])
+
+        @routes.post("/supsvcs/rs/svc/alerts")
+        async def create_alert(request):
+            alert = {**(await request.json()), "id": str(next(self.alert_ids))}
+            self.alerts[alert["id"]] = alert
+            return web.json_response(alert)
+
+        @routes.get("/supsvcs/rs/svc/alerts/{alert_id}")
+        async def get_alert(request):
+            if request.match_info["alert_id"] not in self.alerts:
+                raise web.HTTPNotFound()
+            return web.json_response(self.alerts[request.match_info["alert_id"]])
+
+        @routes.put("/supsvcs/rs/svc/alerts/{alert_id}")
+        async def update_alert(request):
+            alert_id = request.match_info["alert_id"]
+            if alert_id not in self.alerts:
+                raise web.HTTPNotFound()
+            self.alerts[alert_id] = {**(await request.json()), "id": alert_id}
+            return web.json_response(self.alerts[alert_id])
+
+        @routes.delete("/supsvcs/rs/svc/alerts/{alert_id}")
+        async def delete_alert(request):
+            if self.alerts.pop(request.match_info["alert_id"], None) is None:
+                raise web.HTTPNotFound()
+            return web.Response(status=204)
+
+        @web.middleware
+        async def rest_conditions(request, handler):
+            if "/rs/svc/" not in request.path or request.path.endswith("/auth/login"):
+                return await handler(request)
+
+            if self.rest_rate_limit:
+                window, count = self.rate_window
+                second = int(time.monotonic())
+                count = count + 1 if window == second else 1
+                self.rate_window = (second, count)
+                if count > self.rest_rate_limit:
+                    self.throttled += 1
+                    return web.json_response(
+                        {"error": "rate limit"}, status=429, headers={"Retry-After": "1"}
+                    )
+
+            if self.token_ttl is not None:
+                token = request.headers.get("Authorization", "").removeprefix("Bearer-")
+                issued = self.token_issued.get(token, None)
+                if issued is not None and time.monotonic() - issued > self.token_ttl:
+                    self.expired += 1
+                    self.valid_tokens.discard(token)
+                    return web.json_response({"error": "token expired"}, status=401)
+
+            if self.fail_rate and self.random.random() < self.fail_rate:
+                self.failed += 1
+                return web.json_response({"error": "unavailable"}, status=503)
+            if self.hang_rate and self.random.random() < self.hang_rate:
+                self.hung += 1
+                await asyncio.sleep(self.hang_seconds)
+
+            if self.rest_latency:
+                await asyncio.sleep(self.rest_latency)
+            return await handler(request)
+
+        async def fallback(request):
+            if request.can_read_body:
+                await request.read()
+            return web.json_response({})
+
+        app = web.Application(middlewares=[rest_conditions])
+        app.add_routes(routes)
+        app.router.add_route("*", "/{tail:.*}", fallback)
+        return app
+
+    async def push_statistics(self, ws, user_id=None):
+        sequence = 0
+        while not ws.closed:
+            sequence += 1
+            await ws.send_json(self.statistics_update(sequence, user_id))
+            await asyncio.sleep(self.stats_interval)
+
+    def drop_connections(self, revoke_tokens=False):
+        """Closes every open websocket, as a network blip or server restart would.
+        With revoke_tokens, the sessions must log in again before reconnecting."""
+
+        async def close_all():
+            if revoke_tokens:
+                self.valid_tokens.clear()
+            for ws in list(self.websockets):
+                await ws.close(code=1011)
+
+        asyncio.run_coroutine_threadsafe(close_all(), self.loop).result()
+
+    async def start_server(self):
+        from aiohttp import web
+
+        ssl_context = None
+        if self.use_tls:
+            self.cert_dir = tempfile.TemporaryDirectory()
+            certfile, keyfile = generate_self_signed_certificate(self.cert_dir.name)
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(certfile, keyfile)
+
+        self.runner = web.AppRunner(self.build_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port, ssl_context=ssl_context, backlog=1024)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def serve(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.start_server())
+        self.started.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        self.started.wait()
+        return self
+
+    def __exit__(self, *args):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        if self.use_tls:
+            self.cert_dir.cleanup()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the Five9 stand-in")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--queues", type=int, default=50)
+    parser.add_argument("--stats-interval", type=float, default=None)
+    parser.add_argument("--burst-frames", type=int, default=0)
+    parser.add_argument("--dispositions", type=int, default=20)
+    parser.add_argument("--acd-columns", type=int, default=0)
+    parser.add_argument("--agents", type=int, default=0)
+    parser.add_argument("--payload-bytes", type=int, default=0)
+    parser.add_argument("--notices", type=int, default=0)
+    parser.add_argument("--login-latency", type=float, default=0)
+    parser.add_argument("--rest-latency", type=float, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0)
+    parser.add_argument("--hang-rate", type=float, default=0)
+    parser.add_argument("--token-ttl", type=float, default=None)
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+
+    standin = Five9StandIn(
+        port=args.port,
+        queues=args.queues,
+        stats_interval=args.stats_interval,
+        burst_frames=args.burst_frames,
+        dispositions=args.dispositions,
+        acd_columns=args.acd_columns,
+        agents=args.agents,
+        payload_bytes=args.payload_bytes,
+        notices=args.notices,
+        login_latency=args.login_latency,
+        rest_latency=args.rest_latency,
+        fail_rate=args.fail_rate,
+        hang_rate=args.hang_rate,
+        token_ttl=args.token_ttl,
+        use_tls=not args.no_tls,
+    )
+    with standin:
+        print(f"Five9 stand-in listening on {standin.base_url}", flush=True)
+        try:
+            standin.thread.join()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,254 @@
+"""Runs the end-to-end benchmark suite against local Five9 stand-ins.
+
+Reports login-to-WORKING time, REST calls/sec at several concurrency levels, socket
+frames/sec through Five9Socket and memory per session.  Every stage runs in a
+fresh process against a stand-in served from another process, so the numbers only
+include the client side and stages do not share connections, caches or heap.
+Nothing leaves the machine, so the suite runs offline and in CI.
+
+REST p99 latencies are the upper bound of the histogram bucket holding the 99th
+percentile.  --json writes the results with the settings and platform they were measured on,
+and --compare prints the change of each number against such a report.
+
+Run from the repository root:
+    python -m benchmarks.suite --json suite.json
+    python -m benchmarks.suite --compare suite.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.bench_sessions import free_port, measure_sessions
+from benchmarks.standin import Five9StandIn
+
+
+STAGES = ("login", "rest", "socket", "memory")
+
+
+def make_client(port, username, **options):
+    return Five9RestClient(
+        username=username,
+        password="bench",
+        **Five9StandIn(port=port).client_options(),
+        **options,
+    )
+
+
+def login_stage(port, args):
+    timings = []
+    for run in range(args.runs):
+        started = time.perf_counter()
+        client = make_client(port, f"login{run}")
+        client.initialize_supervisor_session()
+        if client.get_login_state("supervisor", refresh=True) != "WORKING":
+            raise RuntimeError("supervisor session did not reach WORKING")
+        timings.append(time.perf_counter() - started)
+        client.supervisor.LogOut.invoke()
+        client.close()
+    return {
+        "login_to_working_median_ms": statistics.median(timings) * 1000,
+        "login_to_working_min_ms": min(timings) * 1000,
+    }
+
+
+async def rest_stage(port, args):
+    client = make_client(
+        port,
+        "rest",
+        retry_options={"max_attempts": 1},
+        # every call goes to the stand-in, the dispositions are not cached
+        reference_data_ttl={"GetDomainDispositions": None},
+    )
+    client.initialize_supervisor_session()
+    method = client.supervisor.GetDomainDispositions
+    # open the connections before timing
+    await asyncio.gather(*(method.ainvoke() for _ in range(max(args.concurrency))))
+
+    results = {}
+    for concurrency in args.concurrency:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                return await method.ainvoke()
+
+        client.metrics.reset()
+        started = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(args.calls)))
+        elapsed = time.perf_counter() - started
+        latency = client.metrics.snapshot()["Supervisor:GetDomainDispositions"]["latency"]
+        results[f"rest_calls_per_sec_c{concurrency}"] = args.calls / elapsed
+        results[f"rest_p99_ms_c{concurrency}"] = latency["p99"] * 1000
+
+    await client.aclose()
+    return results
+
+
+async def socket_stage(port, args):
+    client = make_client(port, "socket")
+    client.initialize_supervisor_session()
+    socket = client.get_socket("supervisor")
+    frames = args.burst_frames
+
+    run_task = asyncio.create_task(socket.run(reconnect=False))
+    # the 1010 connected event is the first frame, the burst follows it
+    while socket.messages_received < 1:
+        await asyncio.sleep(0.001)
+    first_at = time.time()
+    started = time.perf_counter()
+    while socket.messages_received < frames + 1:
+        await asyncio.sleep(0.001)
+    read_seconds = socket.last_message_at - first_at
+    await socket.dispatcher.join()
+    handled_seconds = time.perf_counter() - started
+
+    await socket.stop()
+    await run_task
+    await client.aclose()
+    return {
+        "socket_frames_per_sec": frames / read_seconds,
+        "socket_handled_frames_per_sec": frames / handled_seconds,
+    }
+
+
+async def memory_stage(port, args):
+    result = await measure_sessions(port, args.sessions, args.window)
+    return {
+        "memory_per_session_kib": result["rss_per_session_kib"],
+        "cpu_per_session_pct": result["cpu_per_session_pct"],
+    }
+
+
+def run_stage(stage, port, args):
+    if stage == "login":
+        return login_stage(port, args)
+    if stage == "rest":
+        return asyncio.run(rest_stage(port, args))
+    if stage == "socket":
+        return asyncio.run(socket_stage(port, args))
+    return asyncio.run(memory_stage(port, args))
+
+
+def standin_arguments(stage, args):
+    arguments = [
+        "--queues", str(args.queues),
+        "--payload-bytes", str(args.payload_bytes),
+        "--login-latency", str(args.login_latency),
+        "--rest-latency", str(args.rest_latency),
+    ]
+    if stage == "login":
+        arguments += ["--notices", str(args.notices)]
+    if stage == "socket":
+        arguments += ["--burst-frames", str(args.burst_frames)]
+    if stage == "memory":
+        arguments += ["--stats-interval", "1"]
+    return arguments
+
+
+@contextlib.contextmanager
+def standin_process(arguments):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.standin", "--port", str(port), *arguments],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        server.stdout.readline()
+        yield port
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def settings(args):
+    return {
+        option: getattr(args, option)
+        for option in (
+            "runs", "calls", "concurrency", "burst_frames", "sessions", "window",
+            "queues", "payload_bytes", "notices", "login_latency", "rest_latency",
+        )
+    }
+
+
+def print_comparison(results, baseline):
+    for name, value in results.items():
+        previous = baseline.get(name, None)
+        change = ""
+        if previous:
+            change = f"{(value - previous) / previous * 100:>+8.1f} %"
+        print(f"{name:<36} {value:>12.2f}  {change}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--runs", type=int, default=5, help="logins timed")
+    parser.add_argument("--calls", type=int, default=1000, help="REST calls per level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--burst-frames", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--window", type=float, default=3.0)
+    parser.add_argument("--queues", type=int, default=50)
+    parser.add_argument("--payload-bytes", type=int, default=0)
+    parser.add_argument("--notices", type=int, default=1)
+    parser.add_argument("--login-latency", type=float, default=0)
+    parser.add_argument("--rest-latency", type=float, default=0)
+    parser.add_argument("--json", default=None, help="write the results to this file")
+    parser.add_argument("--compare", default=None, help="report to compare against")
+    parser.add_argument("--stage", choices=STAGES, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.stage:
+        print(json.dumps(run_stage(args.stage, args.port, args)))
+        sys.exit(0)
+
+    results = {}
+    for stage in args.stages:
+        with standin_process(standin_arguments(stage, args)) as port:
+            child = subprocess.run(
+                [sys.executable, "-m", "benchmarks.suite", *sys.argv[1:],
+                 "--stage", stage, "--port", str(port)],
+                capture_output=True,
+                text=True,
+            )
+        if child.returncode:
+            sys.exit(f"The {stage} stage failed:\n{child.stderr}")
+        results.update(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as report:
+            baseline = json.load(report)["results"]
+    print_comparison(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as report:
+            json.dump(
+                {
+                    "settings": settings(args),
+                    "platform": {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "system": platform.system(),
+                    },
+                    "results": results,
+                },
+                report,
+                indent=2,
+            )
@@ -1,10 +1,12 @@
 import argparse
+import asyncio
 from getpass import getpass
 import logging
 import os
 
 from five9_agent_sup_rest.client import Five9RestClient
 from five9_agent_sup_rest.methods.default_socket_handlers import SocketEventHandler
+from five9_agent_sup_rest.statistics import QueueStatisticsStore
 
 # You can create a directory called "private" and create a file called "credentials.py" in it
 # with a dictionary called "ACCOUNTS" that contains your Five9 account credentials
@@ -29,47 +31,45 @@ DEFAULT_QUEUE_DATA_INCREMENT_ALERTS = {
 
 
 class QueueStatistics:
-    def __init__(self, *args, **kwargs):
-        self.queue_id_map = {}
-        self.queue_mapping_info = kwargs.get("queue_mapping_info", None)
-        self.map_queue_ids()
+    """Raises alerts when queue statistics increase by more than a threshold.
 
-        self.current_queue_snapshot = {}
-        self.previous_queue_snapshot = {}
+    The statistics themselves are kept in a QueueStatisticsStore, which applies
+    each update in place and reports which queues changed, so only those queues
+    are checked against the alert thresholds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.store = QueueStatisticsStore(
+            queue_mapping_info=kwargs.get("queue_mapping_info", None)
+        )
 
         self.queue_alerts = kwargs.get(
             "queue_alerts", DEFAULT_QUEUE_DATA_INCREMENT_ALERTS
         )
 
-    def map_queue_ids(self):
-        for queue in self.queue_mapping_info:
-            self.queue_id_map[queue["id"]] = queue["name"]
+    def load_snapshot(self, queue_info):
+        self.store.load_snapshot(queue_info)
+        return True
 
-    def update_queue_info(self, queue_info):
-        logging.debug(f"\nPrevious Snapshot:\n{self.previous_queue_snapshot}\n")
-        logging.debug(f"\nCurrent Snapshot:\n{self.current_queue_snapshot}\n")
-        for queue in queue_info:
-            self.current_queue_snapshot[queue["id"]] = queue
+    def apply_update(self, queue_update):
+        self.store.apply_delta(queue_update)
         alerts = self.get_alerts_for_changes()
-        self.previous_queue_snapshot = self.current_queue_snapshot.copy()
 
         return True, alerts
 
     def get_alerts_for_changes(self):
         alerts = []
-        for queue_id, queue_info in self.current_queue_snapshot.items():
-            if queue_id == "0":
-                continue
-
-            for alert_on, difference_threshold in self.queue_alerts.items():
-                previous_value = self.previous_queue_snapshot.get(queue_id, {}).get(
-                    alert_on, 0
-                )
-                current_value = self.current_queue_snapshot.get(queue_id, {}).get(
-                    alert_on, 0
-                )
+        for alert_on, difference_threshold in self.queue_alerts.items():
+            for queue_id, _, previous_value, current_value in self.store.iter_changes(
+                alert_on
+            ):
+                if queue_id == "0":
+                    continue
+
+                previous_value = previous_value or 0
+                current_value = current_value or 0
                 logging.debug(
-                    f"Comparing Thresholds: {self.queue_id_map[queue_id]} - {alert_on}: Current [{current_value}] Previous [{previous_value}]"
+                    f"Comparing Thresholds: {self.store.queue_name(queue_id)} - {alert_on}: Current [{current_value}] Previous [{previous_value}]"
                 )
                 difference = current_value - previous_value
                 if difference >= difference_threshold:
@@ -78,7 +78,7 @@ class QueueStatistics:
                     )
                     alerts.append(
                         {
-                            "queue_name": self.queue_id_map[queue_id],
+                            "queue_name": self.store.queue_name(queue_id),
                             "alert_on": alert_on,
                             "current_value": current_value,
                             "previous_value": previous_value,
@@ -92,13 +92,31 @@ class StatsEventBase(SocketEventHandler):
     def __init__(self, *args, **kwargs):
         self.eventId = kwargs.get("eventId", None)
         super().__init__(*args, **kwargs)
-        if self.client.extensions.get("queue_statistics", None) is None:
-            self.client.extensions["queue_statistics"] = QueueStatistics(
-                queue_mapping_info=self.client.supervisor.DomainQueues.invoke()
-            )
-            logging.info("Client extension 'queue_statistics' initialized")
         logging.debug("Queue Statistics Handler Initialized")
 
+    async def queue_statistics(self):
+        # The queue list is fetched with ainvoke() on first use so the REST round
+        # trip does not block the socket's event loop.  The 5000 and 5012 handlers
+        # run on different workers, so the first one starts a task that creates
+        # the extension and every handler awaits that same task.  A failed fetch
+        # is retried by the next event.
+        extensions = self.client.extensions
+        if extensions.get("queue_statistics", None) is not None:
+            return extensions["queue_statistics"]
+        task = extensions.get("queue_statistics_task", None)
+        if task is None or (task.done() and (task.cancelled() or task.exception())):
+            task = extensions["queue_statistics_task"] = asyncio.ensure_future(
+                self.create_queue_statistics()
+            )
+        return await asyncio.shield(task)
+
+    async def create_queue_statistics(self):
+        self.client.extensions["queue_statistics"] = QueueStatistics(
+            queue_mapping_info=await self.client.supervisor.DomainQueues.ainvoke()
+        )
+        logging.info("Client extension 'queue_statistics' initialized")
+        return self.client.extensions["queue_statistics"]
+
 
 class StatsEvent5000Handler(StatsEventBase):
     """Handler for event 5000 - Initial Statistics Snapshot"""
@@ -112,12 +130,11 @@ class StatsEvent5000Handler(StatsEventBase):
         logging.debug(
             f"Stats Handler EVENT: {event['context']['eventId']} - {event['payLoad']}"
         )
+        queue_statistics = await self.queue_statistics()
         for updated_object in event["payLoad"]:
             if updated_object["dataSource"] == "ACD_STATUS":
                 logging.debug("Initial Queue Data Snapshot Received")
-                self.client.extensions["queue_statistics"].update_queue_info(
-                    updated_object["data"]
-                )
+                queue_statistics.load_snapshot(updated_object["data"])
         return
 
 
@@ -134,12 +151,11 @@ class StatsEvent5012Handler(StatsEventBase):
             f"Stats Handler EVENT: {event['context']['eventId']} - {event['payLoad']}"
         )
 
+        queue_statistics = await self.queue_statistics()
         for updated_object in event["payLoad"]:
             if updated_object["dataSource"] == "ACD_STATUS":
                 logging.debug("QUEUE DATA UPDATE RECEIVED")
-                updated, alerts = self.client.extensions[
-                    "queue_statistics"
-                ].update_queue_info(updated_object["updated"])
+                updated, alerts = queue_statistics.apply_update(updated_object)
                 # handle any alerts here
                 for alert in alerts:
                     # ring a bell, send an email, etc.
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+
+from five9_agent_sup_rest.config import ALERT_RECONCILE
+from five9_agent_sup_rest.exceptions import Five9ResponseError
+
+
+class AlertChange:
+    """One create, update or delete needed to reach the desired alert set"""
+
+    def __init__(self, action, key, alert_id=None, desired=None, current=None):
+        self.action = action
+        self.key = key
+        self.alert_id = alert_id
+        self.desired = desired
+        self.current = current
+
+    def __repr__(self):
+        return f"AlertChange({self.action!r}, key={self.key!r}, alert_id={self.alert_id!r})"
+
+
+class AlertChangeResult:
+    """The outcome of applying one AlertChange"""
+
+    def __init__(self, change, ok, status_code=None, result=None, error=None):
+        self.change = change
+        self.ok = ok
+        self.status_code = status_code
+        self.result = result
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"AlertChangeResult({self.change.action!r}, key={self.change.key!r}, "
+            f"ok={self.ok}, status_code={self.status_code})"
+        )
+
+
+class AlertReconciler:
+    """Brings the supervisor alerts of a domain to a desired set.
+
+    The current alerts are read once with GetAlerts.  Alerts are matched on
+    key_field: desired alerts without a match are created, matches with a differing
+    field are updated, and with delete_missing, current alerts without a desired
+    match are deleted.  Only the fields present in a desired alert are compared, and
+    an update sends the current alert with the desired fields applied.
+
+    The changes are sent with ainvoke() on the client's async transport, at most
+    concurrency at a time, and one result is returned per change.  A failed change
+    does not stop the others.
+    """
+
+    def __init__(self, client, *args, **kwargs):
+        self.client = client
+        self.key_field = kwargs.get("key_field", ALERT_RECONCILE["key_field"])
+        self.concurrency = kwargs.get("concurrency", ALERT_RECONCILE["concurrency"])
+        self.delete_missing = kwargs.get(
+            "delete_missing", ALERT_RECONCILE["delete_missing"]
+        )
+
+    def diff(self, current_alerts, desired_alerts):
+        """Returns the changes that turn current_alerts into desired_alerts"""
+        desired_by_key = {}
+        for alert in desired_alerts:
+            key = alert[self.key_field]
+            if key in desired_by_key:
+                raise ValueError(f"Duplicate desired alert {self.key_field}: {key}")
+            desired_by_key[key] = alert
+
+        changes = []
+        matched = set()
+        for alert in current_alerts:
+            key = alert.get(self.key_field, None)
+            desired = desired_by_key.get(key, None)
+            if desired is None or key in matched:
+                # not wanted, or a duplicate of an alert already matched
+                if self.delete_missing:
+                    changes.append(AlertChange("delete", key, alert["id"], current=alert))
+                continue
+
+            matched.add(key)
+            if any(alert.get(field, None) != value for field, value in desired.items()):
+                changes.append(
+                    AlertChange("update", key, alert["id"], desired=desired, current=alert)
+                )
+
+        for key, desired in desired_by_key.items():
+            if key not in matched:
+                changes.append(AlertChange("create", key, desired=desired))
+
+        return changes
+
+    async def apply_change(self, change, transport=None):
+        supervisor = self.client.supervisor
+        if change.action == "create":
+            method, args = supervisor.CreateAlert, (change.desired,)
+        elif change.action == "update":
+            # the PUT replaces the alert, fields that are not desired are kept
+            method, args = supervisor.UpdateAlert, (
+                change.alert_id,
+                {**change.current, **change.desired},
+            )
+        else:
+            method, args = supervisor.DeleteAlert, (change.alert_id,)
+
+        try:
+            result = await method.ainvoke(*args, transport=transport)
+        except Five9ResponseError as err:
+            return AlertChangeResult(change, False, err.status_code, error=err.text)
+        except Exception as err:
+            return AlertChangeResult(change, False, error=err)
+        return AlertChangeResult(change, True, result=result)
+
+    async def areconcile(self, desired_alerts, dry_run=False, transport=None):
+        """Reads the current alerts, applies the changes and returns their results.
+        With dry_run, returns the changes without applying them.  transport replaces
+        the client's async transport."""
+        current_alerts = await self.client.supervisor.GetAlerts.ainvoke(
+            transport=transport
+        )
+        changes = self.diff(current_alerts, desired_alerts)
+        logging.info(
+            f"AlertReconciler - {len(current_alerts)} current, {len(desired_alerts)} desired, "
+            f"{len(changes)} changes"
+        )
+        if dry_run:
+            return changes
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def apply(change):
+            async with semaphore:
+                return await self.apply_change(change, transport)
+
+        results = await asyncio.gather(*(apply(change) for change in changes))
+
+        failed = sum(not result.ok for result in results)
+        if failed:
+            logging.warning(f"AlertReconciler - {failed} of {len(results)} changes failed")
+        return results
+
+    def reconcile(self, desired_alerts, dry_run=False):
+        """Blocking counterpart of areconcile(), for code without an event loop.
+
+        Runs on a loop of its own with a copy of the client's async transport, which
+        is closed afterwards.  The client's transport is left to its other users.
+        """
+
+        async def run():
+            transport = self.client.async_transport.copy()
+            try:
+                return await self.areconcile(
+                    desired_alerts, dry_run=dry_run, transport=transport
+                )
+            finally:
+                await transport.close()
+
+        return asyncio.run(run())
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from five9_agent_sup_rest.config import ASYNC_HTTP_TRANSPORT
+
+
+class Five9AsyncResponse:
+    """Fully read response from the async transport.
+
+    Exposes the parts of the requests.Response interface used by the REST methods
+    (status_code, headers, text, json()) so a method's process_response works the
+    same for invoke() and ainvoke().
+    """
+
+    def __init__(
+        self, status_code, headers, content, url="", reason="", encoding=None, request_size=0
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.reason = reason
+        self.encoding = encoding or "utf-8"
+        # bytes of the request body that was sent
+        self.request_size = request_size
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self, **kwargs):
+        return json.loads(self.content, **kwargs)
+
+
+class Five9AsyncHttpTransport:
+    """Pooled asyncio HTTP transport for Five9 REST calls, backed by aiohttp.
+
+    The aiohttp session is created on first use inside the running event loop and
+    recreated if the transport is later used from a different loop, closing the
+    previous session.  Like the sync transport, cookies are never stored on the
+    transport.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.limit = kwargs.get("limit", ASYNC_HTTP_TRANSPORT["limit"])
+        self.limit_per_host = kwargs.get(
+            "limit_per_host", ASYNC_HTTP_TRANSPORT["limit_per_host"]
+        )
+        self.keepalive_timeout = kwargs.get(
+            "keepalive_timeout", ASYNC_HTTP_TRANSPORT["keepalive_timeout"]
+        )
+        self.connect_timeout = kwargs.get(
+            "connect_timeout", ASYNC_HTTP_TRANSPORT["connect_timeout"]
+        )
+        self.read_timeout = kwargs.get("read_timeout", ASYNC_HTTP_TRANSPORT["read_timeout"])
+        self.verify = kwargs.get("verify", True)
+
+        self.session = None
+        self._loop = None
+
+    def copy(self):
+        """A transport with the same settings and a connection pool of its own"""
+        return Five9AsyncHttpTransport(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            verify=self.verify,
+        )
+
+    async def _get_session(self):
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for ainvoke(), install it with: pip install aiohttp"
+            )
+
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            previous, previous_loop = self.session, self._loop
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ssl=None if self.verify else False,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+            self._loop = loop
+            logging.debug(
+                f"Five9AsyncHttpTransport - session created, limit: {self.limit}"
+            )
+            if previous is not None and not previous.closed:
+                await self._close_session(previous, previous_loop)
+        return self.session
+
+    @staticmethod
+    async def _close_session(session, loop):
+        """Closes a session created in another event loop"""
+        if loop.is_closed():
+            # nothing left to wait for in a closed loop, this only marks the
+            # session and its connector closed
+            await session.close()
+        else:
+            # its connections belong to that loop, closed once it runs again
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    def client_timeout(self, timeout=None):
+        if timeout is None:
+            timeout = (self.connect_timeout, self.read_timeout)
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+
+    async def send(
+        self, method, url, headers=None, payload=None, qstring_params=None, timeout=None
+    ):
+        """Sends a request over a pooled connection and reads the full body"""
+        session = await self._get_session()
+        # encoded here rather than by aiohttp so the request size is known
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode()
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        async with session.request(
+            method,
+            url,
+            headers=headers,
+            data=body,
+            params=qstring_params,
+            timeout=self.client_timeout(timeout),
+        ) as response:
+            content = await response.read()
+            return Five9AsyncResponse(
+                response.status,
+                response.headers,
+                content,
+                url=str(response.url),
+                reason=response.reason,
+                encoding=response.charset,
+                request_size=len(body) if body is not None else 0,
+            )
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._loop = None
@@ -1,20 +1,39 @@
 import asyncio
 import inspect
-import json
 import logging
+import threading
+import time
 
 import requests
 import websockets
 
 from five9_agent_sup_rest.config import CONTEXT_PATHS
+from five9_agent_sup_rest.config import LOGIN_STATE_CACHE_TTL
 from five9_agent_sup_rest.config import SETTINGS
 
-from five9_agent_sup_rest.exceptions import Five9DuplicateLoginError
+from five9_agent_sup_rest.exceptions import Five9DuplicateLoginError, Five9ResponseError
+from five9_agent_sup_rest.transport import Five9HttpTransport
+from five9_agent_sup_rest.async_transport import Five9AsyncHttpTransport
+from five9_agent_sup_rest.decoding import Five9FrameDecoder, frame_size
+from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+from five9_agent_sup_rest.event_bus import Five9EventBus
+from five9_agent_sup_rest.handler_registry import default_handler_classes
+from five9_agent_sup_rest.handler_registry import FALLBACK_EVENT_ID
+from five9_agent_sup_rest.handler_registry import is_handler_class
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry, Five9SocketMetrics
+from five9_agent_sup_rest.rate_limit import Five9RateLimiter
+from five9_agent_sup_rest.reconnect import ReconnectMetrics, ReconnectPolicy
+from five9_agent_sup_rest.recording import Five9FrameRecorder, Five9FrameReplayer
+from five9_agent_sup_rest.reference_data import ReferenceDataCache
+from five9_agent_sup_rest.retry import RetryPolicy
+from five9_agent_sup_rest.statistics_subscription import StatisticsSubscription
+from five9_agent_sup_rest.streaming import Five9EventStream
 
 from five9_agent_sup_rest.methods.base import SupervisorRestMethod, AgentRestMethod
 from five9_agent_sup_rest.methods import agent_methods, supervisor_methods
 
-from five9_agent_sup_rest.methods import default_socket_handlers
 
 
 API_METHOD_MODULES = {
@@ -29,6 +48,25 @@ API_METHOD_MODULES = {
 }
 
 
+# method classes of each API_METHOD_MODULES entry by name, scanned once per process
+METHOD_REGISTRIES = {}
+
+
+def method_registry(target_module):
+    registry = METHOD_REGISTRIES.get(target_module, None)
+    if registry is None:
+        registry = {
+            name: obj
+            for name, obj in inspect.getmembers(
+                API_METHOD_MODULES[target_module]["module"]
+            )
+            if inspect.isclass(obj)
+            and issubclass(obj, API_METHOD_MODULES[target_module]["sublass"])
+        }
+        METHOD_REGISTRIES[target_module] = registry
+    return registry
+
+
 class Five9RestClientSessionConfig:
     def __init__(self, *args, **kwargs):
         self.observers = []
@@ -48,13 +86,31 @@ class Five9RestClientSessionConfig:
         self.login_url = kwargs.get(
             "login_url", SETTINGS[self.region].get("FIVENINE_VCC_LOGIN_URL", "")
         )
+        self.transport = kwargs.get("transport", None) or Five9HttpTransport()
+        self.async_transport = (
+            kwargs.get("async_transport", None) or Five9AsyncHttpTransport()
+        )
+        self.rate_limiter = kwargs.get("rate_limiter", None) or Five9RateLimiter()
+        self.retry_policy = kwargs.get("retry_policy", None) or RetryPolicy()
+        self.metrics = kwargs.get("metrics", None) or Five9MetricsRegistry()
+        # serializes re-logins so concurrent 401s log in once
+        self.login_lock = threading.Lock()
+        self.login_state_cache = LoginStateCache(
+            ttl=kwargs.get("login_state_ttl", LOGIN_STATE_CACHE_TTL)
+        )
+        self.reference_data_cache = ReferenceDataCache(
+            ttls=kwargs.get("reference_data_ttl", None)
+        )
+        # optional Five9SessionCache, reuses the session of a previous process
+        self.session_cache = kwargs.get("session_cache", None)
 
-        self.login()
+        if not self.restore_cached_session():
+            self.login()
 
     def login(self, *args, **kwargs):
         self.session_metadata = None
 
-        login_request = requests.post(self.login_url, json=self.login_payload)
+        login_request = self.transport.post(self.login_url, json=self.login_payload)
 
         self.session_metadata = login_request.json()
         logging.debug(
@@ -69,10 +125,76 @@ class Five9RestClientSessionConfig:
 
         if self.session_metadata:
             self.process_session_metadata()
+            if self.session_cache is not None and login_request.status_code < 400:
+                self.session_cache.save(self.username, self.region, self)
             return True
         else:
             return False
 
+    def refresh_session(self, stale_token):
+        """Logs in again after stale_token was rejected.
+
+        Calls that fail together with the same token share a single login: the
+        first one logs in, the others find the token already replaced.  Returns
+        True when there is a new token to retry with.
+        """
+        with self.login_lock:
+            if self.tokenId != stale_token:
+                return True
+            logging.info(f"Five9RestClientSessionConfig - Session rejected, logging in again: {self.username}")
+            try:
+                refreshed = self.login()
+            except (requests.exceptions.RequestException, KeyError, ValueError) as err:
+                logging.error(f"Five9RestClientSessionConfig - Re-login failed: {err}")
+                return False
+            self.login_state_cache.invalidate()
+            return refreshed and self.tokenId != stale_token
+
+    def restore_cached_session(self):
+        """Reuses the cached session for this username and region when the server
+        still accepts its token.  Returns False when a full login is needed."""
+        if self.session_cache is None:
+            return False
+
+        entry = self.session_cache.load(self.username, self.region)
+        if entry is None:
+            return False
+
+        # the same shape as a login response, so it is processed like one
+        self.session_metadata = {
+            "tokenId": entry["tokenId"],
+            "userId": entry["userId"],
+            "orgId": entry["orgId"],
+            "context": {"farmId": entry["farmId"]},
+            "metadata": {
+                "dataCenters": [
+                    {"apiUrls": [{"host": entry["host"], "port": entry["port"]}]}
+                ]
+            },
+        }
+        self.cookies_header = entry["cookies_header"]
+        self.process_session_metadata()
+
+        if self.validate_session():
+            logging.info(f"Five9RestClientSessionConfig - Reusing cached session for {self.username}")
+            return True
+
+        logging.info(f"Five9RestClientSessionConfig - Cached session rejected for {self.username}")
+        self.session_cache.delete(self.username, self.region)
+        return False
+
+    def validate_session(self):
+        """Checks the session token with a single metadata request"""
+        try:
+            response = self.transport.get(
+                f"{self.base_api_url}{CONTEXT_PATHS['agent_rest']}/auth/metadata",
+                headers=self.api_header,
+            )
+        except requests.exceptions.RequestException as err:
+            logging.error(f"Five9RestClientSessionConfig - Session validation failed: {err}")
+            return False
+        return response.status_code < 400
+
     def process_session_metadata(self, *args, **kwargs):
         # Break down the processing into smaller, manageable parts
         self.set_api_urls()
@@ -115,7 +237,8 @@ class Five9RestClientSessionConfig:
         )
 
     def subscribe_observer(self, observer):
-        self.observers.append(observer)
+        if observer not in self.observers:
+            self.observers.append(observer)
 
     def notify_observers(self, *args, **kwargs):
         for observer in self.observers:
@@ -124,16 +247,45 @@ class Five9RestClientSessionConfig:
 
 class Five9RestClient:
     class RESTNamespace:
+        """Method instances are created on first access, from the method registry and
+        any custom methods added to the namespace, and reused after that.  A client
+        only pays for the methods it calls, however large the catalog grows.
+        """
+
         def __init__(
             self, target_module, session_configuration: Five9RestClientSessionConfig
         ):
-            for name, obj in inspect.getmembers(
-                API_METHOD_MODULES[target_module]["module"]
-            ):
-                if inspect.isclass(obj) and issubclass(
-                    obj, API_METHOD_MODULES[target_module]["sublass"]
-                ):
-                    setattr(self, name, obj(session_configuration))
+            self._registry = method_registry(target_module)
+            self._custom_methods = {}
+            self._session_configuration = session_configuration
+            # threads first touching the same method share one instance
+            self._lock = threading.Lock()
+
+        def add_method(self, method_class):
+            self._custom_methods[method_class.__name__] = method_class
+            # a custom method replaces an already created method of the same name
+            self.__dict__.pop(method_class.__name__, None)
+
+        def __getattr__(self, name):
+            # only called for names that are not instance attributes yet
+            if name.startswith("_"):
+                raise AttributeError(name)
+            method_class = self._custom_methods.get(name, None) or self._registry.get(
+                name, None
+            )
+            if method_class is None:
+                raise AttributeError(f"No REST method named {name}")
+            with self._lock:
+                method = self.__dict__.get(name, None)
+                if method is None:
+                    method = method_class(self._session_configuration)
+                    setattr(self, name, method)
+            return method
+
+        def __dir__(self):
+            return sorted(
+                set(super().__dir__()) | set(self._registry) | set(self._custom_methods)
+            )
 
     def __init__(self, *args, **kwargs):
         self.stationId = kwargs.get("stationId", "")
@@ -144,16 +296,82 @@ class Five9RestClient:
         custom_agent_methods = kwargs.get("custom_agent_methods", [])
         
         self.custom_socket_handlers = kwargs.get("custom_socket_handlers", {})
+        # handler classes for this client's sockets, their instances survive reconnects
+        self.socket_handler_registry = SocketHandlerRegistry(
+            self, self.custom_socket_handlers
+        )
         self.socket_app_key = kwargs.get("socket_app_key", "python_pack_socket")
+        self.socket_dispatch_options = kwargs.get("socket_dispatch_options", {})
+        # JSON decoder for websocket frames, orjson is used when installed
+        self.socket_json_loads = kwargs.get("socket_json_loads", None)
+        # ssl.SSLContext for the websocket connection, None uses the default
+        self.socket_ssl_context = kwargs.get("socket_ssl_context", None)
+        # ReconnectPolicy options for dropped websockets, see config.SOCKET_RECONNECT
+        self.socket_reconnect_options = kwargs.get("socket_reconnect_options", {})
+        # Five9SocketMetrics options for the sockets, see config.SOCKET_METRICS
+        self.socket_metrics_options = kwargs.get("socket_metrics_options", {})
+        # path of a frame log the sockets record every received frame to, a
+        # "{context}" in the path is replaced with the socket's context
+        self.socket_record_path = kwargs.get("socket_record_path", None)
+        # Five9FrameRecorder options, see config.SOCKET_RECORDING
+        self.socket_record_options = kwargs.get("socket_record_options", {})
+        # the statistics the server streams to the supervisor socket, a
+        # StatisticsSubscription or its options, applied to every supervisor session
+        statistics_subscription = kwargs.get("statistics_subscription", None)
+        if isinstance(statistics_subscription, dict):
+            statistics_subscription = StatisticsSubscription(**statistics_subscription)
+        self.statistics_subscription = statistics_subscription
+        # token of the session the subscription was last applied to
+        self.statistics_subscription_token = None
 
         self.logged_in = False
 
-        logging.info(f"Initializing VCC_Client for user: {kwargs["username"]}")
+        logging.info(f"Initializing VCC_Client for user: {kwargs['username']}")
 
+        # A transport passed in by the caller is shared with other clients and is
+        # not closed by this client
+        self.owns_transport = kwargs.get("transport", None) is None
+        self.transport = kwargs.get("transport", None) or Five9HttpTransport(
+            **kwargs.get("transport_options", {})
+        )
+        self.owns_async_transport = kwargs.get("async_transport", None) is None
+        self.async_transport = kwargs.get(
+            "async_transport", None
+        ) or Five9AsyncHttpTransport(**kwargs.get("async_transport_options", {}))
+
+        # A rate limiter passed in by the caller can be shared between clients that
+        # count against the same limits
+        self.rate_limiter = kwargs.get("rate_limiter", None) or Five9RateLimiter(
+            **kwargs.get("rate_limit_options", {})
+        )
+
+        # A metrics registry passed in by the caller collects the calls of every
+        # client it is passed to
+        self.metrics = kwargs.get("metrics", None) or Five9MetricsRegistry(
+            **kwargs.get("metrics_options", {})
+        )
+
+        session_options = {
+            option: kwargs[option]
+            for option in ("region", "login_url", "session_cache")
+            if option in kwargs
+        }
         self.session_configuration = Five9RestClientSessionConfig(
             username=kwargs["username"],
             password=kwargs["password"],
+            transport=self.transport,
+            async_transport=self.async_transport,
+            rate_limiter=self.rate_limiter,
+            metrics=self.metrics,
+            retry_policy=kwargs.get("retry_policy", None)
+            or RetryPolicy(**kwargs.get("retry_options", {})),
+            login_state_ttl=kwargs.get("login_state_ttl", LOGIN_STATE_CACHE_TTL),
+            # cache TTLs by method class name, merged over config.REFERENCE_DATA_TTL
+            reference_data_ttl=kwargs.get("reference_data_ttl", None),
+            **session_options,
         )
+        self.login_state_cache = self.session_configuration.login_state_cache
+        self.reference_data_cache = self.session_configuration.reference_data_cache
 
         self.agent = self.RESTNamespace("agent_methods", self.session_configuration)
         self.supervisor = self.RESTNamespace(
@@ -162,14 +380,12 @@ class Five9RestClient:
 
         for method in custom_supervisor_methods:
             if inspect.isclass(method) and issubclass(method, SupervisorRestMethod):
-                setattr(
-                    self.supervisor, method.__name__, method(self.session_configuration)
-                )
+                self.supervisor.add_method(method)
                 logging.info(f"Custom Supervisor Method Added: {method.__name__}")
 
         for method in custom_agent_methods:
             if inspect.isclass(method) and issubclass(method, AgentRestMethod):
-                setattr(self.agent, method.__name__, method(self.session_configuration))
+                self.agent.add_method(method)
                 logging.info(f"Custom Agent Method Added: {method.__name__}")
 
         self.extensions = {}
@@ -202,9 +418,8 @@ class Five9RestClient:
         current_supervisor_login_state = self.supervisor_login_state
 
         if current_supervisor_login_state == "WORKING":
-            self.supervisor_socket = Five9Socket(
-                self, "supervisor", self.socket_app_key
-            )
+            self.apply_statistics_subscription()
+            self.get_socket("supervisor")
             return True
 
         if current_supervisor_login_state in ["ACCEPT_NOTICE", "WORKING"]:
@@ -228,9 +443,8 @@ class Five9RestClient:
                 return False
 
             logging.debug(f"SUPERVISOR SESSION STARTED Result: {session.__dict__}")
-            self.supervisor_socket = Five9Socket(
-                self, "supervisor", self.socket_app_key
-            )
+            self.apply_statistics_subscription()
+            self.get_socket("supervisor")
             return True
 
     def initialize_agent_session(self, auto_accept_notice=True):
@@ -238,9 +452,7 @@ class Five9RestClient:
         current_agent_login_state = self.agent_login_state
 
         if current_agent_login_state == "WORKING":
-            self.supervisor_socket = Five9Socket(
-                self, "supervisor", self.socket_app_key
-            )
+            self.get_socket("agent")
             return True
 
         if current_agent_login_state in ["ACCEPT_NOTICE", "WORKING"]:
@@ -263,16 +475,77 @@ class Five9RestClient:
 
             logging.debug(f"AGENT SESSION STARTED Result: {session.__dict__}")
 
-            self.agent_socket = Five9Socket(self, "agent", self.socket_app_key)
+            self.get_socket("agent")
             return True
 
+    def apply_statistics_subscription(self, force=False):
+        """Applies statistics_subscription to the supervisor session, once per
+        session unless forced.  Returns True when it was applied, a subscription
+        the server rejects is logged and tried again with the next session."""
+        if self.statistics_subscription is None:
+            return False
+        token = self.session_configuration.tokenId
+        if not force and self.statistics_subscription_token == token:
+            return False
+        try:
+            self.statistics_subscription.apply(self)
+        except Five9ResponseError as err:
+            # experimental, the session works without it
+            logging.warning(f"Statistics subscription rejected, not applied: {err}")
+            return False
+        self.statistics_subscription_token = token
+        return True
+
+    def get_socket(self, context):
+        """Returns the socket for "supervisor" or "agent", creating it on first use"""
+        socket = getattr(self, f"{context}_socket", None)
+        if socket is None:
+            socket = Five9Socket(self, context, self.socket_app_key)
+            setattr(self, f"{context}_socket", socket)
+        return socket
+
+    def restore_session(self, user_type="supervisor"):
+        """Logs in again and restarts the session for "supervisor" or "agent"
+
+        Used when the server rejects the session token.  The existing sockets, their
+        handlers and the REST method instances are kept and pick up the new token.
+        """
+        self.session_configuration.login()
+        self.login_state_cache.invalidate()
+        if user_type == "agent":
+            return self.initialize_agent_session()
+        return self.initialize_supervisor_session()
+
+    def close(self):
+        if self.owns_transport:
+            self.transport.close()
+
+    async def aclose(self):
+        if self.owns_async_transport:
+            await self.async_transport.close()
+
+    def get_login_state(self, user_type, refresh=False):
+        """Returns the login state for "supervisor" or "agent"
+
+        The state is served from the login state cache and only read over REST
+        when it is unknown, stale, or a refresh is requested.
+        """
+        state = None if refresh else self.login_state_cache.get(user_type)
+        if state is None:
+            if user_type == "supervisor":
+                state = self.supervisor.SupervisorLoginState.invoke()
+            else:
+                state = self.agent.AgentLoginState.invoke()
+            self.login_state_cache.set(user_type, state)
+        return state
+
     @property
     def supervisor_login_state(self):
-        return self.supervisor.SupervisorLoginState.invoke()
+        return self.get_login_state("supervisor")
 
     @property
     def agent_login_state(self):
-        return self.agent.AgentLoginState.invoke()
+        return self.get_login_state("agent")
 
 
 class Five9Socket:
@@ -283,32 +556,105 @@ class Five9Socket:
 
     def __init__(self, client: Five9RestClient, context, socket_app_key):
         self.client = client
+        self.context = context
         self.socket_app_key = socket_app_key
         self.context_path = CONTEXT_PATHS[f"websocket_{context}"]
-        self.uri = f"wss://{client.session_configuration.host}:{client.session_configuration.port}{self.context_path}"
-        self.uri = self.uri.format(socket_app_key=self.socket_app_key)
+
+        self.decoder = Five9FrameDecoder(loads=client.socket_json_loads)
+        self.reconnect_policy = ReconnectPolicy(**client.socket_reconnect_options)
+        self.reconnect_metrics = ReconnectMetrics()
+        self.reconnect_attempt = 0
+        self.metrics = Five9SocketMetrics(
+            context,
+            user=client.session_configuration.username,
+            **client.socket_metrics_options,
+        )
+        client.metrics.add_collector(self.metrics)
+
+        # taken from the client's handler registry on the first run() and kept
+        # across reconnects, each handler is subscribed to the event bus
+        self.handlers = None
+        self.handler_subscriptions = {}
+        self.bus = Five9EventBus()
+        self.dispatcher = None
+        # a Five9FrameRecorder while frames are being recorded
+        self.recorder = None
 
         self.disconnect_event = asyncio.Event()
+        self.stop_event = asyncio.Event()
         self.disconnect_requested = False
 
+        self.websocket = None
+        self.running = False
+        self.streams = []
+        self.messages_received = 0
+        self.last_message_at = None
+
         logging.debug(f"WebSocket URI: {self.uri}")
 
+    @property
+    def uri(self):
+        # the host can change when the session is migrated or restored
+        uri = f"wss://{self.client.session_configuration.host}:{self.client.session_configuration.port}{self.context_path}"
+        return uri.format(socket_app_key=self.socket_app_key)
+
+    @property
+    def connected(self):
+        return self.websocket is not None and self.websocket.open
+
+    def build_handlers(self):
+        self.handlers = self.client.socket_handler_registry.table_for(self)
+        self.fallback_handler = self.client.socket_handler_registry.fallback
+        for eventId, handlers in self.handlers.items():
+            for handler in handlers:
+                self.subscribe_handler(eventId, handler)
+        self.subscribe_handler(FALLBACK_EVENT_ID, self.fallback_handler)
+
+    def subscribe_handler(self, eventId, handler):
+        self.handler_subscriptions[handler] = self.bus.subscribe(
+            eventId,
+            handler,
+            priority=handler.priority,
+            isolated=handler.isolated,
+            data_sources=handler.data_sources,
+            predicate=handler.predicate,
+        )
+
     def add_socket_handler(self, handler):
-        if (
-            inspect.isclass(handler)
-            and issubclass(handler, default_socket_handlers.SocketEventHandler)
-            and hasattr(handler, "eventId")
-        ):
-            handler = handler(client=self.client)
-            self.handlers[handler.eventId] = handler
+        if self.handlers is None:
+            self.build_handlers()
+        if is_handler_class(handler):
+            handler = handler(client=self.client, socket=self)
+            handlers = self.handlers.setdefault(handler.eventId, [])
+            defaults = default_handler_classes().get(handler.eventId, ())
+            if handlers and all(type(existing) in defaults for existing in handlers):
+                # a custom handler replaces the default, as in the registry
+                for existing in handlers:
+                    self.bus.unsubscribe(self.handler_subscriptions.pop(existing))
+                handlers.clear()
+            handlers.append(handler)
+            self.subscribe_handler(handler.eventId, handler)
             logging.debug(f"Handler Added: {handler.eventId}")
 
         else:
             logging.debug(f"Skipping {handler}")
 
+    def subscribe(self, eventId, handler, **options):
+        """Subscribes a handler or coroutine function to the events of eventId,
+        alongside the socket's other handlers.  Options are priority, isolated,
+        data_sources, predicate and name, see Five9EventBus.  Returns the
+        Subscription to pass to unsubscribe()."""
+        if self.handlers is None:
+            self.build_handlers()
+        return self.bus.subscribe(eventId, handler, **options)
+
+    def unsubscribe(self, subscription):
+        self.bus.unsubscribe(subscription)
+
     async def send_ping(self, websocket):
         while not self.disconnect_requested:
             try:
+                self.metrics.ping_sent()
                 await websocket.send("ping")
                 logging.debug("Ping sent")
 
@@ -334,6 +680,7 @@ class Five9Socket:
                 break
 
     async def handle_messages(self, websocket):
+        bus = self.bus
         async for message in websocket:
             if self.disconnect_requested:
                 logging.info(
@@ -341,24 +688,47 @@ class Five9Socket:
                 )
                 break
 
-            event = json.loads(message)
-
-            handler = self.handlers.get(event["context"]["eventId"], None)
-
-            if not handler:
-                logging.info(
-                    f"No handler found for event {event['context']['eventId']}, creating generic handler."
-                )
-                handler = default_socket_handlers.SocketEventHandler(
-                    self.client, event["context"]["eventId"]
-                )
-                self.handlers[event["context"]["eventId"]] = handler
-
-            handled = await handler.handle(event)
-            if handled == "reconnect":
-                logging.info("Reconnecting socket.")
-                await self.close()
-                self.connect()
+            self.messages_received += 1
+            self.last_message_at = time.time()
+            if self.recorder is not None:
+                self.recorder.record(message, self.last_message_at)
+
+            eventId = self.decoder.peek_event_id(message)
+            if eventId is None:
+                event = self.decoder.decode(message)
+                eventId = self.decoder.event_id(event)
+            else:
+                event = None
+            self.metrics.record_received(eventId, frame_size(message))
+
+            # eventIds without subscribers share the fallback subscribers and queue
+            route = bus.routes.get(eventId, None) or bus.fallback
+
+            if event is None:
+                # events for the fallback handler, or for subscribers that all opt
+                # in, are only decoded if a subscriber reads them
+                if route.lazy_decode:
+                    event = self.decoder.lazy(message, eventId)
+                else:
+                    event = self.decoder.decode(message)
+
+            # subscribers run in the dispatcher's workers so the reader keeps up,
+            # every group of subscribers gets the same event object
+            for dispatch_key, group in route.targets:
+                await self.dispatcher.dispatch(dispatch_key, group, event, eventId)
+
+            for stream in self.streams:
+                if stream.wants(eventId):
+                    await stream.put(event)
+
+        # wake the ping loop so it notices the closed connection
+        self.disconnect_event.set()
+
+    async def handle_result(self, handler, event, result):
+        if result == "reconnect":
+            logging.info("Reconnecting socket.")
+            # run() reconnects once the current connection has closed
+            await self.close()
 
     async def listen_for_disconnect(self):
         # Get the event loop for the current thread,
@@ -368,44 +738,221 @@ class Five9Socket:
 
     def _await_disconnect(self, loop):
         input("\nWebsocket Open, press Enter to disconnect...\n")
-        self.disconnect_requested = True
-        self.disconnect_event.set()  # Set the event to wake up the send_ping coroutine
         logging.info("Disconnect command received.")
-        asyncio.run_coroutine_threadsafe(self.close(), loop)
+        asyncio.run_coroutine_threadsafe(self.stop(), loop)
 
     async def _connect(self):
+        # the token and cookies are read on every connect so a reconnect after a
+        # re-login uses the new session
         headers = {
-            "Authorization": f"Bearer-{self.client.session_configuration.tokenId}",  # Use the token provided during initialization
-            "Cookie": self.client.session_configuration.cookies_header,  # Use the cookies provided during initialization
+            "Authorization": f"Bearer-{self.client.session_configuration.tokenId}",
+            "Cookie": self.client.session_configuration.cookies_header,
         }
 
-        self.handlers = {}
-
-        for name, handler in inspect.getmembers(default_socket_handlers):
-            if inspect.isclass(handler) and issubclass(
-                handler, default_socket_handlers.SocketEventHandler
-            ):
-                self.add_socket_handler(handler)
-
-        for handler in self.client.custom_socket_handlers:
-            added = self.add_socket_handler(handler)
-            logging.debug(f"Handler Added: {handler.eventId}")
+        self.disconnect_event = asyncio.Event()
 
-        async with websockets.connect(self.uri, extra_headers=headers) as websocket:
+        async with websockets.connect(
+            self.uri, extra_headers=headers, ssl=self.client.socket_ssl_context
+        ) as websocket:
             self.websocket = websocket
-            # Run sending pings and message handler concurrently
-            await asyncio.gather(
-                self.send_ping(websocket),
-                self.handle_messages(websocket),
-                self.listen_for_disconnect(),
-            )
+            self.reconnect_attempt = 0
+            self.reconnect_metrics.connected()
+            logging.info(f"WebSocket connected: {self.context}")
+            # login state events keep the cached state current while connected
+            self.client.login_state_cache.attach(self.context)
+            # pings are sent alongside the message handler, which returns when
+            # the connection closes
+            ping_task = asyncio.create_task(self.send_ping(websocket))
+            try:
+                await self.handle_messages(websocket)
+            finally:
+                self.client.login_state_cache.detach(self.context)
+                # not left running into the next reconnect attempt when the
+                # handler failed
+                ping_task.cancel()
+                try:
+                    await ping_task
+                except asyncio.CancelledError:
+                    pass
+
+    async def relogin(self):
+        logging.info(f"WebSocket token rejected, logging in again: {self.context}")
+        self.reconnect_metrics.relogins += 1
+        await asyncio.to_thread(self.client.restore_session, self.context)
 
     def connect(self):
+        async def connect_until_enter():
+            run_task = asyncio.create_task(self.run())
+            await self.listen_for_disconnect()
+            await run_task
+
         try:
-            asyncio.run(self._connect())
+            asyncio.run(connect_until_enter())
         except:
             logging.exception("Error in WebSocket connection.")
 
+    async def run(self, reconnect=True):
+        """Connects and handles events on the running event loop until stop() is called.
+        Unlike connect(), does not wait for Enter on stdin.
+
+        A dropped connection is reconnected with exponential backoff, reusing the
+        session token, cookies, handlers and dispatcher.  The client only logs in
+        again when the server rejects the token.  With reconnect=False, or once the
+        reconnect policy gives up, run() returns when the connection closes and
+        raises the connection error if there was one.
+
+        A stop() made before run() starts, for example right after the run task is
+        created, is kept: run() returns without connecting.
+        """
+        if self.handlers is None:
+            self.build_handlers()
+
+        self.reconnect_attempt = 0
+        self.dispatcher = Five9EventDispatcher(
+            on_result=self.handle_result,
+            metrics=self.metrics,
+            **self.client.socket_dispatch_options,
+        )
+        self.metrics.dispatcher = self.dispatcher
+        if self.client.socket_record_path and self.recorder is None:
+            self.start_recording(
+                self.client.socket_record_path.format(context=self.context),
+                **self.client.socket_record_options,
+            )
+
+        self.running = True
+        relogged_in = False
+        try:
+            while not self.disconnect_requested:
+                error = None
+                connections = self.reconnect_metrics.connections
+                try:
+                    await self._connect()
+                except websockets.InvalidStatusCode as e:
+                    error = e
+                    # a rejected token is replaced once before backing off
+                    if (
+                        e.status_code in (401, 403)
+                        and not relogged_in
+                        and not self.disconnect_requested
+                    ):
+                        self.reconnect_metrics.disconnected()
+                        try:
+                            await self.relogin()
+                        except Exception as relogin_error:
+                            logging.error(f"WebSocket re-login failed: {relogin_error}")
+                            error = relogin_error
+                        else:
+                            self.reconnect_metrics.failed_attempts += 1
+                            relogged_in = True
+                            continue
+                except (
+                    OSError,
+                    asyncio.TimeoutError,
+                    websockets.WebSocketException,
+                ) as e:
+                    error = e
+                finally:
+                    self.websocket = None
+
+                if self.disconnect_requested:
+                    break
+
+                self.reconnect_metrics.disconnected()
+                if self.reconnect_metrics.connections == connections:
+                    self.reconnect_metrics.failed_attempts += 1
+                if error is not None:
+                    logging.warning(f"WebSocket connection lost: {error!r}")
+
+                if not reconnect or not self.reconnect_policy.should_retry(
+                    self.reconnect_attempt
+                ):
+                    if error is not None:
+                        raise error
+                    break
+
+                relogged_in = False
+                delay = self.reconnect_policy.delay(self.reconnect_attempt)
+                self.reconnect_attempt += 1
+                logging.info(
+                    f"WebSocket reconnect attempt {self.reconnect_attempt} in {delay:.2f}s"
+                )
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.running = False
+            # the stop has been handled, the socket can be run again
+            self.disconnect_requested = False
+            self.stop_event = asyncio.Event()
+            await self.dispatcher.close()
+            for stream in list(self.streams):
+                stream.end()
+            if self.client.socket_record_path:
+                self.stop_recording()
+
+    def start_recording(self, path, **options):
+        """Appends every frame received from now on to the frame log at path, see
+        Five9FrameRecorder for the options"""
+        self.stop_recording()
+        self.recorder = Five9FrameRecorder(path, **options)
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    async def replay(self, source, speed=1, **options):
+        """Feeds recorded frames through this socket's handlers and dispatcher,
+        without connecting, and returns the replay's stats once every event has
+        been handled.  source is a frame log path or (received_at, frame) pairs and
+        speed scales the recorded timing, None replays as fast as possible; see
+        Five9FrameReplayer.
+
+        Handlers run exactly as they would for a live socket, so handlers that call
+        REST methods need a logged in client.  Server lag in the socket metrics is
+        measured against the recorded receive times.
+        """
+        if self.handlers is None:
+            self.build_handlers()
+
+        replayer = Five9FrameReplayer(source, speed=speed, **options)
+        self.disconnect_requested = False
+        self.dispatcher = Five9EventDispatcher(
+            on_result=self.handle_result,
+            metrics=self.metrics,
+            **self.client.socket_dispatch_options,
+        )
+        self.metrics.dispatcher = self.dispatcher
+        wall_clock = self.metrics.wall_clock
+        self.metrics.wall_clock = replayer.recorded_clock
+        try:
+            await self.handle_messages(replayer)
+            await self.dispatcher.join()
+            # the replay ends when the last event has been handled
+            replayer.finished = time.perf_counter()
+        finally:
+            self.metrics.wall_clock = wall_clock
+            await self.dispatcher.close()
+            for stream in list(self.streams):
+                stream.end()
+        return replayer.stats()
+
+    def stream(self, event_ids=None, max_queue=1000):
+        """Returns an async context manager that iterates over received events
+
+        event_ids limits the stream to the given eventIds.  See Five9EventStream.
+        """
+        return Five9EventStream(self, event_ids=event_ids, max_queue=max_queue)
+
+    async def stop(self):
+        self.disconnect_requested = True
+        self.stop_event.set()
+        self.disconnect_event.set()
+        await self.close()
+
     async def close(self):
         if hasattr(self, "websocket") and self.websocket and self.websocket.open:
             await self.websocket.close()
@@ -28,3 +28,200 @@ CONTEXT_PATHS = {
     "websocket_agent": "/appsvcs/ws/{socket_app_key}_agent",
     "websocket_supervisor": "/supsvcs/sws/{socket_app_key}_super",
 }
+
+# Defaults for the pooled HTTP transport shared by every REST method on a client
+HTTP_TRANSPORT = {
+    # number of distinct hosts to keep connection pools for
+    "pool_connections": 4,
+    # number of keep-alive connections kept open per host
+    "pool_maxsize": 16,
+    # block instead of opening throwaway connections when the pool is exhausted
+    "pool_block": False,
+    # seconds to wait for the TCP/TLS connection to be established
+    "connect_timeout": 5,
+    # seconds to wait for the server to send a response
+    "read_timeout": 30,
+}
+
+# Defaults for the asyncio HTTP transport used by ainvoke()
+ASYNC_HTTP_TRANSPORT = {
+    # total number of simultaneous connections
+    "limit": 100,
+    # simultaneous connections to a single host, 0 for no limit
+    "limit_per_host": 0,
+    # seconds an idle keep-alive connection is held open
+    "keepalive_timeout": 30,
+    "connect_timeout": 5,
+    "read_timeout": 30,
+}
+
+# Defaults for the dispatch stage between a websocket reader and its handlers.
+# Handler classes may override queue_size, workers and overflow_policy.
+SOCKET_DISPATCH = {
+    # maximum events waiting per handler worker
+    "queue_size": 1000,
+    # concurrent workers per handler, events for an eventId stay ordered with 1
+    "workers": 1,
+    # what the reader does when a queue is full: "block", "drop_oldest" or "spill"
+    "overflow_policy": "block",
+}
+
+# Seconds a login state read over REST is reused before it is fetched again.
+# While a socket for the session is open, login state events keep it current.
+LOGIN_STATE_CACHE_TTL = 30
+
+# eventIds of socket events the client itself consumes
+SOCKET_EVENT_IDS = {
+    "EVENT_LOGIN_STATE_UPDATED": "1",
+}
+
+# Reconnect behaviour of Five9Socket.run() after a dropped or failed connection
+SOCKET_RECONNECT = {
+    "enabled": True,
+    # first backoff delay in seconds, multiplied per consecutive failed attempt
+    "initial_delay": 0.1,
+    "max_delay": 30,
+    "multiplier": 2,
+    # randomize each delay between 0 and the backoff delay
+    "jitter": True,
+    # give up after this many consecutive failed attempts, None to keep trying
+    "max_attempts": None,
+}
+
+# Defaults for the opt-in encrypted session cache, see session_cache.Five9SessionCache
+SESSION_CACHE = {
+    "directory": "~/.five9_agent_sup_rest/sessions",
+    # environment variable holding the Fernet key cached sessions are encrypted with
+    "key_env_var": "FIVE9_SESSION_CACHE_KEY",
+    # seconds a cached session is reused before logging in again, it is validated
+    # with the server before every reuse regardless
+    "max_age": 8 * 60 * 60,
+}
+
+# Seconds the responses of reference data GET methods are cached, by method class
+# name.  Methods not listed are not cached unless they set cache_ttl.  With a TTL of
+# 0 every call revalidates with the server, cheaply when it supports ETags.
+REFERENCE_DATA_TTL = {
+    "DomainQueues": 300,
+    "GetDomainDispositions": 300,
+}
+
+# Defaults for reconciling supervisor alerts with alerts.AlertReconciler
+ALERT_RECONCILE = {
+    # field identifying the same alert in the desired and the current set
+    "key_field": "name",
+    # creates, updates and deletes sent at the same time
+    "concurrency": 16,
+    # delete current alerts that are not in the desired set
+    "delete_missing": True,
+}
+
+# Defaults for the client side rate limiter shared by every REST method of a client
+RATE_LIMIT = {
+    # sustained requests per second for the whole client, None for no limit.
+    # Retry-After from throttled responses is honored either way.
+    "rate": None,
+    # requests that may be sent at once after an idle period, defaults to rate
+    "burst": None,
+    # separate limits by method class name, {"GetAlerts": 5} or {"GetAlerts": (5, 10)}
+    "method_rates": {},
+    # lower the rate when throttled and raise it back while responses succeed
+    "adaptive": True,
+    # the adaptive rate never goes below min_rate or above the configured rate
+    "min_rate": 1,
+    # requests per second added to the rate for every successful response
+    "increase_step": 0.1,
+    # the rate is multiplied by decrease_factor when a response is throttled
+    "decrease_factor": 0.5,
+    # status codes that mean the server is throttling the client
+    "throttle_statuses": (429, 503),
+    # seconds to pause when a throttled response has no Retry-After header
+    "default_retry_after": 1,
+}
+
+# Defaults for retrying failed REST calls, see retry.RetryPolicy
+RETRY = {
+    # attempts per call, including the first, 1 to never retry
+    "max_attempts": 3,
+    # backoff before the first retry in seconds, multiplied per retry up to max_delay
+    "initial_delay": 0.2,
+    "max_delay": 5,
+    "multiplier": 2,
+    # randomize each delay between 0 and the backoff delay
+    "jitter": True,
+    # responses retried like connection errors and timeouts
+    "retry_statuses": (429, 500, 502, 503, 504),
+    # http methods that are safe to send twice
+    "idempotent_methods": ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+    # also retry POST, methods can opt in individually with idempotent = True
+    "retry_post": False,
+    # log in again, once per call, when a response is 401 and retry with the new token
+    "relogin_on_401": True,
+    # seconds after which a call stops retrying, None for no limit
+    "total_timeout": None,
+}
+
+# Defaults for the REST call metrics, see metrics.Five9MetricsRegistry
+METRICS = {
+    "enabled": True,
+    # upper bounds of the latency histogram buckets in seconds
+    "latency_buckets": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    # prefix of the metric names in the text exposition
+    "prefix": "five9_rest",
+}
+
+# Defaults for the websocket pipeline metrics, see metrics.Five9SocketMetrics
+SOCKET_METRICS = {
+    "enabled": True,
+    # upper bounds of the handler time, lag and ping histogram buckets in seconds
+    "latency_buckets": (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    # seconds over which the per-eventId event rate is counted
+    "rate_window": 10,
+    # fields of an event's context holding its server timestamp, epoch ms or seconds
+    "timestamp_fields": ("timestamp", "eventTimestamp"),
+    "prefix": "five9_socket",
+}
+
+# Defaults for recording websocket frames and replaying them, see recording.py
+SOCKET_RECORDING = {
+    # gzip level of the frame log, 1 is fastest
+    "compresslevel": 6,
+    # frames buffered before the log is flushed, a crash loses at most these
+    "flush_every": 1000,
+    # longest wait between two replayed frames in recorded seconds, so the gaps
+    # between recording sessions appended to one log are skipped; None keeps them
+    "max_gap": 10,
+}
+
+# Defaults for the supervisor statistics the server streams to the socket, see
+# statistics_subscription.StatisticsSubscription.  None leaves the server's setting.
+STATISTICS_SUBSCRIPTION = {
+    # dataSources streamed in 5000 and 5012 events, such as "ACD_STATUS"
+    "data_sources": None,
+    # skills, by name or id, whose queue statistics are streamed
+    "skills": None,
+    # columns streamed per dataSource, {"ACD_STATUS": ["callsInQueue"]}; dataSources
+    # not listed keep all their columns
+    "columns": None,
+}
+
+# Defaults for handlers that run in a process pool, see offload.py
+SOCKET_OFFLOAD = {
+    # pool processes, None for one per CPU
+    "processes": None,
+    # multiprocessing start method of the pool; "spawn" is safe with the threads
+    # the client runs, "fork" starts faster where it is available
+    "start_method": "spawn",
+}
+
+# Defaults for the rolling queue statistics history, see timeseries.QueueTimeSeries
+QUEUE_TIMESERIES = {
+    # ACD_STATUS fields kept per queue, numeric fields only
+    "metrics": ("callsInQueue", "longestQueueTime"),
+    # seconds per sample, updates within one are merged into its sample
+    "resolution": 1.0,
+    # samples kept per series, with a resolution of 1 the last 15 minutes
+    "capacity": 900,
+    # queues room is reserved for, doubled when a domain has more
+    "initial_queues": 256,
+}
@@ -0,0 +1,102 @@
+import json
+import logging
+import re
+from collections.abc import Mapping
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# the eventId key of the context object, not one inside the payLoad
+EVENT_ID_PATTERN = re.compile(r'"context"\s*:\s*\{[^{}]*?"eventId"\s*:\s*"?(\w+)"?')
+# characters of the frame searched for the context, Five9 sends it first
+EVENT_ID_PEEK_CHARS = 1024
+
+
+def frame_size(frame):
+    """Bytes of a websocket frame as sent, text frames are UTF-8.  ASCII text,
+    the usual case, is measured without encoding it."""
+    if isinstance(frame, str) and not frame.isascii():
+        return len(frame.encode())
+    return len(frame)
+
+
+def default_loads():
+    """Returns the fastest available JSON decoder, orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+class LazyEvent(Mapping):
+    """A websocket event that is only decoded when its contents are accessed.
+
+    The eventId is read from the raw frame without decoding it.  Handlers that only
+    need the eventId, or that drop most events, never pay for the full decode.
+    """
+
+    __slots__ = ("raw", "eventId", "_loads", "_decoded")
+
+    def __init__(self, raw, eventId, loads):
+        self.raw = raw
+        self.eventId = eventId
+        self._loads = loads
+        self._decoded = None
+
+    @property
+    def decoded(self):
+        if self._decoded is None:
+            self._decoded = self._loads(self.raw)
+        return self._decoded
+
+    @property
+    def is_decoded(self):
+        return self._decoded is not None
+
+    def __getitem__(self, key):
+        return self.decoded[key]
+
+    def __iter__(self):
+        return iter(self.decoded)
+
+    def __len__(self):
+        return len(self.decoded)
+
+    def __repr__(self):
+        return f"LazyEvent(eventId={self.eventId!r}, decoded={self.is_decoded})"
+
+
+class Five9FrameDecoder:
+    """Decodes websocket frames for Five9Socket.
+
+    peek_event_id() finds the eventId in the raw frame so the socket can route the
+    frame before decoding it.  Only the start of the frame is searched, frames whose
+    context is further in, or has nested objects before the eventId, are decoded
+    to find it.  decode() fully decodes a frame, and lazy() wraps it in
+    a LazyEvent that defers decoding until the event is read.  Pass loads to use a
+    specific JSON decoder, by default orjson is used when installed.
+    """
+
+    def __init__(self, loads=None):
+        self.loads = loads or default_loads()
+        logging.debug(
+            f"Five9FrameDecoder - using {getattr(self.loads, '__module__', self.loads)}"
+        )
+
+    def peek_event_id(self, frame):
+        match = EVENT_ID_PATTERN.search(frame, 0, EVENT_ID_PEEK_CHARS)
+        if match is None:
+            return None
+        return match.group(1)
+
+    def event_id(self, event):
+        """The eventId of a decoded event, as a string like the peeked ones"""
+        return str(event["context"]["eventId"])
+
+    def decode(self, frame):
+        return self.loads(frame)
+
+    def lazy(self, frame, eventId):
+        return LazyEvent(frame, eventId, self.loads)
@@ -0,0 +1,212 @@
+import asyncio
+import collections
+import itertools
+import logging
+import time
+
+from five9_agent_sup_rest.config import SOCKET_DISPATCH
+from five9_agent_sup_rest.exceptions import Five9SubscriberError
+
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+
+class DispatchPartition:
+    """A bounded queue of events and the worker task that feeds them to a handler.
+
+    When the overflow policy is "spill", events that do not fit in the queue are
+    held in an unbounded overflow buffer and moved into the queue, in order, as the
+    worker frees space.
+    """
+
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.spill = collections.deque()
+        self.worker = None
+
+    def refill(self):
+        while self.spill and not self.queue.full():
+            self.queue.put_nowait(self.spill.popleft())
+
+    @property
+    def depth(self):
+        return self.queue.qsize() + len(self.spill)
+
+
+class HandlerChannel:
+    """Dispatch state for one eventId: its handler, partitions and counters.
+
+    With a single worker every event for the eventId is handled in the order it was
+    received.  Handlers that set workers > 1 can implement dispatch_key(event);
+    events that share a key are routed to the same worker and stay in order.
+    Events without a key are spread round-robin across the workers.
+    """
+
+    def __init__(self, eventId, handler, queue_size, workers, overflow_policy):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {overflow_policy}"
+            )
+        self.eventId = eventId
+        self.handler = handler
+        self.overflow_policy = overflow_policy
+        self.partitions = [DispatchPartition(queue_size) for _ in range(workers)]
+        self.round_robin = itertools.cycle(self.partitions)
+
+        self.dispatched = 0
+        self.dropped = 0
+        self.spilled = 0
+
+    def partition_for(self, event):
+        if len(self.partitions) == 1:
+            return self.partitions[0]
+        dispatch_key = getattr(self.handler, "dispatch_key", None)
+        key = dispatch_key(event) if dispatch_key else None
+        if key is None:
+            return next(self.round_robin)
+        return self.partitions[hash(key) % len(self.partitions)]
+
+    @property
+    def depth(self):
+        return sum(partition.depth for partition in self.partitions)
+
+
+class Five9EventDispatcher:
+    """Decouples the websocket reader from the socket event handlers.
+
+    The reader hands each decoded event to dispatch(), which only enqueues it;
+    handler coroutines run in worker tasks, so a slow handler no longer stops the
+    socket from being read.  Each eventId gets its own bounded queue(s) and workers,
+    created the first time the eventId is seen.
+
+    on_result is called with (handler, event, result) for every handled event, so
+    the socket can act on return values such as "reconnect".  With metrics, a
+    Five9SocketMetrics, every handler run is recorded with its execution time and
+    the time the event spent queued.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.queue_size = kwargs.get("queue_size", SOCKET_DISPATCH["queue_size"])
+        self.workers = kwargs.get("workers", SOCKET_DISPATCH["workers"])
+        self.overflow_policy = kwargs.get(
+            "overflow_policy", SOCKET_DISPATCH["overflow_policy"]
+        )
+        self.on_result = kwargs.get("on_result", None)
+        self.metrics = kwargs.get("metrics", None)
+
+        self.channels = {}
+
+    def channel_for(self, eventId, handler):
+        channel = self.channels.get(eventId, None)
+        if channel is None or channel.handler is not handler:
+            if channel is not None:
+                self.stop_channel(channel)
+            channel = HandlerChannel(
+                eventId,
+                handler,
+                queue_size=getattr(handler, "queue_size", None) or self.queue_size,
+                workers=getattr(handler, "workers", None) or self.workers,
+                overflow_policy=getattr(handler, "overflow_policy", None)
+                or self.overflow_policy,
+            )
+            for partition in channel.partitions:
+                partition.worker = asyncio.create_task(
+                    self.run_worker(channel, partition)
+                )
+            self.channels[eventId] = channel
+        return channel
+
+    async def dispatch(self, eventId, handler, event, event_id=None):
+        """Queues an event for its handler, applying the overflow policy when full.
+        eventId selects the handler's channel, event_id is the event's own eventId
+        when it differs, as for the events of the fallback handler."""
+        channel = self.channel_for(eventId, handler)
+        partition = channel.partition_for(event)
+        channel.dispatched += 1
+        # queued with its own eventId and the time it was queued at, for the metrics
+        item = (event, event_id or eventId, time.monotonic())
+
+        if channel.overflow_policy == "block":
+            await partition.queue.put(item)
+
+        elif channel.overflow_policy == "drop_oldest":
+            if partition.queue.full():
+                partition.queue.get_nowait()
+                partition.queue.task_done()
+                channel.dropped += 1
+                logging.warning(
+                    f"Dispatch queue full for event {eventId}, dropped oldest event"
+                )
+            partition.queue.put_nowait(item)
+
+        else:
+            if partition.spill or partition.queue.full():
+                partition.spill.append(item)
+                channel.spilled += 1
+            else:
+                partition.queue.put_nowait(item)
+
+    async def run_worker(self, channel, partition):
+        while True:
+            event, event_id, queued_at = await partition.queue.get()
+            partition.refill()
+            started = time.monotonic()
+            failed = False
+            try:
+                try:
+                    result = await channel.handler.handle(event)
+                except Five9SubscriberError as err:
+                    # the subscribers that did not fail may still ask to reconnect
+                    failed = True
+                    logging.exception(f"Handler for event {channel.eventId} failed.")
+                    result = err.result
+                if self.on_result and (not failed or result is not None):
+                    await self.on_result(channel.handler, event, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                failed = True
+                logging.exception(f"Handler for event {channel.eventId} failed.")
+            finally:
+                if self.metrics is not None:
+                    finished = time.monotonic()
+                    self.metrics.record_handled(
+                        event_id, event, finished - started, finished - queued_at, failed
+                    )
+                partition.queue.task_done()
+
+    async def join(self):
+        """Waits until every queued event has been handled"""
+        for channel in list(self.channels.values()):
+            for partition in channel.partitions:
+                # spilled events are moved into the queue before the event that
+                # freed the space is marked done, so join() also covers the spill
+                await partition.queue.join()
+
+    def stop_channel(self, channel):
+        for partition in channel.partitions:
+            if partition.worker is not None:
+                partition.worker.cancel()
+
+    async def close(self, drain=False):
+        """Stops every worker, optionally after the queued events are handled"""
+        if drain:
+            await self.join()
+        workers = []
+        for channel in self.channels.values():
+            self.stop_channel(channel)
+            workers.extend(p.worker for p in channel.partitions if p.worker)
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.channels = {}
+
+    def stats(self):
+        return {
+            eventId: {
+                "depth": channel.depth,
+                "dispatched": channel.dispatched,
+                "dropped": channel.dropped,
+                "spilled": channel.spilled,
+                "workers": len(channel.partitions),
+            }
+            for eventId, channel in list(self.channels.items())
+        }
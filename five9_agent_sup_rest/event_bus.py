@@ -0,0 +1,261 @@
+import asyncio
+import itertools
+import logging
+
+from five9_agent_sup_rest.exceptions import Five9SubscriberError
+from five9_agent_sup_rest.handler_registry import FALLBACK_EVENT_ID
+
+
+def event_data_sources(event):
+    """The dataSource of each object in an event's payLoad, as statistics events
+    such as 5000 and 5012 carry"""
+    payload = event.get("payLoad", None)
+    if isinstance(payload, dict):
+        payload = (payload,)
+    elif not isinstance(payload, list):
+        return frozenset()
+    return frozenset(
+        item.get("dataSource", None) for item in payload if isinstance(item, dict)
+    )
+
+
+class CallbackHandler:
+    """Adapts a coroutine function to the handler interface"""
+
+    lazy_decode = False
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    async def handle(self, event):
+        return await self.callback(event)
+
+    def __repr__(self):
+        return getattr(self.callback, "__qualname__", type(self.callback).__name__)
+
+
+class Subscription:
+    """One subscriber of a Five9EventBus, with its filters and counters.
+
+    An event is delivered when its payLoad carries one of data_sources, if given,
+    and predicate(event) is true, if given.
+    """
+
+    ids = itertools.count(1)
+
+    def __init__(self, eventId, handler, *args, **kwargs):
+        self.eventId = eventId
+        self.handler = handler
+        self.priority = kwargs.get("priority", 0)
+        self.predicate = kwargs.get("predicate", None)
+        data_sources = kwargs.get("data_sources", None)
+        self.data_sources = frozenset(data_sources) if data_sources else None
+        self.isolated = kwargs.get("isolated", False)
+        default_name = (
+            repr(handler)
+            if isinstance(handler, CallbackHandler)
+            else type(handler).__name__
+        )
+        self.name = kwargs.get("name", None) or f"{default_name}-{next(self.ids)}"
+        # the group an isolated subscriber is dispatched through on its own
+        self.group = None
+
+        self.delivered = 0
+        self.filtered = 0
+        self.failed = 0
+
+    def stats(self):
+        return {
+            "eventId": self.eventId,
+            "priority": self.priority,
+            "isolated": self.isolated,
+            "delivered": self.delivered,
+            "filtered": self.filtered,
+            "failed": self.failed,
+        }
+
+    def __repr__(self):
+        return f"Subscription({self.name!r}, eventId={self.eventId!r}, priority={self.priority})"
+
+
+class SubscriberGroup:
+    """Subscribers that share one dispatch queue and worker.
+
+    handle() runs the subscribers in priority order with the same event object, so
+    an event is decoded once whatever the number of subscribers and is never
+    copied; subscribers must not modify it.  A subscriber that raises does not stop
+    the others: once all have run, the failures are raised together as a
+    Five9SubscriberError, which carries the result of the others.
+
+    The group is the handler the dispatcher sees.  Its dispatch settings, such as
+    queue_size, workers and dispatch_key, are those of its first subscriber.
+    """
+
+    def __init__(self, eventId, key):
+        self.eventId = eventId
+        # the dispatcher queue the group is dispatched through
+        self.key = key
+        self.subscriptions = ()
+
+    def set_subscriptions(self, subscriptions):
+        # replaced rather than changed in place, so a running handle() keeps the
+        # subscribers it started with
+        self.subscriptions = tuple(
+            sorted(subscriptions, key=lambda subscription: -subscription.priority)
+        )
+
+    @property
+    def first(self):
+        return self.subscriptions[0].handler if self.subscriptions else None
+
+    @property
+    def priority(self):
+        return self.subscriptions[0].priority if self.subscriptions else 0
+
+    @property
+    def lazy_decode(self):
+        return all(
+            getattr(subscription.handler, "lazy_decode", False)
+            for subscription in self.subscriptions
+        )
+
+    @property
+    def queue_size(self):
+        return getattr(self.first, "queue_size", None)
+
+    @property
+    def workers(self):
+        return getattr(self.first, "workers", None)
+
+    @property
+    def overflow_policy(self):
+        return getattr(self.first, "overflow_policy", None)
+
+    @property
+    def dispatch_key(self):
+        return getattr(self.first, "dispatch_key", None)
+
+    async def handle(self, event):
+        data_sources = None
+        result = None
+        failures = []
+        for subscription in self.subscriptions:
+            try:
+                if subscription.data_sources is not None:
+                    if data_sources is None:
+                        data_sources = event_data_sources(event)
+                    if subscription.data_sources.isdisjoint(data_sources):
+                        subscription.filtered += 1
+                        continue
+                if subscription.predicate is not None and not subscription.predicate(
+                    event
+                ):
+                    subscription.filtered += 1
+                    continue
+                subscription_result = await subscription.handler.handle(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                subscription.failed += 1
+                failures.append((subscription, e))
+                continue
+            subscription.delivered += 1
+            if subscription_result is not None:
+                result = subscription_result
+
+        if failures:
+            raise Five9SubscriberError(self.eventId, failures, result) from failures[0][1]
+        return result
+
+
+class EventRoute:
+    """The groups an eventId's events are dispatched to, highest priority first"""
+
+    __slots__ = ("targets", "lazy_decode")
+
+    def __init__(self, groups):
+        groups = sorted(groups, key=lambda group: -group.priority)
+        self.targets = tuple((group.key, group) for group in groups)
+        self.lazy_decode = all(group.lazy_decode for group in groups)
+
+
+class Five9EventBus:
+    """Routes each socket event to every subscriber of its eventId.
+
+    Subscribers of an eventId share one SubscriberGroup, and so one queue and
+    worker in the socket's dispatcher: the reader queues each event once however
+    many subscribers there are, and the subscribers run one after another in
+    priority order.  An isolated subscriber gets a group, queue and worker of its
+    own, so a slow subscriber does not hold up the others; its events are queued
+    after those of higher priority groups.
+
+    Events of eventIds without subscribers go to the FALLBACK_EVENT_ID
+    subscribers.  Routes are rebuilt when subscribers change, not per event.
+    """
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.groups = {}
+        self.routes = {}
+        self.fallback = EventRoute(())
+
+    def subscribe(self, eventId, handler, **options):
+        """Subscribes a handler, anything with an async handle(event), or a
+        coroutine function to the events of eventId.  See Subscription for the
+        options.  Returns the Subscription, for unsubscribe()."""
+        if not hasattr(handler, "handle"):
+            handler = CallbackHandler(handler)
+        subscription = Subscription(eventId, handler, **options)
+        self.subscriptions.setdefault(eventId, []).append(subscription)
+        self.rebuild(eventId)
+        logging.debug(f"Subscribed: {subscription}")
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscriptions = self.subscriptions.get(subscription.eventId, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+            self.rebuild(subscription.eventId)
+            logging.debug(f"Unsubscribed: {subscription}")
+
+    def subscribers(self, eventId):
+        return list(self.subscriptions.get(eventId, ()))
+
+    def rebuild(self, eventId):
+        subscriptions = self.subscriptions.get(eventId, [])
+        shared = [s for s in subscriptions if not s.isolated]
+        groups = []
+        if shared:
+            # the shared group keeps its identity, so the dispatcher keeps its queue
+            group = self.groups.get(eventId, None)
+            if group is None:
+                group = self.groups[eventId] = SubscriberGroup(eventId, eventId)
+            group.set_subscriptions(shared)
+            groups.append(group)
+        else:
+            self.groups.pop(eventId, None)
+        for subscription in subscriptions:
+            if subscription.isolated:
+                if subscription.group is None:
+                    subscription.group = SubscriberGroup(
+                        eventId, f"{eventId}:{subscription.name}"
+                    )
+                    subscription.group.set_subscriptions([subscription])
+                groups.append(subscription.group)
+
+        if eventId == FALLBACK_EVENT_ID:
+            self.fallback = EventRoute(groups)
+        elif groups:
+            self.routes[eventId] = EventRoute(groups)
+        else:
+            self.routes.pop(eventId, None)
+
+    def route(self, eventId):
+        return self.routes.get(eventId, None) or self.fallback
+
+    def stats(self):
+        return {
+            subscription.name: subscription.stats()
+            for subscriptions in list(self.subscriptions.values())
+            for subscription in list(subscriptions)
+        }
@@ -1,2 +1,36 @@
 class Five9DuplicateLoginError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class Five9RequestError(Exception):
+    """A REST call failed without a response, after any retries"""
+
+    def __init__(self, method_name, attempts, error):
+        super().__init__(f"{method_name} failed after {attempts} attempt(s): {error!r}")
+        self.method_name = method_name
+        self.attempts = attempts
+        self.error = error
+
+
+class Five9ResponseError(Exception):
+    """A REST call was answered with an error status"""
+
+    def __init__(self, method_name, status_code, text):
+        super().__init__(f"{method_name} - Error: {status_code} - {text}")
+        self.method_name = method_name
+        self.status_code = status_code
+        self.text = text
+
+
+class Five9SubscriberError(Exception):
+    """Subscribers of a socket event failed, the other subscribers still ran.
+    result is what they returned, such as "reconnect", or None"""
+
+    def __init__(self, eventId, failures, result=None):
+        names = ", ".join(
+            f"{subscription.name}: {error!r}" for subscription, error in failures
+        )
+        super().__init__(f"{len(failures)} subscriber(s) of event {eventId} failed - {names}")
+        self.eventId = eventId
+        self.failures = failures
+        self.result = result
@@ -0,0 +1,84 @@
+import inspect
+import logging
+
+from five9_agent_sup_rest.methods import default_socket_handlers
+from five9_agent_sup_rest.methods.default_socket_handlers import SocketEventHandler
+
+
+# dispatch key shared by every event that has no handler of its own
+FALLBACK_EVENT_ID = "*"
+
+# default handler classes by eventId, scanned once per process
+DEFAULT_HANDLER_CLASSES = {}
+
+
+def is_handler_class(handler):
+    return (
+        inspect.isclass(handler)
+        and issubclass(handler, SocketEventHandler)
+        and getattr(handler, "eventId", None) is not None
+    )
+
+
+def default_handler_classes():
+    if not DEFAULT_HANDLER_CLASSES:
+        for name, handler in inspect.getmembers(default_socket_handlers):
+            if is_handler_class(handler):
+                DEFAULT_HANDLER_CLASSES[handler.eventId] = [handler]
+    return DEFAULT_HANDLER_CLASSES
+
+
+class SocketHandlerRegistry:
+    """The socket handlers of one client, built once and kept for its lifetime.
+
+    Handler classes are resolved once, the defaults followed by the client's custom
+    handlers.  Custom handlers replace the default for their eventId, and several
+    custom handlers for one eventId all receive its events.  table_for() creates
+    each socket's handler instances the first time the socket runs and returns the
+    same instances on every reconnect, so handlers that do work in __init__ only do
+    it once.  Events without a handler all go to one shared fallback handler.
+    """
+
+    def __init__(self, client, custom_handlers=()):
+        self.client = client
+        self.handler_classes = {
+            eventId: list(classes)
+            for eventId, classes in default_handler_classes().items()
+        }
+        self.custom_event_ids = set()
+        for handler in custom_handlers:
+            self.register(handler)
+
+        self.fallback = SocketEventHandler(client=client, eventId=FALLBACK_EVENT_ID)
+        # the fallback handler only reads events at DEBUG level
+        self.fallback.lazy_decode = True
+
+        self.tables = {}
+
+    def register(self, handler):
+        if is_handler_class(handler):
+            if handler.eventId not in self.custom_event_ids:
+                # the first custom handler of an eventId replaces the default
+                self.custom_event_ids.add(handler.eventId)
+                self.handler_classes[handler.eventId] = []
+            if handler not in self.handler_classes[handler.eventId]:
+                self.handler_classes[handler.eventId].append(handler)
+            logging.debug(f"Handler Registered: {handler.eventId}")
+        else:
+            logging.debug(f"Skipping {handler}")
+
+    def table_for(self, socket):
+        """Returns the handler instances of socket.context, in lists by eventId"""
+        table = self.tables.get(socket.context, None)
+        if table is None:
+            table = {
+                eventId: [handler(client=self.client, socket=socket) for handler in classes]
+                for eventId, classes in self.handler_classes.items()
+            }
+            self.tables[socket.context] = table
+            logging.debug(f"Handler Table Built: {socket.context} - {sorted(table)}")
+        else:
+            for handlers in table.values():
+                for handler in handlers:
+                    handler.socket = socket
+        return table
@@ -0,0 +1,47 @@
+import logging
+import time
+
+from five9_agent_sup_rest.config import LOGIN_STATE_CACHE_TTL
+
+
+class LoginStateCache:
+    """Client-side cache of the supervisor and agent login states.
+
+    States read over REST are reused for ttl seconds.  While a socket is open for a
+    user type the cache is event driven: login state events update it and entries
+    do not expire.  REST methods that change the login state invalidate the cache.
+    """
+
+    def __init__(self, ttl=LOGIN_STATE_CACHE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = {}
+        self.event_driven = set()
+
+    def get(self, user_type):
+        """Returns the cached state, or None when it is unknown or stale"""
+        entry = self.entries.get(user_type, None)
+        if entry is None:
+            return None
+
+        state, updated = entry
+        if user_type not in self.event_driven and self.clock() - updated > self.ttl:
+            return None
+        return state
+
+    def set(self, user_type, state):
+        logging.debug(f"LoginStateCache - {user_type}: {state}")
+        self.entries[user_type] = (state, self.clock())
+
+    def invalidate(self, user_type=None):
+        if user_type is None:
+            self.entries = {}
+        else:
+            self.entries.pop(user_type, None)
+
+    def attach(self, user_type):
+        """Marks the state as maintained by socket events"""
+        self.event_driven.add(user_type)
+
+    def detach(self, user_type):
+        self.event_driven.discard(user_type)
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+
+from five9_agent_sup_rest.async_transport import Five9AsyncHttpTransport
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.transport import Five9HttpTransport
+
+
+class ManagedSession:
+    """A Five9RestClient owned by a Five9SessionManager and the tasks running its
+    sockets."""
+
+    def __init__(self, name, client, contexts):
+        self.name = name
+        self.client = client
+        self.contexts = contexts
+        self.tasks = {}
+        self.started_at = time.time()
+
+    @property
+    def user_type(self):
+        """The namespace the session logs out through, "supervisor" unless the
+        session only runs agent contexts"""
+        return "supervisor" if "supervisor" in self.contexts else "agent"
+
+    def socket(self, context):
+        return getattr(self.client, f"{context}_socket", None)
+
+    def health(self):
+        sockets = {}
+        for context in self.contexts:
+            socket = self.socket(context)
+            task = self.tasks.get(context, None)
+            error = None
+            if task is not None and task.done() and not task.cancelled():
+                error = task.exception()
+            sockets[context] = {
+                "connected": bool(socket and socket.connected),
+                "running": bool(task and not task.done()),
+                "messages_received": socket.messages_received if socket else 0,
+                "last_message_at": socket.last_message_at if socket else None,
+                "reconnect": socket.reconnect_metrics.snapshot() if socket else None,
+                "queue_depth": socket.metrics.queue_depths() if socket else None,
+                "ping_rtt": socket.metrics.last_ping_rtt if socket else None,
+                "error": repr(error) if error else None,
+            }
+        return {
+            "started_at": self.started_at,
+            "healthy": all(
+                status["connected"] and status["running"] for status in sockets.values()
+            ),
+            "sockets": sockets,
+        }
+
+
+class Five9SessionManager:
+    """Runs many Five9 sessions and their websockets on a single event loop.
+
+    Every client added to the manager shares the manager's sync and async HTTP
+    transports, and the same custom socket handler classes, so a process monitoring
+    many supervisor accounts or domains needs one loop and one connection pool
+    rather than a thread, loop and pool per session.  Sessions can be added and
+    removed while the loop is running.
+
+    Logging in and starting a session use the blocking REST methods and run in a
+    worker thread, so adding a session does not stall sockets already running.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # transports passed in by the caller are left open by close()
+        self.owns_transport = kwargs.get("transport", None) is None
+        self.transport = kwargs.get("transport", None) or Five9HttpTransport(
+            **kwargs.get("transport_options", {})
+        )
+        self.owns_async_transport = kwargs.get("async_transport", None) is None
+        self.async_transport = kwargs.get(
+            "async_transport", None
+        ) or Five9AsyncHttpTransport(**kwargs.get("async_transport_options", {}))
+
+        # defaults applied to every client, add_session kwargs take precedence
+        self.client_options = kwargs.get("client_options", {})
+        self.custom_socket_handlers = kwargs.get("custom_socket_handlers", [])
+
+        self.sessions = {}
+
+    def create_client(self, **kwargs):
+        options = {
+            "custom_socket_handlers": self.custom_socket_handlers,
+            **self.client_options,
+            **kwargs,
+        }
+        return Five9RestClient(
+            transport=self.transport, async_transport=self.async_transport, **options
+        )
+
+    def start_session(self, client, contexts):
+        for context in contexts:
+            if context == "supervisor":
+                client.initialize_supervisor_session()
+            elif context == "agent":
+                client.initialize_agent_session()
+
+    async def add_session(self, name, contexts=("supervisor",), **kwargs):
+        """Logs in a new client, starts its sessions and connects its sockets
+
+        kwargs are passed to Five9RestClient (username, password, region, ...).
+        contexts lists the sockets to open, "supervisor" and/or "agent".
+        """
+        if name in self.sessions:
+            raise ValueError(f"Session {name} already exists")
+
+        client = await asyncio.to_thread(self.create_client, **kwargs)
+        await asyncio.to_thread(self.start_session, client, contexts)
+
+        session = ManagedSession(name, client, tuple(contexts))
+        for context in session.contexts:
+            socket = session.socket(context)
+            if socket is None:
+                logging.error(f"Session {name} - {context} session did not start")
+                continue
+            session.tasks[context] = asyncio.create_task(
+                socket.run(), name=f"{name}:{context}"
+            )
+
+        self.sessions[name] = session
+        logging.info(f"Session Added: {name}")
+        return session
+
+    async def remove_session(self, name, logout=True):
+        session = self.sessions.pop(name)
+
+        for context, task in session.tasks.items():
+            await session.socket(context).stop()
+            try:
+                await asyncio.wait_for(task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                task.cancel()
+            except Exception:
+                logging.exception(f"Session {name} - {context} socket failed.")
+
+        if logout:
+            try:
+                await getattr(session.client, session.user_type).LogOut.ainvoke()
+            except Exception:
+                logging.exception(f"Session {name} - logout failed.")
+
+        logging.info(f"Session Removed: {name}")
+        return session
+
+    def health(self):
+        return {name: session.health() for name, session in self.sessions.items()}
+
+    async def wait_connected(self, timeout=30):
+        """Waits until every socket of every session is connected"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if all(status["healthy"] for status in self.health().values()):
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    async def close(self, logout=True):
+        for name in list(self.sessions):
+            await self.remove_session(name, logout=logout)
+        if self.owns_transport:
+            self.transport.close()
+        if self.owns_async_transport:
+            await self.async_transport.close()
@@ -1,6 +1,6 @@
 import logging
 
-from .base import AgentRestMethod
+from .base import AgentRestMethod, Five9Request
 from five9_agent_sup_rest.config import CONTEXT_PATHS
 from five9_agent_sup_rest.exceptions import Five9DuplicateLoginError
 
@@ -15,11 +15,11 @@ class MaintenanceNoticesGet(AgentRestMethod):
 
     """
 
-    def invoke(self):
-        self.method = "GET"
-        self.path = f"/agents/{self.config.userId}/maintenance_notices"
-        super().invoke()
-        return self.response.json()
+    def build_request(self):
+        return Five9Request("GET", f"/agents/{self.config.userId}/maintenance_notices")
+
+    def process_response(self, response):
+        return response.json()
 
 
 class MaintenanceNoticeAccept(AgentRestMethod):
@@ -27,21 +27,27 @@ class MaintenanceNoticeAccept(AgentRestMethod):
     PUT /agents/{agentId}/maintenance_notices/{noticeId}/accept
 
     """
-    def invoke(self, noticeId):
-        self.method = "PUT"
-        self.path = f"/agents/{self.config.userId}/maintenance_notices/{noticeId}/accept"
-        super().invoke()
-        return self.response.json()
-    
+
+    invalidates_login_state = True
+
+    def build_request(self, noticeId):
+        return Five9Request(
+            "PUT",
+            f"/agents/{self.config.userId}/maintenance_notices/{noticeId}/accept",
+        )
+
+    def process_response(self, response):
+        return response.json()
+
 
 class AgentLoginState(AgentRestMethod):
     method_name = "Agent:AgentLoginState"
 
-    def invoke(self):
-        self.method = "GET"
-        self.path = f"/agents/{self.config.userId}/login_state"
-        super().invoke()
-        return self.response.text.strip('"')
+    def build_request(self):
+        return Five9Request("GET", f"/agents/{self.config.userId}/login_state")
+
+    def process_response(self, response):
+        return response.text.strip('"')
 
 
 class AgentSessionStart(AgentRestMethod):
@@ -55,36 +61,42 @@ class AgentSessionStart(AgentRestMethod):
     CAN_RUN_WEB_AGENT permission
     """
 
-    def invoke(self, stationId="", stationType="EMPTY", stationState="DISCONNECTED"):
-        self.method = "PUT"
-        self.path = f"/agents/{self.config.userId}/session_start"
+    invalidates_login_state = True
+
+    def build_request(self, stationId="", stationType="EMPTY", stationState="DISCONNECTED"):
         payload = {
             "state": stationState,
             "stationId": stationId,
             "stationType": stationType,
         }
-        super().invoke(payload=payload)
-        if self.response.status_code < 400:
-            return self.response
-        
+        return Five9Request(
+            "PUT", f"/agents/{self.config.userId}/session_start", payload=payload
+        )
+
+    def process_response(self, response):
+        if response.status_code < 400:
+            return response
+
         else:
-            exception_details = self.response.json()
-            if exception_details.get("five9ExceptionDetail", {}).get("context", {}).get("contextCode", "") == "DUPLICATE_LOGIN": 
-                raise Five9DuplicateLoginError(f"Already Logged In: {self.response.status_code} - {self.response.json()}")
-            raise Exception(f"Error: {self.response.status_code} - {self.response.text}")
-                
+            exception_details = response.json()
+            if exception_details.get("five9ExceptionDetail", {}).get("context", {}).get("contextCode", "") == "DUPLICATE_LOGIN":
+                raise Five9DuplicateLoginError(f"Already Logged In: {response.status_code} - {response.json()}")
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+
 class LogOut(AgentRestMethod):
     """Logs out the agent.
     PUT /auth/logout
 
     """
 
-    def invoke(self):
-        self.method = "POST"
-        self.path = f"/auth/logout"
-        super().invoke()
-        if self.response.status_code < 400:
+    invalidates_login_state = True
+
+    def build_request(self):
+        return Five9Request("POST", f"/auth/logout")
+
+    def process_response(self, response):
+        if response.status_code < 400:
             return
-        
+
         else:
-            raise Exception(f"Error: {self.response.status_code} - {self.response.text}")        
+            raise Exception(f"Error: {response.status_code} - {response.text}")
@@ -1,60 +1,366 @@
+import asyncio
+import functools
 import logging
+import threading
+import time
 from typing import Dict, Any
 
 import requests
 
+try:
+    import aiohttp
+
+    ASYNC_REQUEST_ERRORS = aiohttp.ClientError
+except ImportError:
+    ASYNC_REQUEST_ERRORS = OSError
+
 from five9_agent_sup_rest.config import CONTEXT_PATHS
+from five9_agent_sup_rest.exceptions import Five9RequestError
+
+
+class Five9Request:
+    """The http method, path, and optional payload / query string of one REST call"""
+
+    def __init__(self, method, path, payload=None, qstring_params=None, headers=None):
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.qstring_params = qstring_params
+        # sent in addition to the session's api headers
+        self.headers = headers
+
+
+def serialized_invoke(invoke):
+    """Wraps an invoke() override so calls on the same instance run one at a time"""
+
+    @functools.wraps(invoke)
+    def wrapper(self, *args, **kwargs):
+        with self.invoke_lock:
+            return invoke(self, *args, **kwargs)
+
+    return wrapper
 
 
 class FiveNineRestMethod:
-    # """Base class for all Five9 REST methods.
+    """Base class for all Five9 REST methods.
+
+    Subclasses describe a call by implementing build_request(), which returns a
+    Five9Request, and optionally process_response(), which turns the response into
+    the value returned to the caller.  The same two methods back both invoke() and
+    the asyncio ainvoke().
+
+    Methods written against the original pattern, overriding invoke() to set
+    self.method and self.path before calling super().invoke(), keep working.
+    Their ainvoke() runs invoke() in a worker thread.
+
+    Every call builds its own Five9Request and response, so one instance can be
+    invoked from many threads at once.  Original-style methods keep per-call
+    state on the instance and their invoke() calls are serialized per instance,
+    which also makes it safe to set self.response for them to read after
+    super().invoke().
+    """
+
+    # set on methods that change the supervisor or agent login state
+    invalidates_login_state = False
+
+    # seconds GET responses of this method are cached, None to never cache.
+    # config.REFERENCE_DATA_TTL takes precedence, see ReferenceDataCache
+    cache_ttl = None
+    # field index() and lookup() key the records of the response by
+    cache_index_field = "id"
+
+    # True or False overrides whether the retry policy treats the method as safe to
+    # send twice, None decides by its http method
+    idempotent = None
+    # default timeout for the method's calls, seconds or (connect, read), None uses
+    # the transport's
+    timeout = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "invoke" in cls.__dict__:
+            cls.invoke = serialized_invoke(cls.__dict__["invoke"])
 
     def __init__(self, config, *args, **kwargs):
+        # held by the invoke() overrides of original-style methods
+        self.invoke_lock = threading.RLock()
+        # calls made through this instance, retries are not counted.  Requests
+        # across clients sharing a registry are in config.metrics.requests_for()
         self.call_count = 0
         self.update_config(config)
 
+    def count_call(self):
+        with self.invoke_lock:
+            self.call_count += 1
+
     def update_config(self, config):
         self.config = config
         config.subscribe_observer(self)
 
-    def invoke(self, *args, **kwargs):
-        url = f"{self.config.base_api_url}{self.context_path}{self.path}"
-        qstring_params = kwargs.get("qstring_params", None)
-        payload = kwargs.get("payload", None)
+    def build_request(self, *args, **kwargs):
+        return Five9Request(
+            self.method,
+            self.path,
+            payload=kwargs.get("payload", None),
+            qstring_params=kwargs.get("qstring_params", None),
+        )
+
+    def process_response(self, response):
+        return response
+
+    def url_for(self, request: Five9Request):
+        return f"{self.config.base_api_url}{self.context_path}{request.path}"
 
+    def headers_for(self, request: Five9Request):
+        if request.headers:
+            return {**self.config.api_header, **request.headers}
+        return self.config.api_header
+
+    def prepare_request(self, request: Five9Request):
         req = requests.Request(
-            method=self.method,
-            url=url,
-            headers=self.config.api_header,
+            method=request.method,
+            url=self.url_for(request),
+            headers=self.headers_for(request),
         )
 
-        if self.method != "GET" and payload:
-            req.json = payload
-        if qstring_params:
-            req.params = qstring_params
+        if request.method != "GET" and request.payload:
+            req.json = request.payload
+        if request.qstring_params:
+            req.params = request.qstring_params
 
-        prepared_request = req.prepare()
+        return req.prepare()
 
-        logging.debug(
-            f"FiveNineRestMethod Prepared Request:\n{prepared_request.__dict__}"
-        )
+    def log_response(self, response):
+        logging.info(f"{self.method_name} - RESPONSE: {response.status_code}")
+        logging.debug(f"{self.method_name} -    TEXT: {response.text}")
+
+    def send(self, request: Five9Request, timeout=None):
+        """Sends the request, retrying as the session's retry policy allows.
+
+        Returns the final response, whatever its status, or raises Five9RequestError
+        when no response was received.
+        """
+        policy = self.config.retry_policy
+        retryable = policy.is_retryable(self, request)
+        timeout = timeout if timeout is not None else self.timeout
+        started = time.monotonic()
+        relogged_in = False
+        attempt = 0
+
+        while True:
+            attempt += 1
+            token = self.config.tokenId
+            # prepared on every attempt so a retry after a re-login uses the new token
+            prepared_request = self.prepare_request(request)
+            logging.debug(
+                f"FiveNineRestMethod Prepared Request:\n{prepared_request.__dict__}"
+            )
+
+            response = error = None
+            self.config.rate_limiter.acquire(self)
+            sent = time.perf_counter()
+            try:
+                response = self.config.transport.send(prepared_request, timeout=timeout)
+            except requests.exceptions.RequestException as err:
+                error = err
+                logging.error(f"{self.method_name} - Request Error: {err!r}")
+            else:
+                self.config.rate_limiter.record_response(self, response)
+                self.log_response(response)
+            self.config.metrics.record(
+                self.method_name,
+                response.status_code if response is not None else None,
+                time.perf_counter() - sent,
+                len(prepared_request.body or b""),
+                len(response.content) if response is not None else 0,
+                error,
+            )
+
+            if (
+                response is not None
+                and response.status_code == 401
+                and policy.relogin_on_401
+                and not relogged_in
+            ):
+                relogged_in = True
+                if self.config.refresh_session(token):
+                    continue
+
+            delay = policy.delay(attempt)
+            if not policy.should_retry(attempt, retryable, response, started, delay):
+                break
+            logging.info(f"{self.method_name} - Retrying in {delay:.2f}s, attempt {attempt + 1}")
+            time.sleep(delay)
+
+        if error is not None:
+            raise Five9RequestError(self.method_name, attempt, error) from error
+        return response
+
+    async def asend(self, request: Five9Request, timeout=None, transport=None):
+        """Asyncio counterpart of send(), transport replaces the session's async
+        transport for this call"""
+        policy = self.config.retry_policy
+        retryable = policy.is_retryable(self, request)
+        timeout = timeout if timeout is not None else self.timeout
+        transport = transport or self.config.async_transport
+        started = time.monotonic()
+        relogged_in = False
+        attempt = 0
+
+        while True:
+            attempt += 1
+            token = self.config.tokenId
+
+            response = error = None
+            await self.config.rate_limiter.aacquire(self)
+            sent = time.perf_counter()
+            try:
+                response = await transport.send(
+                    request.method,
+                    self.url_for(request),
+                    headers=self.headers_for(request),
+                    payload=request.payload if request.method != "GET" else None,
+                    qstring_params=request.qstring_params,
+                    timeout=timeout,
+                )
+            except (OSError, asyncio.TimeoutError, ASYNC_REQUEST_ERRORS) as err:
+                error = err
+                logging.error(f"{self.method_name} - Async Request Error: {err!r}")
+            else:
+                self.config.rate_limiter.record_response(self, response)
+                self.log_response(response)
+            self.config.metrics.record(
+                self.method_name,
+                response.status_code if response is not None else None,
+                time.perf_counter() - sent,
+                response.request_size if response is not None else 0,
+                len(response.content) if response is not None else 0,
+                error,
+            )
+
+            if (
+                response is not None
+                and response.status_code == 401
+                and policy.relogin_on_401
+                and not relogged_in
+            ):
+                relogged_in = True
+                # the login is blocking, and single flight across threads and tasks
+                if await asyncio.to_thread(self.config.refresh_session, token):
+                    continue
+
+            delay = policy.delay(attempt)
+            if not policy.should_retry(attempt, retryable, response, started, delay):
+                break
+            logging.info(f"{self.method_name} - Retrying in {delay:.2f}s, attempt {attempt + 1}")
+            await asyncio.sleep(delay)
+
+        if error is not None:
+            raise Five9RequestError(self.method_name, attempt, error) from error
+        return response
+
+    def check_cache(self, request: Five9Request):
+        """Returns (key, entry, fresh) from the reference data cache, and adds the
+        conditional headers to revalidate a stale entry"""
+        key, entry, fresh = self.config.reference_data_cache.lookup(self, request)
+        if entry is not None and not fresh:
+            request.headers = {
+                **(request.headers or {}),
+                **self.config.reference_data_cache.conditional_headers(entry),
+            }
+        return key, entry, fresh
+
+    def complete(self, response, key, entry):
+        if self.invalidates_login_state:
+            self.config.login_state_cache.invalidate()
+
+        if key is None:
+            return self.process_response(response)
+
+        cache = self.config.reference_data_cache
+        if entry is not None and response.status_code == 304:
+            cache.revalidate(entry)
+            return entry.value
+
+        value = self.process_response(response)
+        if response.status_code < 400:
+            cache.store(key, value, response)
+        return value
+
+    def _invoke(self, *args, **kwargs):
+        """Makes the call, returns the cache key of the request sent and the value"""
+        timeout = kwargs.pop("timeout", None)
+        request = self.build_request(*args, **kwargs)
+        key, entry, fresh = self.check_cache(request)
+        if fresh:
+            return key, entry.value
+        response = self.send(request, timeout=timeout)
+        if type(self).invoke is not FiveNineRestMethod.invoke:
+            # original-style overrides read self.response after super().invoke(),
+            # under their per-instance invoke_lock
+            self.response = response
+        return key, self.complete(response, key, entry)
+
+    async def _ainvoke(self, *args, **kwargs):
+        timeout = kwargs.pop("timeout", None)
+        transport = kwargs.pop("transport", None)
+        request = self.build_request(*args, **kwargs)
+        key, entry, fresh = self.check_cache(request)
+        if fresh:
+            return key, entry.value
+        response = await self.asend(request, timeout=timeout, transport=transport)
+        return key, self.complete(response, key, entry)
+
+    def invoke(self, *args, **kwargs):
+        """Calls the method, timeout is reserved for the timeout of this call"""
+        self.count_call()
+        return self._invoke(*args, **kwargs)[1]
+
+    async def ainvoke(self, *args, **kwargs):
+        """Asyncio counterpart of invoke(), safe to await from socket handlers.
+        transport is reserved like timeout, see asend()"""
+        if type(self).invoke is not FiveNineRestMethod.invoke:
+            # original-style method that does its work in an invoke() override
+            kwargs.pop("transport", None)
+            return await asyncio.to_thread(self.invoke, *args, **kwargs)
+
+        self.count_call()
+        return (await self._ainvoke(*args, **kwargs))[1]
+
+    def index(self, *args, **kwargs):
+        """Returns the records of the response by cache_index_field
+
+        For cached methods the index is built once per cached response, so repeated
+        lookups are O(1) without another request.  Original-style methods build
+        their request inside invoke(), their records are indexed on every call.
+        """
+        cache = self.config.reference_data_cache
+        if type(self).invoke is not FiveNineRestMethod.invoke:
+            return cache.index(None, self.invoke(*args, **kwargs), self.cache_index_field)
+
+        self.count_call()
+        key, value = self._invoke(*args, **kwargs)
+        return cache.index(key, value, self.cache_index_field)
+
+    async def aindex(self, *args, **kwargs):
+        cache = self.config.reference_data_cache
+        if type(self).invoke is not FiveNineRestMethod.invoke:
+            value = await self.ainvoke(*args, **kwargs)
+            return cache.index(None, value, self.cache_index_field)
+
+        self.count_call()
+        key, value = await self._ainvoke(*args, **kwargs)
+        return cache.index(key, value, self.cache_index_field)
+
+    def lookup(self, record_id, *args, **kwargs):
+        """Returns the record with the given id, or None"""
+        return self.index(*args, **kwargs).get(str(record_id), None)
 
-        try:
-            self.response = requests.Session().send(prepared_request)
-            # self.response.raise_for_status()
-            logging.info(f"{self.method_name} - RESPONSE: {self.response.status_code}")
-            logging.debug(f"{self.method_name} -    TEXT: {self.response.text}")
+    async def alookup(self, record_id, *args, **kwargs):
+        return (await self.aindex(*args, **kwargs)).get(str(record_id), None)
 
-        except requests.exceptions.HTTPError as errh:
-            logging.error(f"{self.method_name} - HTTP Error: {errh}")
-        except requests.exceptions.ConnectionError as errc:
-            logging.error(f"{self.method_name} - Error Connecting: {errc}")
-        except requests.exceptions.Timeout as errt:
-            logging.error(f"{self.method_name} - Timeout Error: {errt}")
-        except requests.exceptions.RequestException as err:
-            logging.error(f"{self.method_name} - Unexpected Error: {err}")
-        
-        return self.response
+    def invalidate_cache(self):
+        self.config.reference_data_cache.invalidate(type(self).__name__)
 
 
 class SupervisorRestMethod(FiveNineRestMethod):
@@ -67,7 +373,7 @@ class SupervisorRestMethod(FiveNineRestMethod):
 
     @property
     def method_name(self):
-        return f"Supervisor:{self.__class__.__name__}" 
+        return f"Supervisor:{self.__class__.__name__}"
 
 class AgentRestMethod(FiveNineRestMethod):
     """Base class for all Five9 Agent REST methods."""
@@ -79,5 +385,4 @@ class AgentRestMethod(FiveNineRestMethod):
 
     @property
     def method_name(self):
-        return f"Agent:{self.__class__.__name__}" 
-    
\ No newline at end of file
+        return f"Agent:{self.__class__.__name__}"
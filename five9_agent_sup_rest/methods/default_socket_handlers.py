@@ -1,27 +1,133 @@
+import asyncio
 import logging
 
 from five9_agent_sup_rest.config import CONTEXT_PATHS
+from five9_agent_sup_rest.config import SOCKET_EVENT_IDS
+from five9_agent_sup_rest.offload import offload_payload, process_pool, run_offloaded
 
 
 class SocketEventHandler:
     """Base class for socket event handlers"""
 
+    # Dispatch settings for this handler, None uses the socket's defaults.
+    # See five9_agent_sup_rest.dispatch for how they are applied.
+    queue_size = None
+    workers = None
+    overflow_policy = None
+
+    # True to receive a LazyEvent that is only decoded when it is read
+    lazy_decode = False
+
+    # Event bus settings, see five9_agent_sup_rest.event_bus.  Handlers of the
+    # same eventId run in descending priority, an isolated handler gets a queue
+    # and worker of its own.  With data_sources, only events whose payLoad carries
+    # one of them are handled; subclasses may also define predicate(event).
+    priority = 0
+    isolated = False
+    data_sources = None
+    predicate = None
+
     def __init__(self, *args, **kwargs):
         if not hasattr(self, "eventId"):
             self.eventId = kwargs.get("eventId", None)
         self.client = kwargs.get("client", None)
+        self.socket = kwargs.get("socket", None)
 
     async def handle(self, event):
         """Handles an event received from the socket"""
+        # the generic handler receives lazily decoded events, only read them when
+        # they will be logged
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return
         # logging.info(f"Generic Handler EVENT: {event["context"]["eventId"]} - {event["context"]["eventReason"]}}")
         logging.debug(
             f"Generic Handler EVENT: {event['context']['eventId']} - {event['context']['eventReason']}"
         )
-        logging.debug("Payload:\n{event['payLoad']}\n")
+        logging.debug(f"Payload:\n{event['payLoad']}\n")
         return
 
 
 
+class ProcessPoolEventHandler(SocketEventHandler):
+    """Base class for handlers whose CPU heavy work runs in a process pool, so it
+    does not hold up the socket's reader and ping loop.
+
+    Subclasses implement process_event(event) as a staticmethod of a module level
+    class, so a pool process can import it.  It receives the decoded event and its
+    return value, which must be picklable and is best kept small, is passed to
+    handle_result(event, result) on the socket's event loop.
+
+    Events are received lazily decoded and sent to the pool as their raw frame, so
+    the loop neither decodes nor pickles them; reading the event on the loop, in
+    dispatch_key(), a predicate or handle_result(), decodes it there as well.
+
+    Events are handled in order, one at a time per worker.  To use several pool
+    processes for one eventId, set workers and implement dispatch_key(event):
+    events with the same key go to the same worker and stay in order.
+
+    A subclass without a process_event staticmethod raises TypeError when it is
+    defined, rather than in the pool; intermediate base classes are declared with
+    class Base(ProcessPoolEventHandler, abstract=True).
+    """
+
+    lazy_decode = True
+    # pool processes, None for config.SOCKET_OFFLOAD; handlers with the same
+    # settings share one pool
+    processes = None
+    start_method = None
+
+    def __init_subclass__(cls, abstract=False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if abstract:
+            return
+        for klass in cls.__mro__:
+            if "process_event" in klass.__dict__:
+                break
+        if klass is ProcessPoolEventHandler:
+            raise TypeError(f"{cls.__name__} must implement process_event(event)")
+        if not isinstance(klass.__dict__["process_event"], staticmethod):
+            raise TypeError(
+                f"{cls.__name__}.process_event must be a staticmethod, it runs in a "
+                "pool process without the handler"
+            )
+
+    @staticmethod
+    def process_event(event):
+        raise NotImplementedError
+
+    async def handle_result(self, event, result):
+        return result
+
+    async def handle(self, event):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            process_pool(self.processes, self.start_method),
+            run_offloaded,
+            type(self).process_event,
+            offload_payload(event),
+        )
+        return await self.handle_result(event, result)
+
+
+class ReferenceDataChangedHandler(SocketEventHandler):
+    """Base class for handlers of events that signal a domain configuration change.
+    Subclasses set eventId and invalidates, the method class names whose cached
+    reference data is dropped when the event arrives (all of it when empty):
+
+        class SkillsChangedHandler(ReferenceDataChangedHandler):
+            eventId = "..."
+            invalidates = ("DomainQueues",)
+    """
+
+    invalidates = ()
+    lazy_decode = True
+
+    async def handle(self, event):
+        logging.info(f"Reference data changed, invalidating: {self.invalidates}")
+        self.client.reference_data_cache.invalidate(*self.invalidates)
+        return
+
+
 class DefaultEventHandler1010(SocketEventHandler):
     """Default handler for event 1010 - Successful Websocket Connection"""
 
@@ -32,12 +138,33 @@ class DefaultEventHandler1010(SocketEventHandler):
         return
 
 class DefaultEventHandler1202(SocketEventHandler):
-    """Default handler for event 1202 - Pong"""
+    """Default handler for event 1202 - Pong
+    Records the round trip of the socket's last ping in its metrics.
+    """
 
     eventId = "1202"
 
     async def handle(self, event):
-        logging.info(f"Default Handler EVENT: {event['context']['eventId']} - {event['payLoad']}")
+        rtt = self.socket.metrics.record_pong() if self.socket is not None else None
+        logging.info(f"Default Handler EVENT: {event['context']['eventId']} - {event['payLoad']} - RTT: {rtt}")
+        return
+
+
+class DefaultEventHandlerLoginStateUpdated(SocketEventHandler):
+    """Default handler for EVENT_LOGIN_STATE_UPDATED
+    Keeps the client's login state cache current for the socket's user type, so
+    reading the login state does not need a REST call while the socket is open.
+    """
+
+    eventId = SOCKET_EVENT_IDS["EVENT_LOGIN_STATE_UPDATED"]
+
+    async def handle(self, event):
+        login_state = event["payLoad"]
+        if isinstance(login_state, dict):
+            login_state = login_state.get("loginState", login_state.get("state"))
+        logging.info(f"Default Handler EVENT: {event['context']['eventId']} - {login_state}")
+        if login_state:
+            self.client.login_state_cache.set(self.socket.context, login_state)
         return
 
 
@@ -69,8 +196,13 @@ class DefaultEventHandler1002(SocketEventHandler):
         logging.info(
             f"Default Handler EVENT: {event['context']['eventId']} - {event['context']['eventReason']} "
         )
-        self.client.session_configuration.update_config(event["payLoad"])
-        if self.client.current_supervisor_login_state != "WORKING":
-            self.client.supervisor.SessionStart.invoke()
+        # the payLoad is the session's new metadata, applied the same way as the
+        # metadata of a login response
+        config = self.client.session_configuration
+        config.session_metadata = {**config.session_metadata, "metadata": event["payLoad"]}
+        config.process_session_metadata()
+        # awaited so the REST round trips do not stall the socket's event loop
+        if await self.client.supervisor.SupervisorLoginState.ainvoke() != "WORKING":
+            await self.client.supervisor.SupervisorSessionStart.ainvoke()
             return "reconnect"
         return
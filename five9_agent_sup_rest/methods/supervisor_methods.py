@@ -1,8 +1,8 @@
 import logging
 
-from .base import SupervisorRestMethod
+from .base import SupervisorRestMethod, Five9Request
 from five9_agent_sup_rest.config import CONTEXT_PATHS
-from five9_agent_sup_rest.exceptions import Five9DuplicateLoginError
+from five9_agent_sup_rest.exceptions import Five9DuplicateLoginError, Five9ResponseError
 
 
 class MaintenanceNoticesGet(SupervisorRestMethod):
@@ -11,11 +11,13 @@ class MaintenanceNoticesGet(SupervisorRestMethod):
 
     """
 
-    def invoke(self):
-        self.method = "GET"
-        self.path = f"/supervisors/{self.config.userId}/maintenance_notices"
-        super().invoke()
-        return self.response.json()
+    def build_request(self):
+        return Five9Request(
+            "GET", f"/supervisors/{self.config.userId}/maintenance_notices"
+        )
+
+    def process_response(self, response):
+        return response.json()
 
 
 class MaintenanceNoticeAccept(SupervisorRestMethod):
@@ -24,20 +26,25 @@ class MaintenanceNoticeAccept(SupervisorRestMethod):
 
     """
 
-    def invoke(self, noticeId):
-        self.method = "PUT"
-        self.path = f"/supervisors/{self.config.userId}/maintenance_notices/{noticeId}/accept"
-        super().invoke()
-        return self.response.json()
+    invalidates_login_state = True
+
+    def build_request(self, noticeId):
+        return Five9Request(
+            "PUT",
+            f"/supervisors/{self.config.userId}/maintenance_notices/{noticeId}/accept",
+        )
+
+    def process_response(self, response):
+        return response.json()
 
 
 class SupervisorLoginState(SupervisorRestMethod):
 
-    def invoke(self):
-        self.method = "GET"
-        self.path = f"/supervisors/{self.config.userId}/login_state"
-        super().invoke()
-        return self.response.text.strip('"')
+    def build_request(self):
+        return Five9Request("GET", f"/supervisors/{self.config.userId}/login_state")
+
+    def process_response(self, response):
+        return response.text.strip('"')
 
 
 class SupervisorSessionStart(SupervisorRestMethod):
@@ -51,24 +58,28 @@ class SupervisorSessionStart(SupervisorRestMethod):
     CAN_RUN_WEB_AGENT permission
     """
 
-    def invoke(self, stationId="", stationType="EMPTY", stationState="DISCONNECTED"):
-        self.method = "PUT"
-        self.path = f"/supervisors/{self.config.userId}/session_start"
+    invalidates_login_state = True
+
+    def build_request(self, stationId="", stationType="EMPTY", stationState="DISCONNECTED"):
         payload = {
             "state": stationState,
             "stationId": stationId,
             "stationType": stationType,
         }
-        super().invoke(payload=payload)
+        return Five9Request(
+            "PUT", f"/supervisors/{self.config.userId}/session_start", payload=payload
+        )
+
+    def process_response(self, response):
         # Special handling for the supervisor session start response
-        if self.response.status_code < 400:
-            return self.response
-        
+        if response.status_code < 400:
+            return response
+
         else:
-            exception_details = self.response.json()
-            if exception_details.get("five9ExceptionDetail", {}).get("context", {}).get("contextCode", "") == "DUPLICATE_LOGIN": 
-                raise Five9DuplicateLoginError(f"Already Logged In: {self.response.status_code} - {self.response.json()}")
-            raise Exception(f"Error: {self.response.status_code} - {self.response.text}")
+            exception_details = response.json()
+            if exception_details.get("five9ExceptionDetail", {}).get("context", {}).get("contextCode", "") == "DUPLICATE_LOGIN":
+                raise Five9DuplicateLoginError(f"Already Logged In: {response.status_code} - {response.json()}")
+            raise Exception(f"Error: {response.status_code} - {response.text}")
 
 
 class LogOut(SupervisorRestMethod):
@@ -77,11 +88,10 @@ class LogOut(SupervisorRestMethod):
 
     """
 
-    def invoke(self):
-        self.method = "POST"
-        self.path = f"/auth/logout"
-        super().invoke()
-        return self.response
+    invalidates_login_state = True
+
+    def build_request(self):
+        return Five9Request("POST", f"/auth/logout")
 
 class DomainQueues(SupervisorRestMethod):
     """Returns an array of all queues in the domain.
@@ -89,68 +99,164 @@ class DomainQueues(SupervisorRestMethod):
 
     """
 
-    def invoke(self):
-        self.method = "GET"
-        self.path = f"/orgs/{self.config.orgId}/skills"
-        super().invoke()
-        return self.response.json()
+    def build_request(self):
+        return Five9Request("GET", f"/orgs/{self.config.orgId}/skills")
+
+    def process_response(self, response):
+        return response.json()
 
-class MigrateToMaintenanceHost:
+class MigrateToMaintenanceHost(SupervisorRestMethod):
     """Migrates the supervisor to the maintenance host.
     POST /supervisors/{supervisorId}/migrate
 
     """
 
-    def invoke(self):
-        self.method = "POST"
-        self.path = f"/{self.config.userId}/migrate"
-        self.qstring_params = {"migrateToMaintenanceHost": "true"}
-        super().invoke()
-        return self.response.json()
+    invalidates_login_state = True
+
+    def build_request(self):
+        return Five9Request(
+            "POST",
+            f"/supervisors/{self.config.userId}/migrate",
+            qstring_params={"migrateToMaintenanceHost": "true"},
+        )
+
+    def process_response(self, response):
+        return response.json()
 
 
 #### Alerts
 class GetAlerts(SupervisorRestMethod):
-    def invoke(self):
-        self.method = "GET"
-        self.path = "/alerts"
-        super().invoke()
-        return self.response.json()
-    
+    def build_request(self):
+        return Five9Request("GET", "/alerts")
+
+    def process_response(self, response):
+        return response.json()
+
 class CreateAlert(SupervisorRestMethod):
-    def invoke(self, alert_data):
-        self.method = "POST"
-        self.path = "/alerts"
-        super().invoke(payload=alert_data)
-        return self.response.json()
-    
+    def build_request(self, alert_data):
+        return Five9Request("POST", "/alerts", payload=alert_data)
+
+    def process_response(self, response):
+        if response.status_code >= 400:
+            raise Five9ResponseError(self.method_name, response.status_code, response.text)
+        return response.json()
+
 class UpdateAlert(SupervisorRestMethod):
-    def invoke(self, alert_id, alert_data):
-        self.method = "PUT"
-        self.path = f"/alerts/{alert_id}"
-        super().invoke(payload=alert_data)
-        return self.response.json()
+    """PUT /alerts/{alertId}, alert_data replaces the whole alert"""
+
+    def build_request(self, alert_id, alert_data):
+        return Five9Request("PUT", f"/alerts/{alert_id}", payload=alert_data)
+
+    def process_response(self, response):
+        if response.status_code >= 400:
+            raise Five9ResponseError(self.method_name, response.status_code, response.text)
+        # some updates answer without a body
+        if not response.content:
+            return None
+        return response.json()
 
 
 class DeleteAlert(SupervisorRestMethod):
-    def invoke(self, alert_id):
-        self.method = "DELETE"
-        self.path = f"/alerts/{alert_id}"
-        super().invoke()
-        return self.response.json()
+    def build_request(self, alert_id):
+        return Five9Request("DELETE", f"/alerts/{alert_id}")
+
+    def process_response(self, response):
+        if response.status_code >= 400:
+            raise Five9ResponseError(self.method_name, response.status_code, response.text)
+        # a successful delete may answer 204 without a body
+        if not response.content:
+            return None
+        return response.json()
 
 
 class GetAlertByID(SupervisorRestMethod):
-    def invoke(self, alert_id):
-        self.method = "GET"
-        self.path = f"/alerts/{alert_id}"
-        super().invoke()
-        return self.response.json()
+    def build_request(self, alert_id):
+        return Five9Request("GET", f"/alerts/{alert_id}")
+
+    def process_response(self, response):
+        return response.json()
 
 
 class GetDomainDispositions(SupervisorRestMethod):
-    def invoke(self):
-        self.method = "GET"
-        self.path = f"/orgs/{self.config.orgId}/dispositions"
-        super().invoke()
-        return self.response.json()
+    def build_request(self):
+        return Five9Request("GET", f"/orgs/{self.config.orgId}/dispositions")
+
+    def process_response(self, response):
+        return response.json()
+
+
+#### Statistics
+# Experimental: the statistics settings paths and payloads below have not been
+# confirmed against the API reference, see StatisticsSubscription.
+class GetStatisticsFilterSettings(SupervisorRestMethod):
+    """Returns the skills the supervisor's statistics are filtered to.
+    GET /supervisors/{supervisorId}/statistics/filter_settings
+
+    """
+
+    def build_request(self):
+        return Five9Request(
+            "GET", f"/supervisors/{self.config.userId}/statistics/filter_settings"
+        )
+
+    def process_response(self, response):
+        return response.json()
+
+
+class SetStatisticsFilterSettings(SupervisorRestMethod):
+    """Filters the statistics streamed to the supervisor to the given skills.
+    PUT /supervisors/{supervisorId}/statistics/filter_settings
+
+    filter_settings is {"skillIds": [...]}, an empty list streams every skill.
+    """
+
+    def build_request(self, filter_settings):
+        return Five9Request(
+            "PUT",
+            f"/supervisors/{self.config.userId}/statistics/filter_settings",
+            payload=filter_settings,
+        )
+
+    def process_response(self, response):
+        if response.status_code >= 400:
+            raise Five9ResponseError(self.method_name, response.status_code, response.text)
+        if not response.content:
+            return None
+        return response.json()
+
+
+class GetStatisticsViewSettings(SupervisorRestMethod):
+    """Returns the dataSources and columns streamed to the supervisor.
+    GET /supervisors/{supervisorId}/statistics/view_settings
+
+    """
+
+    def build_request(self):
+        return Five9Request(
+            "GET", f"/supervisors/{self.config.userId}/statistics/view_settings"
+        )
+
+    def process_response(self, response):
+        return response.json()
+
+
+class SetStatisticsViewSettings(SupervisorRestMethod):
+    """Sets the dataSources and the columns of each streamed to the supervisor.
+    PUT /supervisors/{supervisorId}/statistics/view_settings
+
+    view_settings is {"dataSources": [...], "columns": {dataSource: [...]}}.
+    """
+
+    def build_request(self, view_settings):
+        return Five9Request(
+            "PUT",
+            f"/supervisors/{self.config.userId}/statistics/view_settings",
+            payload=view_settings,
+        )
+
+    def process_response(self, response):
+        if response.status_code >= 400:
+            raise Five9ResponseError(self.method_name, response.status_code, response.text)
+        if not response.content:
+            return None
+        return response.json()
@@ -0,0 +1,459 @@
+import bisect
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from five9_agent_sup_rest.config import METRICS
+from five9_agent_sup_rest.config import SOCKET_METRICS
+
+
+class LatencyHistogram:
+    """Counts of observed durations in fixed buckets, with their sum"""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        # one count per bucket plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q quantile, inf past the last bound"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(self.bounds + (float("inf"),), self.counts)),
+        }
+
+    def exposition_lines(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class MethodMetrics:
+    """Counters and latency histogram of the requests sent by one REST method"""
+
+    __slots__ = ("requests", "statuses", "errors", "latency", "bytes_out", "bytes_in")
+
+    def __init__(self, latency_buckets):
+        self.requests = 0
+        # responses by status class, "2xx" ... "5xx"
+        self.statuses = {}
+        # requests without a response by exception class name
+        self.errors = {}
+        self.latency = LatencyHistogram(latency_buckets)
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+
+class Five9MetricsRegistry:
+    """Per-method request counts, status classes, latency histograms and bytes for
+    the REST calls of every client the registry is passed to.
+
+    Every request sent by FiveNineRestMethod.send() and asend() is recorded once,
+    retries included, under the method's method_name.  Recording takes one lock and
+    a bisect into the fixed latency buckets, which keeps the cost to a couple of
+    microseconds per request.  snapshot() returns the values as a dict, exposition()
+    as Prometheus text, and serve() exposes that text over http.  The exposition
+    also includes the collectors added with add_collector(), such as the
+    Five9SocketMetrics of the clients' sockets.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.enabled = kwargs.get("enabled", METRICS["enabled"])
+        self.latency_buckets = tuple(
+            kwargs.get("latency_buckets", METRICS["latency_buckets"])
+        )
+        self.prefix = kwargs.get("prefix", METRICS["prefix"])
+
+        self.lock = threading.Lock()
+        self.methods = {}
+        self.collectors = []
+        self.server = None
+
+    def record(self, method_name, status_code, seconds, bytes_out=0, bytes_in=0, error=None):
+        """Records one request, status_code is None when error prevented a response"""
+        if not self.enabled:
+            return
+        with self.lock:
+            metrics = self.methods.get(method_name, None)
+            if metrics is None:
+                metrics = self.methods[method_name] = MethodMetrics(self.latency_buckets)
+            metrics.requests += 1
+            if status_code is not None:
+                status_class = f"{status_code // 100}xx"
+                metrics.statuses[status_class] = metrics.statuses.get(status_class, 0) + 1
+            else:
+                error_name = type(error).__name__
+                metrics.errors[error_name] = metrics.errors.get(error_name, 0) + 1
+            metrics.latency.observe(seconds)
+            metrics.bytes_out += bytes_out
+            metrics.bytes_in += bytes_in
+
+    def requests_for(self, method_name):
+        metrics = self.methods.get(method_name, None)
+        return metrics.requests if metrics is not None else 0
+
+    def snapshot(self):
+        """Returns the metrics of every method by method_name"""
+        with self.lock:
+            return {
+                name: {
+                    "requests": metrics.requests,
+                    "statuses": dict(metrics.statuses),
+                    "errors": dict(metrics.errors),
+                    "latency": metrics.latency.snapshot(),
+                    "bytes_out": metrics.bytes_out,
+                    "bytes_in": metrics.bytes_in,
+                }
+                for name, metrics in self.methods.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.methods = {}
+
+    def add_collector(self, collector):
+        """Adds an object with an exposition(types) method to the text exposition"""
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def exposition(self):
+        """Returns the metrics in the Prometheus text exposition format"""
+        prefix = self.prefix
+        lines = [
+            f"# TYPE {prefix}_requests_total counter",
+            f"# TYPE {prefix}_errors_total counter",
+            f"# TYPE {prefix}_request_seconds histogram",
+            f"# TYPE {prefix}_bytes_out_total counter",
+            f"# TYPE {prefix}_bytes_in_total counter",
+        ]
+        with self.lock:
+            for name, metrics in sorted(self.methods.items()):
+                method = f'method="{name}"'
+                for status_class, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'{prefix}_requests_total{{{method},status="{status_class}"}} {count}'
+                    )
+                for error_name, count in sorted(metrics.errors.items()):
+                    lines.append(
+                        f'{prefix}_errors_total{{{method},error="{error_name}"}} {count}'
+                    )
+                lines.extend(
+                    metrics.latency.exposition_lines(f"{prefix}_request_seconds", method)
+                )
+                lines.append(f"{prefix}_bytes_out_total{{{method}}} {metrics.bytes_out}")
+                lines.append(f"{prefix}_bytes_in_total{{{method}}} {metrics.bytes_in}")
+        text = "\n".join(lines) + "\n"
+        typed = set()
+        for collector in list(self.collectors):
+            # a metric family is declared once, however many sockets report it
+            text += collector.exposition(types=type(collector) not in typed)
+            typed.add(type(collector))
+        return text
+
+    def serve(self, port=0, host="127.0.0.1"):
+        """Serves exposition() at /metrics on a background thread, returns the port"""
+        registry = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Five9MetricsRegistry - {format % args}")
+
+        self.server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logging.info(f"Five9MetricsRegistry - serving /metrics on port {self.server.server_address[1]}")
+        return self.server.server_address[1]
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class EventMetrics:
+    """Counters and histograms of one eventId on a socket"""
+
+    __slots__ = (
+        "received",
+        "window_count",
+        "previous_window_count",
+        "handled",
+        "failed",
+        "bytes_received",
+        "handler_seconds",
+        "queue_lag",
+        "server_lag",
+        "last_queue_lag",
+        "last_server_lag",
+    )
+
+    def __init__(self, latency_buckets):
+        self.received = 0
+        self.window_count = 0
+        self.previous_window_count = 0
+        self.handled = 0
+        self.failed = 0
+        # frame sizes as sent, UTF-8 bytes for text frames, see decoding.frame_size
+        self.bytes_received = 0
+        self.handler_seconds = LatencyHistogram(latency_buckets)
+        # from the reader queueing the event to its handler finishing
+        self.queue_lag = LatencyHistogram(latency_buckets)
+        # from the server's timestamp on the event to its handler finishing
+        self.server_lag = LatencyHistogram(latency_buckets)
+        # of the last handled event, the histograms cover the socket's lifetime
+        self.last_queue_lag = None
+        self.last_server_lag = None
+
+
+class Five9SocketMetrics:
+    """Instrumentation of a Five9Socket's event pipeline.
+
+    The reader counts the events received per eventId, and the rate over the last
+    complete rate_window.  The dispatcher workers record each handler's execution
+    time, the lag from the reader queueing an event to its handler finishing and,
+    for decoded events carrying a server timestamp in one of timestamp_fields of
+    their context, the lag from that timestamp.  Ping round trips
+    are timed from the ping to the 1202 pong handler, and queue depths are read
+    from the dispatcher when a snapshot is taken.
+
+    Everything is recorded on the socket's event loop without locking, a few
+    microseconds per event.  snapshot() and exposition() only read, and may be
+    called from other threads.
+    """
+
+    def __init__(self, context, *args, **kwargs):
+        self.context = context
+        # distinguishes the sockets of several sessions sharing a registry
+        self.user = kwargs.get("user", "")
+        self.enabled = kwargs.get("enabled", SOCKET_METRICS["enabled"])
+        self.latency_buckets = tuple(
+            kwargs.get("latency_buckets", SOCKET_METRICS["latency_buckets"])
+        )
+        self.rate_window = kwargs.get("rate_window", SOCKET_METRICS["rate_window"])
+        self.timestamp_fields = kwargs.get(
+            "timestamp_fields", SOCKET_METRICS["timestamp_fields"]
+        )
+        self.prefix = kwargs.get("prefix", SOCKET_METRICS["prefix"])
+        self.clock = kwargs.get("clock", time.monotonic)
+        self.wall_clock = kwargs.get("wall_clock", time.time)
+
+        self.events = {}
+        self.window_start = self.clock()
+        # set by the socket on every connection
+        self.dispatcher = None
+
+        self.ping_sent_at = None
+        self.ping_rtt = LatencyHistogram(self.latency_buckets)
+        self.last_ping_rtt = None
+
+    def event_metrics(self, eventId):
+        metrics = self.events.get(eventId, None)
+        if metrics is None:
+            metrics = self.events[eventId] = EventMetrics(self.latency_buckets)
+        return metrics
+
+    def roll_window(self, now):
+        elapsed_windows = int((now - self.window_start) // self.rate_window)
+        for metrics in list(self.events.values()):
+            # a full window without events in between leaves a rate of zero
+            metrics.previous_window_count = (
+                metrics.window_count if elapsed_windows == 1 else 0
+            )
+            metrics.window_count = 0
+        self.window_start += elapsed_windows * self.rate_window
+
+    def rate(self, metrics, now):
+        """Events per second over the last complete window, without rolling it"""
+        elapsed_windows = int((now - self.window_start) // self.rate_window)
+        if elapsed_windows == 0:
+            return metrics.previous_window_count / self.rate_window
+        if elapsed_windows == 1:
+            return metrics.window_count / self.rate_window
+        return 0.0
+
+    def record_received(self, eventId, size=0):
+        if not self.enabled:
+            return
+        now = self.clock()
+        if now - self.window_start >= self.rate_window:
+            self.roll_window(now)
+        metrics = self.events.get(eventId, None) or self.event_metrics(eventId)
+        metrics.received += 1
+        metrics.window_count += 1
+        metrics.bytes_received += size
+
+    def server_timestamp(self, event):
+        """The event's server timestamp in epoch seconds, or None.  A LazyEvent the
+        handler did not read is not decoded for it."""
+        if getattr(event, "is_decoded", True) is False:
+            return None
+        try:
+            context = event["context"]
+        except (KeyError, TypeError):
+            return None
+        for field in self.timestamp_fields:
+            value = context.get(field, None)
+            if value is None:
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return None
+            # epoch milliseconds, as Five9 timestamps usually are
+            return value / 1000 if value > 1e11 else value
+        return None
+
+    def record_handled(self, eventId, event, handler_seconds, queue_lag, failed=False):
+        """Records a finished handler run, queue_lag is the time since the event was
+        queued"""
+        if not self.enabled:
+            return
+        metrics = self.events.get(eventId, None) or self.event_metrics(eventId)
+        metrics.handled += 1
+        if failed:
+            metrics.failed += 1
+        metrics.handler_seconds.observe(handler_seconds)
+        metrics.queue_lag.observe(queue_lag)
+        metrics.last_queue_lag = queue_lag
+        server_timestamp = self.server_timestamp(event)
+        if server_timestamp is not None:
+            server_lag = max(0, self.wall_clock() - server_timestamp)
+            metrics.server_lag.observe(server_lag)
+            metrics.last_server_lag = server_lag
+
+    def ping_sent(self):
+        self.ping_sent_at = self.clock()
+
+    def record_pong(self):
+        if self.ping_sent_at is None:
+            return None
+        rtt = self.clock() - self.ping_sent_at
+        self.ping_sent_at = None
+        self.ping_rtt.observe(rtt)
+        self.last_ping_rtt = rtt
+        return rtt
+
+    def queue_depths(self):
+        """Events waiting per handler eventId, "*" for the fallback handler's queue"""
+        if self.dispatcher is None:
+            return {}
+        return {
+            eventId: stats["depth"] for eventId, stats in self.dispatcher.stats().items()
+        }
+
+    def snapshot(self):
+        depths = self.queue_depths()
+        now = self.clock()
+        # a copy of the items, the event loop may be adding eventIds
+        events = {
+            eventId: {
+                "received": metrics.received,
+                "rate": self.rate(metrics, now),
+                "handled": metrics.handled,
+                "failed": metrics.failed,
+                "bytes_received": metrics.bytes_received,
+                "handler_seconds": metrics.handler_seconds.snapshot(),
+                "queue_lag": metrics.queue_lag.snapshot(),
+                "server_lag": metrics.server_lag.snapshot(),
+                "last_queue_lag": metrics.last_queue_lag,
+                "last_server_lag": metrics.last_server_lag,
+            }
+            for eventId, metrics in list(self.events.items())
+        }
+        return {
+            "context": self.context,
+            "events": events,
+            "queue_depth": sum(depths.values()),
+            "queue_depths": depths,
+            "ping": {
+                "last_rtt": self.last_ping_rtt,
+                **self.ping_rtt.snapshot(),
+            },
+        }
+
+    def exposition(self, types=True):
+        """Returns the metrics in the Prometheus text exposition format, types=False
+        leaves out the TYPE lines already written for another socket"""
+        prefix = self.prefix
+        context = f'context="{self.context}",user="{self.user}"'
+        depths = self.queue_depths()
+        lines = [
+            f"# TYPE {prefix}_events_received_total counter",
+            f"# TYPE {prefix}_events_handled_total counter",
+            f"# TYPE {prefix}_events_failed_total counter",
+            f"# TYPE {prefix}_event_bytes_received_total counter",
+            f"# TYPE {prefix}_queue_depth gauge",
+            f"# TYPE {prefix}_handler_seconds histogram",
+            f"# TYPE {prefix}_queue_lag_seconds histogram",
+            f"# TYPE {prefix}_server_lag_seconds histogram",
+            f"# TYPE {prefix}_ping_rtt_seconds histogram",
+        ] if types else []
+        # a copy of the items, the event loop may be adding eventIds
+        for eventId, metrics in sorted(list(self.events.items())):
+            labels = f'{context},event_id="{eventId}"'
+            lines.append(f"{prefix}_events_received_total{{{labels}}} {metrics.received}")
+            lines.append(f"{prefix}_events_handled_total{{{labels}}} {metrics.handled}")
+            lines.append(f"{prefix}_events_failed_total{{{labels}}} {metrics.failed}")
+            lines.append(
+                f"{prefix}_event_bytes_received_total{{{labels}}} {metrics.bytes_received}"
+            )
+            lines.extend(
+                metrics.handler_seconds.exposition_lines(f"{prefix}_handler_seconds", labels)
+            )
+            lines.extend(
+                metrics.queue_lag.exposition_lines(f"{prefix}_queue_lag_seconds", labels)
+            )
+            if metrics.server_lag.count:
+                lines.extend(
+                    metrics.server_lag.exposition_lines(
+                        f"{prefix}_server_lag_seconds", labels
+                    )
+                )
+        for eventId, depth in sorted(depths.items()):
+            lines.append(f'{prefix}_queue_depth{{{context},event_id="{eventId}"}} {depth}')
+        lines.extend(
+            self.ping_rtt.exposition_lines(f"{prefix}_ping_rtt_seconds", context)
+        )
+        return "\n".join(lines) + "\n"
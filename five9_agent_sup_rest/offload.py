@@ -0,0 +1,65 @@
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+
+from five9_agent_sup_rest.config import SOCKET_OFFLOAD
+from five9_agent_sup_rest.decoding import LazyEvent, default_loads
+
+
+# pools by (processes, start_method), shared by every socket of the process
+PROCESS_POOLS = {}
+PROCESS_POOLS_LOCK = threading.Lock()
+
+# the JSON decoder of a pool process, chosen on its first frame
+loads = None
+
+
+def process_pool(processes=None, start_method=None):
+    """Returns the process pool for offloaded handlers, created on first use.
+
+    Handlers of every socket and client in the process share it, so a manager
+    running many sessions does not start a pool per session.
+    """
+    processes = processes or SOCKET_OFFLOAD["processes"] or os.cpu_count()
+    start_method = start_method or SOCKET_OFFLOAD["start_method"]
+    with PROCESS_POOLS_LOCK:
+        pool = PROCESS_POOLS.get((processes, start_method), None)
+        if pool is None:
+            pool = PROCESS_POOLS[(processes, start_method)] = (
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=multiprocessing.get_context(start_method),
+                )
+            )
+            logging.info(f"Started a {processes} process {start_method} pool for offloaded handlers")
+    return pool
+
+
+def shutdown_process_pools(wait=True):
+    with PROCESS_POOLS_LOCK:
+        pools = list(PROCESS_POOLS.values())
+        PROCESS_POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def offload_payload(event):
+    """What is sent to the pool for an event.  A LazyEvent is sent as its raw
+    frame, one string to pickle, and decoded in the pool process; anything else is
+    pickled as it is."""
+    if isinstance(event, LazyEvent):
+        return event.raw
+    return event
+
+
+def run_offloaded(process_event, payload):
+    """Runs in a pool process: decodes a raw frame and passes the event to
+    process_event"""
+    global loads
+    if isinstance(payload, (str, bytes)):
+        if loads is None:
+            loads = default_loads()
+        payload = loads(payload)
+    return process_event(payload)
@@ -0,0 +1,202 @@
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+
+from five9_agent_sup_rest.config import RATE_LIMIT
+
+
+class TokenBucket:
+    """Token bucket usable from threads and coroutines alike.
+
+    reserve() takes a token and returns how long the caller must wait before
+    sending.  The bucket may go negative, which queues callers fairly without
+    holding the lock while they wait.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.clock = clock
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self.tokens = self.burst
+        self.updated = clock()
+        self.paused_until = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+            return max(wait, self.paused_until - now)
+
+    def set_rate(self, rate):
+        with self.lock:
+            self._refill(self.clock())
+            self.rate = rate
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class Five9RateLimiter:
+    """Client side rate limiting for the REST methods of one or more clients.
+
+    Every request takes a token from the client bucket, when a rate is set, and from
+    its method's bucket, when method_rates has one.  A throttled response (429 or
+    503) pauses all requests for its Retry-After, and with adaptive, halves the rate
+    of the buckets involved; successful responses raise it back step by step up to
+    the configured rate.  Without a configured rate only Retry-After is applied.
+
+    The time callers spent waiting is recorded, in total and per method, so the rate
+    can be tuned for throughput without tripping the server's limits.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.clock = kwargs.get("clock", time.monotonic)
+        self.rate = kwargs.get("rate", RATE_LIMIT["rate"])
+        self.burst = kwargs.get("burst", RATE_LIMIT["burst"])
+        self.method_rates = kwargs.get("method_rates", RATE_LIMIT["method_rates"])
+        self.adaptive = kwargs.get("adaptive", RATE_LIMIT["adaptive"])
+        self.min_rate = kwargs.get("min_rate", RATE_LIMIT["min_rate"])
+        self.increase_step = kwargs.get("increase_step", RATE_LIMIT["increase_step"])
+        self.decrease_factor = kwargs.get(
+            "decrease_factor", RATE_LIMIT["decrease_factor"]
+        )
+        self.throttle_statuses = kwargs.get(
+            "throttle_statuses", RATE_LIMIT["throttle_statuses"]
+        )
+        self.default_retry_after = kwargs.get(
+            "default_retry_after", RATE_LIMIT["default_retry_after"]
+        )
+
+        self.client_bucket = (
+            TokenBucket(self.rate, self.burst, self.clock) if self.rate else None
+        )
+        # used for Retry-After when no client rate is set
+        self.pause_bucket = self.client_bucket or TokenBucket(1, clock=self.clock)
+        self.method_buckets = {}
+        for name, rate in self.method_rates.items():
+            rate, burst = rate if isinstance(rate, tuple) else (rate, None)
+            self.method_buckets[name] = TokenBucket(rate, burst, self.clock)
+
+        self.last_decrease = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.method_wait_seconds = {}
+
+    def reserve(self, method):
+        """Takes a token for method and returns the seconds to wait before sending"""
+        method_bucket = self.method_buckets.get(type(method).__name__, None)
+        if self.client_bucket is not None:
+            wait = self.client_bucket.reserve()
+        else:
+            wait = max(0, self.pause_bucket.paused_until - self.clock())
+        if method_bucket is not None:
+            wait = max(wait, method_bucket.reserve())
+        self.record_wait(method, wait)
+        return wait
+
+    def record_wait(self, method, wait):
+        with self.lock:
+            self.requests += 1
+            if wait > 0:
+                self.waits += 1
+                self.wait_seconds += wait
+                self.max_wait = max(self.max_wait, wait)
+                name = method.method_name
+                self.method_wait_seconds[name] = self.method_wait_seconds.get(name, 0) + wait
+
+    def acquire(self, method):
+        wait = self.reserve(method)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, method):
+        wait = self.reserve(method)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def retry_after(self, response):
+        """Seconds from a Retry-After header, in seconds or as an HTTP date"""
+        value = response.headers.get("Retry-After", None)
+        if value is None:
+            return self.default_retry_after
+        try:
+            return max(0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return self.default_retry_after
+        return max(0, retry_at.timestamp() - time.time())
+
+    def buckets_for(self, method):
+        buckets = []
+        if self.client_bucket is not None:
+            buckets.append(self.client_bucket)
+        method_bucket = self.method_buckets.get(type(method).__name__, None)
+        if method_bucket is not None:
+            buckets.append(method_bucket)
+        return buckets
+
+    def record_response(self, method, response):
+        """Adapts to a response; call for every response received"""
+        if response.status_code in self.throttle_statuses:
+            retry_after = self.retry_after(response)
+            with self.lock:
+                self.throttled += 1
+            logging.warning(
+                f"{method.method_name} - Throttled ({response.status_code}), "
+                f"pausing requests for {retry_after:.2f}s"
+            )
+            self.pause_bucket.pause(retry_after)
+            for bucket in self.buckets_for(method):
+                if bucket is not self.pause_bucket:
+                    bucket.pause(retry_after)
+                if self.adaptive:
+                    self.decrease(bucket)
+
+        elif self.adaptive and response.status_code < 400:
+            for bucket in self.buckets_for(method):
+                if bucket.rate < bucket.max_rate:
+                    bucket.set_rate(min(bucket.max_rate, bucket.rate + self.increase_step))
+
+    def decrease(self, bucket):
+        # a burst of throttled responses to requests already in flight lowers the
+        # rate once, not once per response
+        now = self.clock()
+        if now - self.last_decrease.get(id(bucket), -1e9) < 1:
+            return
+        self.last_decrease[id(bucket)] = now
+        rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+        bucket.set_rate(rate)
+        logging.info(f"Five9RateLimiter - rate lowered to {rate:.2f}/s")
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "max_wait": self.max_wait,
+                "method_wait_seconds": dict(self.method_wait_seconds),
+                "rate": self.client_bucket.rate if self.client_bucket else None,
+                "method_rates": {
+                    name: bucket.rate for name, bucket in self.method_buckets.items()
+                },
+            }
@@ -0,0 +1,76 @@
+import collections
+import random
+import statistics
+import time
+
+from five9_agent_sup_rest.config import SOCKET_RECONNECT
+
+
+class ReconnectPolicy:
+    """Exponential backoff with full jitter for socket reconnect attempts"""
+
+    def __init__(self, *args, **kwargs):
+        self.enabled = kwargs.get("enabled", SOCKET_RECONNECT["enabled"])
+        self.initial_delay = kwargs.get("initial_delay", SOCKET_RECONNECT["initial_delay"])
+        self.max_delay = kwargs.get("max_delay", SOCKET_RECONNECT["max_delay"])
+        self.multiplier = kwargs.get("multiplier", SOCKET_RECONNECT["multiplier"])
+        self.jitter = kwargs.get("jitter", SOCKET_RECONNECT["jitter"])
+        self.max_attempts = kwargs.get("max_attempts", SOCKET_RECONNECT["max_attempts"])
+
+    def delay(self, attempt):
+        """Seconds to wait before reconnect attempt number attempt (0 based)"""
+        backoff = min(self.max_delay, self.initial_delay * self.multiplier**attempt)
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def should_retry(self, attempt):
+        return self.enabled and (
+            self.max_attempts is None or attempt < self.max_attempts
+        )
+
+
+class ReconnectMetrics:
+    """Counts socket disconnects and measures how long each took to recover.
+
+    Time to recover runs from the moment a connection is lost (or first fails) to
+    the moment the next connection is established.
+    """
+
+    def __init__(self, history=100, clock=time.monotonic):
+        self.clock = clock
+        self.connections = 0
+        self.disconnects = 0
+        self.reconnects = 0
+        self.failed_attempts = 0
+        self.relogins = 0
+        self.recovery_times = collections.deque(maxlen=history)
+        self.disconnected_at = None
+
+    def disconnected(self):
+        if self.disconnected_at is None:
+            self.disconnected_at = self.clock()
+            self.disconnects += 1
+
+    def connected(self):
+        self.connections += 1
+        if self.disconnected_at is not None:
+            self.recovery_times.append(self.clock() - self.disconnected_at)
+            self.reconnects += 1
+            self.disconnected_at = None
+
+    def snapshot(self):
+        recovery_times = list(self.recovery_times)
+        return {
+            "connections": self.connections,
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "failed_attempts": self.failed_attempts,
+            "relogins": self.relogins,
+            "down": self.disconnected_at is not None,
+            "last_time_to_recover": recovery_times[-1] if recovery_times else None,
+            "mean_time_to_recover": statistics.mean(recovery_times)
+            if recovery_times
+            else None,
+            "max_time_to_recover": max(recovery_times) if recovery_times else None,
+        }
@@ -0,0 +1,163 @@
+import asyncio
+import gzip
+import logging
+import queue
+import threading
+import time
+import zlib
+
+from five9_agent_sup_rest.config import SOCKET_RECORDING
+
+
+class Five9FrameRecorder:
+    """Appends raw websocket frames and the time they were received to a gzip log.
+
+    Each record is a "<epoch seconds> <length>" header line followed by the frame's
+    UTF-8 bytes and a newline, so frames are stored exactly as received.  The log
+    is only ever appended to: every recorder adds a gzip member, which gzip readers
+    read back as one stream.
+
+    record() only buffers the frame; every flush_every frames the batch is handed
+    to a writer thread that compresses and writes it, so the socket's event loop
+    never waits on compression or the disk.  A log cut short by a crash is read up
+    to its last complete frame.
+    """
+
+    def __init__(self, path, *args, **kwargs):
+        self.path = path
+        self.compresslevel = kwargs.get(
+            "compresslevel", SOCKET_RECORDING["compresslevel"]
+        )
+        self.flush_every = kwargs.get("flush_every", SOCKET_RECORDING["flush_every"])
+        self.clock = kwargs.get("clock", time.time)
+
+        self.file = gzip.open(path, "ab", compresslevel=self.compresslevel)
+        self.frames = 0
+        self.buffer = []
+        self.batches = queue.SimpleQueue()
+        self.writer = threading.Thread(
+            target=self.write_batches, name="five9-frame-recorder", daemon=True
+        )
+        self.writer.start()
+        logging.info(f"Recording websocket frames to {path}")
+
+    def record(self, frame, received_at=None):
+        if isinstance(frame, str):
+            frame = frame.encode()
+        if received_at is None:
+            received_at = self.clock()
+        self.buffer.append(b"%.6f %d\n%s\n" % (received_at, len(frame), frame))
+        self.frames += 1
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.batches.put(self.buffer)
+            self.buffer = []
+
+    def write_batches(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            # zlib releases the GIL while compressing, one call per batch
+            self.file.write(b"".join(batch))
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.batches.put(None)
+            self.writer.join()
+            self.file.close()
+            logging.info(f"Recorded {self.frames} websocket frames to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_frames(path):
+    """Yields (received_at, frame) for every complete frame in a frame log"""
+    with gzip.open(path, "rb") as log:
+        try:
+            while True:
+                header = log.readline()
+                if not header:
+                    return
+                received_at, length = header.split()
+                frame = log.read(int(length))
+                if len(frame) < int(length) or log.read(1) != b"\n":
+                    break
+                yield float(received_at), frame.decode()
+        except (EOFError, zlib.error, ValueError):
+            pass
+    logging.warning(f"Frame log {path} ends with an incomplete frame, skipped")
+
+
+class Five9FrameReplayer:
+    """Feeds recorded frames to a socket as if they came from its websocket.
+
+    source is a frame log path, or an iterable of (received_at, frame) pairs such
+    as a list read once with read_frames(), so decompression is not timed.  Frames
+    are released on the recorded schedule divided by speed: 1 replays in real time,
+    10 ten times faster, and None or 0 as fast as the socket reads them.  Waits
+    longer than max_gap recorded seconds are shortened to max_gap.
+
+    behind is the furthest the replay fell behind its schedule, in seconds; a
+    pipeline that keeps up at the chosen speed stays close to zero.
+    """
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        self.speed = kwargs.get("speed", 1)
+        self.max_gap = kwargs.get("max_gap", SOCKET_RECORDING["max_gap"])
+
+        self.frames = 0
+        self.behind = 0.0
+        self.started = None
+        self.finished = None
+        self.recorded_at = None
+
+    def recorded_clock(self):
+        """The recorded receive time of the latest replayed frame"""
+        return self.recorded_at if self.recorded_at is not None else time.time()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    async def __aiter__(self):
+        source = read_frames(self.source) if isinstance(self.source, str) else self.source
+        self.started = time.perf_counter()
+        schedule = 0.0
+        previous = None
+        for received_at, frame in source:
+            if self.speed and previous is not None:
+                gap = received_at - previous
+                if self.max_gap is not None:
+                    gap = min(gap, self.max_gap)
+                schedule += max(gap, 0) / self.speed
+                wait = self.started + schedule - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                else:
+                    self.behind = max(self.behind, -wait)
+            previous = received_at
+            self.recorded_at = received_at
+            self.frames += 1
+            yield frame
+        self.finished = time.perf_counter()
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "elapsed": self.elapsed,
+            "frames_per_second": self.frames / self.elapsed if self.elapsed else 0.0,
+            "behind": self.behind,
+        }
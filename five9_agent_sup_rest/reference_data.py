@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+
+from five9_agent_sup_rest.config import REFERENCE_DATA_TTL
+
+
+class ReferenceDataEntry:
+    """A cached response value with its validators and lookup indexes"""
+
+    __slots__ = ("value", "etag", "last_modified", "stored_at", "indexes")
+
+    def __init__(self, value, etag, last_modified, stored_at):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.indexes = {}
+
+
+class ReferenceDataCache:
+    """Caches the responses of GET methods returning mostly static domain metadata,
+    such as DomainQueues and GetDomainDispositions.
+
+    Each session configuration owns one cache, shared by every method instance of
+    the session.  A cached value is returned without a request until its method's TTL
+    has passed.  After that, when the server sent an ETag or Last-Modified header, the
+    next call revalidates with a conditional request and a 304 keeps the cached value.
+
+    Cached values are shared between callers and must be treated as read only.  Call
+    invalidate() when the domain configuration is known to have changed, for example
+    from a socket handler.
+    """
+
+    def __init__(self, ttls=None, clock=time.monotonic):
+        self.ttls = {**REFERENCE_DATA_TTL, **(ttls or {})}
+        self.clock = clock
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def ttl_for(self, method):
+        return self.ttls.get(type(method).__name__, method.cache_ttl)
+
+    def key_for(self, method, request):
+        if request.method != "GET" or self.ttl_for(method) is None:
+            return None
+        qstring = tuple(sorted((request.qstring_params or {}).items()))
+        return (type(method).__name__, request.path, qstring)
+
+    def lookup(self, method, request):
+        """Returns (key, entry, fresh) for a request, key is None when not cacheable"""
+        key = self.key_for(method, request)
+        if key is None:
+            return None, None, False
+        entry = self.entries.get(key, None)
+        fresh = entry is not None and (
+            self.clock() - entry.stored_at < self.ttl_for(method)
+        )
+        with self.lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return key, entry, fresh
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, key, value, response):
+        self.entries[key] = ReferenceDataEntry(
+            value,
+            response.headers.get("ETag", None),
+            response.headers.get("Last-Modified", None),
+            self.clock(),
+        )
+        logging.debug(f"ReferenceDataCache - Stored {key[0]} {key[1]}")
+
+    def revalidate(self, entry):
+        """Marks a cached value confirmed by a 304 as fresh again"""
+        entry.stored_at = self.clock()
+        with self.lock:
+            self.revalidated += 1
+
+    def index(self, key, value, field):
+        """Returns value's records by str(record[field]), built once per cached value"""
+        entry = self.entries.get(key, None) if key is not None else None
+        if entry is None or entry.value is not value:
+            return build_index(value, field)
+        index = entry.indexes.get(field, None)
+        if index is None:
+            index = entry.indexes[field] = build_index(value, field)
+        return index
+
+    def invalidate(self, *method_names):
+        """Drops the cached values of the given method class names, or of every method"""
+        if not method_names:
+            self.entries.clear()
+        else:
+            # a snapshot of the keys, other threads may be storing entries
+            for key in [key for key in list(self.entries) if key[0] in method_names]:
+                self.entries.pop(key, None)
+        logging.debug(f"ReferenceDataCache - Invalidated {method_names or 'all'}")
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+
+def build_index(records, field):
+    return {str(record[field]): record for record in records if field in record}
@@ -0,0 +1,54 @@
+import random
+import time
+
+from five9_agent_sup_rest.config import RETRY
+
+
+class RetryPolicy:
+    """Decides whether and when a failed REST call is sent again.
+
+    Connection errors, timeouts and retry_statuses responses are retried with
+    exponential backoff, but only for idempotent http methods, unless retry_post
+    is set or the method class sets idempotent = True.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.max_attempts = kwargs.get("max_attempts", RETRY["max_attempts"])
+        self.initial_delay = kwargs.get("initial_delay", RETRY["initial_delay"])
+        self.max_delay = kwargs.get("max_delay", RETRY["max_delay"])
+        self.multiplier = kwargs.get("multiplier", RETRY["multiplier"])
+        self.jitter = kwargs.get("jitter", RETRY["jitter"])
+        self.retry_statuses = kwargs.get("retry_statuses", RETRY["retry_statuses"])
+        self.idempotent_methods = kwargs.get(
+            "idempotent_methods", RETRY["idempotent_methods"]
+        )
+        self.retry_post = kwargs.get("retry_post", RETRY["retry_post"])
+        self.relogin_on_401 = kwargs.get("relogin_on_401", RETRY["relogin_on_401"])
+        self.total_timeout = kwargs.get("total_timeout", RETRY["total_timeout"])
+
+    def is_retryable(self, method, request):
+        if method.idempotent is not None:
+            return method.idempotent
+        return request.method in self.idempotent_methods or (
+            self.retry_post and request.method == "POST"
+        )
+
+    def delay(self, attempt):
+        """Seconds to wait after failed attempt number attempt (1 based)"""
+        backoff = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def should_retry(self, attempt, retryable, response, started, delay):
+        """True to retry after a failed attempt, response is None for an error"""
+        if not retryable or attempt >= self.max_attempts:
+            return False
+        if response is not None and response.status_code not in self.retry_statuses:
+            return False
+        if (
+            self.total_timeout is not None
+            and time.monotonic() - started + delay > self.total_timeout
+        ):
+            return False
+        return True
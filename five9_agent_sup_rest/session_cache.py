@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+from five9_agent_sup_rest.config import SESSION_CACHE
+
+
+# fields of a logged in Five9RestClientSessionConfig kept in the cache
+SESSION_FIELDS = ("tokenId", "cookies_header", "host", "port", "orgId", "userId", "farmId")
+
+
+class Five9SessionCache:
+    """Encrypted on-disk cache of Five9 login sessions, keyed by username and region.
+
+    Lets a short-lived process reuse the session of the previous run instead of
+    logging in again.  Entries are encrypted with a Fernet key, passed as key or read
+    from the FIVE9_SESSION_CACHE_KEY environment variable; generate one with
+    Five9SessionCache.generate_key().  Files are only readable by the current user.
+
+    Requires the cryptography package, pip install five9_agent_sup_rest[cache].
+    """
+
+    def __init__(self, *args, **kwargs):
+        if Fernet is None:
+            raise ImportError(
+                "Five9SessionCache requires cryptography, "
+                "pip install five9_agent_sup_rest[cache]"
+            )
+
+        self.directory = os.path.expanduser(
+            kwargs.get("directory", SESSION_CACHE["directory"])
+        )
+        self.max_age = kwargs.get("max_age", SESSION_CACHE["max_age"])
+
+        key = kwargs.get("key", None) or os.environ.get(SESSION_CACHE["key_env_var"])
+        if not key:
+            raise ValueError(
+                f"Five9SessionCache requires a key, pass key or set {SESSION_CACHE['key_env_var']}"
+            )
+        self.fernet = Fernet(key)
+
+    @staticmethod
+    def generate_key():
+        if Fernet is None:
+            raise ImportError("Five9SessionCache requires cryptography")
+        return Fernet.generate_key().decode()
+
+    def path_for(self, username, region):
+        # hashed so usernames are not readable from the file names
+        name = hashlib.sha256(f"{region}:{username}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.session")
+
+    def load(self, username, region):
+        """Returns the cached session fields, or None when missing, unreadable or too old"""
+        try:
+            with open(self.path_for(username, region), "rb") as cache_file:
+                entry = json.loads(self.fernet.decrypt(cache_file.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, InvalidToken) as err:
+            logging.warning(f"Five9SessionCache - Ignoring unreadable entry: {err!r}")
+            return None
+
+        if time.time() - entry.get("saved_at", 0) > self.max_age:
+            logging.debug(f"Five9SessionCache - Entry expired for {username}")
+            return None
+        return entry
+
+    def save(self, username, region, session_configuration):
+        entry = {
+            field: getattr(session_configuration, field) for field in SESSION_FIELDS
+        }
+        entry["saved_at"] = time.time()
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        # written to a temporary file and renamed so a reader never sees half an entry
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(descriptor, "wb") as cache_file:
+                cache_file.write(self.fernet.encrypt(json.dumps(entry).encode()))
+            os.replace(temporary_path, self.path_for(username, region))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        logging.debug(f"Five9SessionCache - Saved session for {username}")
+
+    def delete(self, username, region):
+        try:
+            os.unlink(self.path_for(username, region))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,141 @@
+import logging
+
+
+class QueueStatisticsStore:
+    """Current ACD_STATUS statistics per queue, updated in place from socket events.
+
+    load_snapshot() takes the rows of a 5000 (initial statistics) event and
+    apply_delta() the added / updated / removed lists of a 5012 (statistics update)
+    event.  Rows are kept by queue id and updated field by field.  A row is copied
+    once, when its queue is first stored, so the events' own rows, which other
+    subscribers share, are never modified.  For each update the store records which queues changed and, for
+    the fields that changed, their previous value, so the work done per update
+    scales with the size of the delta rather than with the number of queues.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.id_field = kwargs.get("id_field", "id")
+
+        self.rows = {}
+        self.queue_id_map = {}
+        self.map_queue_ids(kwargs.get("queue_mapping_info", None) or [])
+
+        self.changed = set()
+        self.added = set()
+        self.removed = {}
+        self.previous = {}
+
+    def map_queue_ids(self, queue_mapping_info):
+        for queue in queue_mapping_info:
+            self.queue_id_map[queue["id"]] = queue["name"]
+
+    def queue_name(self, queue_id):
+        return self.queue_id_map.get(queue_id, queue_id)
+
+    def _row_id(self, row):
+        return row[self.id_field] if isinstance(row, dict) else row
+
+    def _start_update(self):
+        self.changed = set()
+        self.added = set()
+        self.removed = {}
+        self.previous = {}
+
+    def load_snapshot(self, rows):
+        """Replaces the store contents with a full snapshot"""
+        self._start_update()
+        self.rows = {self._row_id(row): dict(row) for row in rows}
+        self.added = set(self.rows)
+        self.changed = set(self.rows)
+        logging.debug(f"QueueStatisticsStore - snapshot of {len(self.rows)} queues")
+        return self.changed
+
+    def apply_delta(self, delta):
+        """Applies a statistics update and returns the ids of the queues it changed"""
+        self._start_update()
+
+        for row in delta.get("added", None) or []:
+            self._upsert(row)
+
+        for row in delta.get("updated", None) or []:
+            self._upsert(row)
+
+        for row in delta.get("removed", None) or []:
+            queue_id = self._row_id(row)
+            removed_row = self.rows.pop(queue_id, None)
+            if removed_row is not None:
+                self.removed[queue_id] = removed_row
+                self.changed.add(queue_id)
+
+        logging.debug(f"QueueStatisticsStore - {len(self.changed)} queues changed")
+        return self.changed
+
+    def _upsert(self, row):
+        queue_id = self._row_id(row)
+        current = self.rows.get(queue_id, None)
+
+        if current is None:
+            self.rows[queue_id] = dict(row)
+            self.added.add(queue_id)
+            self.changed.add(queue_id)
+            return
+
+        previous = None
+        for field, value in row.items():
+            old_value = current.get(field, None)
+            if old_value != value:
+                if previous is None:
+                    previous = self.previous.setdefault(queue_id, {})
+                previous.setdefault(field, old_value)
+                current[field] = value
+
+        if previous is not None:
+            self.changed.add(queue_id)
+
+    def get(self, queue_id, field, default=None):
+        return self.rows.get(queue_id, {}).get(field, default)
+
+    def previous_value(self, queue_id, field, default=None):
+        """Value of a field before the last update, the current value if unchanged"""
+        previous = self.previous.get(queue_id, None)
+        if previous is not None and field in previous:
+            value = previous[field]
+            return default if value is None else value
+        return self.get(queue_id, field, default)
+
+    def changed_fields(self, queue_id):
+        return self.previous.get(queue_id, {})
+
+    def iter_changes(self, field=None):
+        """Yields (queue_id, field, previous_value, current_value) for the last update
+
+        Fields of queues added by the update are reported with a previous value of
+        None.
+        """
+        for queue_id in self.added:
+            current = self.rows.get(queue_id, None)
+            if current is None:
+                continue
+            fields = [field] if field is not None else current.keys()
+            for added_field in fields:
+                if added_field in current:
+                    yield queue_id, added_field, None, current[added_field]
+
+        for queue_id, previous in self.previous.items():
+            current = self.rows.get(queue_id, None)
+            if current is None:
+                continue
+            if field is not None:
+                if field in previous:
+                    yield queue_id, field, previous[field], current.get(field, None)
+                continue
+            for changed_field, previous_value in previous.items():
+                yield queue_id, changed_field, previous_value, current.get(
+                    changed_field, None
+                )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, queue_id):
+        return queue_id in self.rows
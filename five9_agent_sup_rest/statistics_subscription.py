@@ -0,0 +1,86 @@
+import logging
+
+from five9_agent_sup_rest.config import STATISTICS_SUBSCRIPTION
+
+
+class StatisticsSubscription:
+    """The supervisor statistics the server streams to the socket.
+
+    By default the supervisor socket receives every statistics dataSource, for
+    every skill and with every column, in its 5000 and 5012 events.  Declaring
+    what the handlers consume lets the server leave the rest out, instead of the
+    client reading, decoding and discarding it:
+
+        StatisticsSubscription(
+            data_sources=["ACD_STATUS"],
+            skills=["Sales", "Support"],
+            columns={"ACD_STATUS": ["callsInQueue", "longestQueueTime"]},
+        )
+
+    Skills are given by name or id and resolved with DomainQueues.  apply() sets
+    the view settings (dataSources and columns) and the filter settings (skills)
+    of the client's supervisor session; settings left at None are not sent, so
+    the server keeps its own.
+
+    Experimental: the statistics view and filter settings endpoints and payloads
+    have not been confirmed against the Five9 API reference.  The subscription
+    is only applied when the client is given one, and a subscription the server
+    rejects is logged without failing the session start.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.data_sources = kwargs.get(
+            "data_sources", STATISTICS_SUBSCRIPTION["data_sources"]
+        )
+        self.skills = kwargs.get("skills", STATISTICS_SUBSCRIPTION["skills"])
+        self.columns = kwargs.get("columns", STATISTICS_SUBSCRIPTION["columns"])
+
+    def view_settings(self):
+        """The SetStatisticsViewSettings payload, None when nothing is set"""
+        view_settings = {}
+        if self.data_sources is not None:
+            view_settings["dataSources"] = list(self.data_sources)
+        if self.columns is not None:
+            view_settings["columns"] = {
+                data_source: list(columns)
+                for data_source, columns in self.columns.items()
+            }
+        return view_settings or None
+
+    def filter_settings(self, queues):
+        """The SetStatisticsFilterSettings payload, with skills resolved against
+        queues, the DomainQueues response.  None when no skills are set."""
+        if self.skills is None:
+            return None
+
+        ids = {str(queue["id"]) for queue in queues}
+        ids_by_name = {queue["name"]: str(queue["id"]) for queue in queues}
+        skill_ids = []
+        for skill in self.skills:
+            if str(skill) in ids:
+                skill_ids.append(str(skill))
+            elif skill in ids_by_name:
+                skill_ids.append(ids_by_name[skill])
+            else:
+                raise ValueError(f"Unknown skill in statistics subscription: {skill}")
+        return {"skillIds": skill_ids}
+
+    def apply(self, client):
+        """Sets the statistics settings of the client's supervisor session"""
+        view_settings = self.view_settings()
+        if view_settings is not None:
+            client.supervisor.SetStatisticsViewSettings.invoke(view_settings)
+
+        if self.skills is not None:
+            filter_settings = self.filter_settings(
+                client.supervisor.DomainQueues.invoke()
+            )
+            client.supervisor.SetStatisticsFilterSettings.invoke(filter_settings)
+
+        logging.info(f"Statistics subscription applied: {self}")
+
+    def __repr__(self):
+        return (
+            f"StatisticsSubscription(data_sources={self.data_sources!r}, "
+            f"skills={self.skills!r}, columns={self.columns!r})"
+        )
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+
+
+class Five9EventStream:
+    """Async iterator over the events received by a Five9Socket.
+
+    Use through Five9Socket.stream():
+
+        async with client.supervisor_socket.stream(event_ids={"5012"}) as events:
+            async for event in events:
+                ...
+
+    If the socket is not already running, entering the stream connects it on the
+    running event loop and leaving the stream disconnects it.  If the socket is
+    already running, for example under a Five9SessionManager, the stream only
+    attaches to it.  Dropped connections are reconnected without ending the stream.
+    Iteration ends when the socket stops, gives up reconnecting, or close() is
+    called; a connection error is raised from the iterator.
+
+    Events are put on a bounded queue.  When the consumer falls behind, the socket
+    reader waits for it, which pushes back on the server rather than buffering
+    without limit.
+    """
+
+    _END = object()
+
+    def __init__(self, socket, event_ids=None, max_queue=1000):
+        self.socket = socket
+        self.event_ids = set(event_ids) if event_ids else None
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.run_task = None
+        self.closed = False
+
+    def wants(self, eventId):
+        return self.event_ids is None or eventId in self.event_ids
+
+    async def put(self, event):
+        if not self.closed:
+            await self.queue.put(event)
+
+    def end(self):
+        """Ends iteration once the queued events have been consumed"""
+        self.closed = True
+        try:
+            self.queue.put_nowait(self._END)
+        except asyncio.QueueFull:
+            # the consumer will find the stream closed when it drains the queue
+            pass
+
+    async def __aenter__(self):
+        self.socket.streams.append(self)
+        if not self.socket.running:
+            self.run_task = asyncio.create_task(self.socket.run())
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        if self in self.socket.streams:
+            self.socket.streams.remove(self)
+        # wakes a consumer waiting for the next event, the socket may keep running
+        self.end()
+        if self.run_task is not None:
+            await self.socket.stop()
+            try:
+                await self.run_task
+            except Exception:
+                logging.exception("Error in WebSocket connection.")
+            self.run_task = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            if self.closed and self.queue.empty():
+                break
+            if self.run_task is not None and self.run_task.done() and self.queue.empty():
+                break
+
+            get_task = asyncio.ensure_future(self.queue.get())
+            waiting = {get_task}
+            if self.run_task is not None:
+                waiting.add(self.run_task)
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if not get_task.done():
+                get_task.cancel()
+                continue
+
+            event = get_task.result()
+            if event is self._END:
+                break
+            return event
+
+        if (
+            self.run_task is not None
+            and self.run_task.done()
+            and not self.run_task.cancelled()
+        ):
+            error = self.run_task.exception()
+            if error is not None:
+                raise error
+        raise StopAsyncIteration
@@ -0,0 +1,266 @@
+import logging
+import time
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from five9_agent_sup_rest.config import QUEUE_TIMESERIES
+
+
+class QueueTimeSeries:
+    """Rolling history of ACD_STATUS metrics for every queue, in ring buffers.
+
+    load_snapshot() takes the rows of a 5000 event and apply_delta() the added /
+    updated / removed lists of a 5012 event, as QueueStatisticsStore does.  Each
+    call updates the current values of the queues in its rows and writes the
+    current value of every queue into the sample for its time, so queues an update
+    leaves out carry their value forward.  Updates less than resolution seconds
+    apart are merged into one sample.
+
+    Samples are kept in a (metrics, queues, capacity) float32 array used as a ring
+    buffer, with one array of sample times shared by every series, so memory is
+    fixed at capacity samples per queue and metric whatever the update rate.  Room
+    for queues is doubled when a domain has more than reserved.
+
+    The aggregates are computed for every queue at once, over the last seconds up
+    to the newest sample, and returned as arrays in the order of queue_ids;
+    by_queue() turns one into a dict.  Samples from before a queue was first seen or
+    after it was removed are NaN and left out.  Requires numpy.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if numpy is None:
+            raise ImportError(
+                "QueueTimeSeries requires numpy, "
+                "pip install five9_agent_sup_rest[timeseries]"
+            )
+        self.id_field = kwargs.get("id_field", "id")
+        self.metrics = tuple(kwargs.get("metrics", QUEUE_TIMESERIES["metrics"]))
+        self.resolution = kwargs.get("resolution", QUEUE_TIMESERIES["resolution"])
+        self.capacity = kwargs.get("capacity", QUEUE_TIMESERIES["capacity"])
+        self.clock = kwargs.get("clock", time.time)
+        initial_queues = kwargs.get(
+            "initial_queues", QUEUE_TIMESERIES["initial_queues"]
+        )
+
+        self.metric_index = {metric: index for index, metric in enumerate(self.metrics)}
+        self.queue_index = {}
+        self.queue_ids = []
+        self.current = numpy.full(
+            (len(self.metrics), initial_queues), numpy.nan, dtype=numpy.float32
+        )
+        self.values = numpy.full(
+            (len(self.metrics), initial_queues, self.capacity),
+            numpy.nan,
+            dtype=numpy.float32,
+        )
+        self.times = numpy.full(self.capacity, numpy.nan)
+        # samples where some queue has no value, they are aggregated with NaN masks
+        self.partial = numpy.zeros(self.capacity, dtype=bool)
+        # samples written so far, the newest is at (samples - 1) % capacity
+        self.samples = 0
+
+    @property
+    def nbytes(self):
+        return (
+            self.values.nbytes
+            + self.current.nbytes
+            + self.times.nbytes
+            + self.partial.nbytes
+        )
+
+    def row_for(self, queue_id):
+        row = self.queue_index.get(queue_id, None)
+        if row is None:
+            row = len(self.queue_ids)
+            if row == self.current.shape[1]:
+                self.grow()
+            self.queue_index[queue_id] = row
+            self.queue_ids.append(queue_id)
+            # the new queue has no value in the samples taken so far
+            self.partial[:] = True
+        return row
+
+    def grow(self):
+        queues = self.current.shape[1]
+        self.current = numpy.concatenate(
+            (self.current, numpy.full_like(self.current, numpy.nan)), axis=1
+        )
+        self.values = numpy.concatenate(
+            (self.values, numpy.full_like(self.values, numpy.nan)), axis=1
+        )
+        logging.debug(f"QueueTimeSeries - room for {queues * 2} queues")
+
+    def update_rows(self, rows):
+        rows_by_metric = [([], []) for _ in self.metrics]
+        for row in rows:
+            index = self.row_for(row[self.id_field])
+            for metric_index, metric in enumerate(self.metrics):
+                value = row.get(metric, None)
+                if value is not None:
+                    rows_by_metric[metric_index][0].append(index)
+                    rows_by_metric[metric_index][1].append(value)
+        # one vectorized assignment per metric
+        for metric_index, (indexes, values) in enumerate(rows_by_metric):
+            if indexes:
+                self.current[metric_index, indexes] = values
+
+    def record(self, at=None):
+        """Writes the current value of every queue into the sample for time at"""
+        at = self.clock() if at is None else at
+        newest = (self.samples - 1) % self.capacity
+        if self.samples and at // self.resolution <= self.times[newest] // self.resolution:
+            column = newest
+        else:
+            column = self.samples % self.capacity
+            self.samples += 1
+        current = self.current[:, : len(self.queue_ids)]
+        self.times[column] = at
+        self.values[:, : len(self.queue_ids), column] = current
+        self.partial[column] = numpy.isnan(current).any()
+
+    def load_snapshot(self, rows, at=None):
+        """Replaces the current values with a full snapshot, queues missing from it
+        are treated as removed"""
+        self.current.fill(numpy.nan)
+        self.update_rows(rows)
+        self.record(at)
+
+    def apply_delta(self, delta, at=None):
+        """Applies a statistics update, at is the update's time in epoch seconds"""
+        self.update_rows(delta.get("added", None) or [])
+        self.update_rows(delta.get("updated", None) or [])
+        for row in delta.get("removed", None) or []:
+            queue_id = row[self.id_field] if isinstance(row, dict) else row
+            index = self.queue_index.get(queue_id, None)
+            if index is not None:
+                self.current[:, index] = numpy.nan
+        self.record(at)
+
+    def _span(self, seconds):
+        """Ring position of the oldest sample in the last seconds, and their count"""
+        count = min(self.samples, self.capacity)
+        if count and seconds is not None:
+            newest = self.times[(self.samples - 1) % self.capacity]
+            first = (self.samples - count) % self.capacity
+            ordered = numpy.roll(self.times, -first)[:count]
+            # sample times are ascending, so the window is the last samples
+            count -= int(numpy.searchsorted(ordered, newest - seconds, side="right"))
+        return (self.samples - count) % self.capacity, count
+
+    def _ordered(self, array, first, count):
+        """The count ring positions from first along the last axis, oldest first"""
+        if first + count <= self.capacity:
+            return array[..., first : first + count]
+        wrapped = first + count - self.capacity
+        return numpy.concatenate((array[..., first:], array[..., :wrapped]), axis=-1)
+
+    def _window(self, metric, seconds):
+        first, count = self._span(seconds)
+        series = self.values[self.metric_index[metric], : len(self.queue_ids)]
+        complete = not self._ordered(self.partial, first, count).any()
+        return (
+            self._ordered(self.times, first, count),
+            self._ordered(series, first, count),
+            complete,
+        )
+
+    def window(self, metric, seconds=None):
+        """Returns (times, values) of the samples in the last seconds, oldest first.
+        values is a (queues, samples) array, a view unless the window wraps around
+        the end of the ring."""
+        times, values, complete = self._window(metric, seconds)
+        return times, values
+
+    def latest(self, metric):
+        return self.current[self.metric_index[metric], : len(self.queue_ids)].copy()
+
+    # Windows without NaN, the usual case once every queue has been seen for the
+    # window, are aggregated directly; others mask the NaN samples out.
+
+    def mean(self, metric, seconds=None):
+        times, values, complete = self._window(metric, seconds)
+        if complete and len(times):
+            return values.mean(axis=1, dtype=numpy.float64)
+        valid = ~numpy.isnan(values)
+        totals = numpy.where(valid, values, 0).sum(axis=1, dtype=numpy.float64)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return totals / valid.sum(axis=1)
+
+    def max(self, metric, seconds=None):
+        times, values, complete = self._window(metric, seconds)
+        if not len(times):
+            return numpy.full(values.shape[0], numpy.nan)
+        # fmax skips NaN, and leaves it only for queues without samples
+        return numpy.fmax.reduce(values, axis=1).astype(numpy.float64)
+
+    def min(self, metric, seconds=None):
+        times, values, complete = self._window(metric, seconds)
+        if not len(times):
+            return numpy.full(values.shape[0], numpy.nan)
+        return numpy.fmin.reduce(values, axis=1).astype(numpy.float64)
+
+    def percentile(self, metric, q, seconds=None):
+        times, values, complete = self._window(metric, seconds)
+        if not len(times):
+            return numpy.full(values.shape[0], numpy.nan)
+        if complete:
+            return numpy.percentile(values, q, axis=1).astype(numpy.float64)
+        with warnings.catch_warnings():
+            # queues without samples are NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return numpy.nanpercentile(values, q, axis=1).astype(numpy.float64)
+
+    def slope(self, metric, seconds=None):
+        """Least squares rate of change per second, NaN with fewer than 2 samples"""
+        times, values, complete = self._window(metric, seconds)
+        # centered, so float32 keeps the precision and the products use BLAS
+        x = (times - times.mean()).astype(numpy.float32) if len(times) else times
+        if complete:
+            with numpy.errstate(invalid="ignore", divide="ignore"):
+                slope = (values @ x).astype(numpy.float64) / float(x @ x)
+            if len(times) < 2:
+                slope[:] = numpy.nan
+            return slope
+
+        valid = ~numpy.isnan(values)
+        y = numpy.where(valid, values, 0)
+        validf = valid.astype(numpy.float32)
+        n = valid.sum(axis=1)
+        sx = (validf @ x).astype(numpy.float64)
+        sxx = (validf @ (x * x)).astype(numpy.float64)
+        sy = y.sum(axis=1, dtype=numpy.float64)
+        sxy = (y @ x).astype(numpy.float64)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        slope[n < 2] = numpy.nan
+        return slope
+
+    def ewma(self, metric, halflife, seconds=None):
+        """Exponentially weighted mean, a sample halflife seconds older than the
+        newest counts half as much"""
+        times, values, complete = self._window(metric, seconds)
+        if not len(times):
+            return numpy.full(values.shape[0], numpy.nan)
+        weights = (0.5 ** ((times[-1] - times) / halflife)).astype(numpy.float32)
+        if complete:
+            return (values @ weights).astype(numpy.float64) / float(weights.sum())
+        valid = ~numpy.isnan(values)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return (
+                (numpy.where(valid, values, 0) @ weights).astype(numpy.float64)
+                / (valid.astype(numpy.float32) @ weights)
+            )
+
+    def by_queue(self, values):
+        """Maps an aggregate's values to queue ids"""
+        return dict(zip(self.queue_ids, values.tolist()))
+
+    def __len__(self):
+        return len(self.queue_ids)
+
+    def __contains__(self, queue_id):
+        return queue_id in self.queue_index
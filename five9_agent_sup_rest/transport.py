@@ -0,0 +1,81 @@
+import logging
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from five9_agent_sup_rest.config import HTTP_TRANSPORT
+
+
+class Five9HttpTransport:
+    """Pooled, keep-alive HTTP transport for Five9 REST calls.
+
+    A single transport is owned by each Five9RestClient and shared by every method
+    instance in its agent and supervisor namespaces, so consecutive calls reuse the
+    same TCP/TLS connection to the data center host instead of paying a new
+    handshake per call.  Pass the same transport to several clients to share the
+    connection pool between them.
+
+    Session cookies are never stored on the transport; the Five9 session is carried
+    by the headers on the session configuration, which keeps a shared transport
+    safe to use for several users.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.pool_connections = kwargs.get(
+            "pool_connections", HTTP_TRANSPORT["pool_connections"]
+        )
+        self.pool_maxsize = kwargs.get("pool_maxsize", HTTP_TRANSPORT["pool_maxsize"])
+        self.pool_block = kwargs.get("pool_block", HTTP_TRANSPORT["pool_block"])
+        self.connect_timeout = kwargs.get(
+            "connect_timeout", HTTP_TRANSPORT["connect_timeout"]
+        )
+        self.read_timeout = kwargs.get("read_timeout", HTTP_TRANSPORT["read_timeout"])
+        self.verify = kwargs.get("verify", True)
+
+        self.session = requests.Session()
+        self.session.verify = self.verify
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        logging.debug(
+            f"Five9HttpTransport - pool_maxsize: {self.pool_maxsize}, timeout: {self.timeout}"
+        )
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def send(self, prepared_request, timeout=None):
+        """Sends a prepared request over a pooled connection"""
+        return self.session.send(
+            prepared_request,
+            timeout=timeout if timeout is not None else self.timeout,
+            verify=self.verify,
+        )
+
+    def get(self, url, timeout=None, **kwargs):
+        return self.session.get(
+            url,
+            timeout=timeout if timeout is not None else self.timeout,
+            verify=self.verify,
+            **kwargs,
+        )
+
+    def post(self, url, timeout=None, **kwargs):
+        return self.session.post(
+            url,
+            timeout=timeout if timeout is not None else self.timeout,
+            verify=self.verify,
+            **kwargs,
+        )
+
+    def close(self):
+        self.session.close()
@@ -10,6 +10,11 @@ setup(
     description='A module for interacting with Five9 Supervisor REST API',
     long_description=open('README.md').read(),
     install_requires=requirements,
+    extras_require={
+        "async": ["aiohttp"],
+        "cache": ["cryptography"],
+        "timeseries": ["numpy"],
+    },
     license='MIT',
     classifiers=[
         'License :: OSI Approved :: MIT License',
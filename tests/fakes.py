@@ -0,0 +1,106 @@
+"""Fakes shared by the tests, standing in for the server and the client"""
+import time
+import types
+
+from five9_agent_sup_rest.client import Five9Socket
+from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+from five9_agent_sup_rest.rate_limit import Five9RateLimiter
+from five9_agent_sup_rest.reference_data import ReferenceDataCache
+from five9_agent_sup_rest.retry import RetryPolicy
+
+
+class FakeClock:
+    """A clock that only moves when the test sets now"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSessionConfig:
+    """Session configuration for REST method tests, without a login.
+
+    The transports are the test's own fakes, async_transport defaults to transport.
+    Calls are not retried unless retry_options say otherwise, and
+    refresh_session() replaces the token without a request, counting logins.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.observers = []
+        self.base_api_url = "https://five9.invalid"
+        self.orgId = "1"
+        self.userId = "1"
+        self.farmId = "1"
+        self.tokenId = "token-1"
+        self.logins = 0
+
+        self.transport = kwargs.get("transport", None)
+        self.async_transport = kwargs.get("async_transport", None) or self.transport
+        self.login_state_cache = kwargs.get("login_state_cache", None) or LoginStateCache()
+        self.rate_limiter = Five9RateLimiter()
+        self.reference_data_cache = ReferenceDataCache(
+            ttls=kwargs.get("reference_data_ttl", None),
+            clock=kwargs.get("clock", time.monotonic),
+        )
+        self.retry_policy = RetryPolicy(
+            **kwargs.get("retry_options", {"max_attempts": 1})
+        )
+        self.metrics = kwargs.get("metrics", None) or Five9MetricsRegistry()
+
+    @property
+    def api_header(self):
+        return {"Authorization": f"Bearer-{self.tokenId}"}
+
+    def subscribe_observer(self, observer):
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def refresh_session(self, stale_token):
+        self.logins += 1
+        self.tokenId = f"token-{self.logins + 1}"
+        return True
+
+
+class InMemoryWebSocket:
+    """Yields the given frames as a connected websocket would"""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+
+
+def make_socket(custom_socket_handlers=(), name="socket"):
+    """A supervisor Five9Socket with the client attributes it reads, no login"""
+    client = types.SimpleNamespace(
+        session_configuration=types.SimpleNamespace(
+            host="127.0.0.1", port=443, username=name
+        ),
+        socket_json_loads=None,
+        socket_reconnect_options={},
+        socket_dispatch_options={},
+        socket_metrics_options={},
+        metrics=Five9MetricsRegistry(),
+        login_state_cache=LoginStateCache(),
+        custom_socket_handlers=list(custom_socket_handlers),
+    )
+    client.socket_handler_registry = SocketHandlerRegistry(
+        client, client.custom_socket_handlers
+    )
+    return Five9Socket(client, "supervisor", name)
+
+
+async def read(socket, frames):
+    """Handles the frames as received by the socket, and waits for their handlers"""
+    if socket.handlers is None:
+        socket.build_handlers()
+    socket.dispatcher = Five9EventDispatcher(metrics=socket.metrics)
+    await socket.handle_messages(InMemoryWebSocket(frames))
+    await socket.dispatcher.close(drain=True)
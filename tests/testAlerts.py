@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.alerts import AlertChange, AlertReconciler
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.standin import Five9StandIn
+
+
+CURRENT = [
+    {"id": "1", "name": "long-wait", "threshold": 60},
+    {"id": "2", "name": "abandons", "threshold": 5},
+    {"id": "3", "name": "retired", "threshold": 1},
+]
+
+
+class TestAlertReconcilerDiff(unittest.TestCase):
+    def setUp(self):
+        self.reconciler = AlertReconciler(client=None)
+
+    def changes_by_action(self, changes):
+        return {
+            action: sorted(change.key for change in changes if change.action == action)
+            for action in ("create", "update", "delete")
+        }
+
+    def test_minimal_diff(self):
+        desired = [
+            {"name": "long-wait", "threshold": 60},
+            {"name": "abandons", "threshold": 10},
+            {"name": "new", "threshold": 3},
+        ]
+        changes = self.reconciler.diff(CURRENT, desired)
+
+        self.assertEqual(
+            self.changes_by_action(changes),
+            {"create": ["new"], "update": ["abandons"], "delete": ["retired"]},
+        )
+        update = next(change for change in changes if change.action == "update")
+        self.assertEqual(update.alert_id, "2")
+
+    def test_in_sync_set_has_no_changes(self):
+        desired = [{"name": alert["name"], "threshold": alert["threshold"]} for alert in CURRENT]
+        self.assertEqual(self.reconciler.diff(CURRENT, desired), [])
+
+    def test_keep_missing_and_duplicates(self):
+        reconciler = AlertReconciler(client=None, delete_missing=False)
+        self.assertEqual(reconciler.diff(CURRENT, []), [])
+
+        duplicate = CURRENT + [{"id": "4", "name": "abandons", "threshold": 5}]
+        changes = self.reconciler.diff(duplicate, [{"name": "abandons", "threshold": 5}])
+        self.assertEqual(
+            sorted(change.alert_id for change in changes if change.action == "delete"),
+            ["1", "3", "4"],
+        )
+
+        with self.assertRaises(ValueError):
+            self.reconciler.diff(CURRENT, [{"name": "x"}, {"name": "x"}])
+
+
+
+class TestAlertReconcilerSession(unittest.TestCase):
+    """reconcile() against the stand-in, while the client's async transport is in
+    use on another event loop, as it is by socket handlers"""
+
+    def setUp(self):
+        self.standin = Five9StandIn().__enter__()
+        self.addCleanup(self.standin.__exit__, None, None, None)
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.client = Five9RestClient(
+            username="alerts", password="x", **self.standin.client_options()
+        )
+        self.addCleanup(self.client.close)
+
+        self.loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.loop.call_soon_threadsafe, self.loop.stop)
+        self.addCleanup(self.on_loop, self.client.aclose())
+
+    def on_loop(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def test_reconcile_leaves_the_client_transport_open(self):
+        self.client.initialize_supervisor_session()
+        get_alerts = self.client.supervisor.GetAlerts
+        self.assertEqual(self.on_loop(get_alerts.ainvoke()), [])
+        session = self.client.async_transport.session
+
+        desired = [{"name": "long-wait", "threshold": 60}, {"name": "abandons", "threshold": 5}]
+        results = AlertReconciler(self.client).reconcile(desired)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertIs(self.client.async_transport.session, session)
+        self.assertFalse(session.closed)
+        self.assertEqual(
+            sorted(alert["name"] for alert in self.on_loop(get_alerts.ainvoke())),
+            ["abandons", "long-wait"],
+        )
+
+    def test_updates_keep_the_fields_that_are_not_desired(self):
+        self.client.initialize_supervisor_session()
+        self.standin.alerts["100"] = {
+            "id": "100", "name": "long-wait", "threshold": 60, "enabled": True
+        }
+
+        results = AlertReconciler(self.client).reconcile(
+            [{"name": "long-wait", "threshold": 30}]
+        )
+
+        self.assertEqual([result.change.action for result in results], ["update"])
+        self.assertTrue(results[0].ok)
+        self.assertEqual(
+            self.standin.alerts["100"],
+            {"id": "100", "name": "long-wait", "threshold": 30, "enabled": True},
+        )
+        # sent through ainvoke()
+        self.assertEqual(self.client.supervisor.UpdateAlert.call_count, 1)
+
+    def test_a_rejected_change_reports_its_status(self):
+        self.client.initialize_supervisor_session()
+        change = AlertChange("delete", "gone", "999")
+
+        result = self.on_loop(AlertReconciler(self.client).apply_change(change))
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
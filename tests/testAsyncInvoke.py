@@ -0,0 +1,109 @@
+import threading
+import types
+import unittest
+
+from five9_agent_sup_rest.methods.base import SupervisorRestMethod
+from five9_agent_sup_rest.methods.supervisor_methods import CreateAlert, GetAlerts
+
+from tests.fakes import FakeSessionConfig
+
+
+def response(status_code=200, body=None):
+    return types.SimpleNamespace(
+        status_code=status_code,
+        headers={},
+        text="",
+        content=b"[]",
+        request_size=0,
+        json=lambda: body,
+    )
+
+
+class RecordingAsyncTransport:
+    """Answers every request with the given body and records how it was sent"""
+
+    def __init__(self, body=None):
+        self.body = body
+        self.requests = []
+
+    async def send(self, method, url, **kwargs):
+        self.requests.append({"method": method, "url": url, **kwargs})
+        return response(body=self.body)
+
+
+class RecordingTransport:
+    def __init__(self, body=None):
+        self.body = body
+        self.requests = []
+        self.threads = []
+
+    def send(self, prepared_request, timeout=None):
+        self.requests.append(prepared_request)
+        self.threads.append(threading.current_thread())
+        return response(body=self.body)
+
+
+class OriginalStyleGetAlertByID(SupervisorRestMethod):
+    """Written against the original pattern, setting method and path in invoke()"""
+
+    def invoke(self, alert_id):
+        self.method = "GET"
+        self.path = f"/alerts/{alert_id}"
+        super().invoke()
+        return self.response.json()
+
+
+class TestNativeAinvoke(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.transport = RecordingAsyncTransport(body=[{"id": "1"}])
+        self.config = FakeSessionConfig(async_transport=self.transport)
+
+    async def test_builds_and_sends_the_request(self):
+        method = CreateAlert(self.config)
+        self.assertEqual(await method.ainvoke({"name": "long-wait"}), [{"id": "1"}])
+        request = self.transport.requests[0]
+        self.assertEqual(request["method"], "POST")
+        self.assertEqual(request["url"], "https://five9.invalid/supsvcs/rs/svc/alerts")
+        self.assertEqual(request["payload"], {"name": "long-wait"})
+        self.assertEqual(request["headers"]["Authorization"], "Bearer-token-1")
+        self.assertEqual(method.call_count, 1)
+
+    async def test_timeout_is_passed_to_the_transport(self):
+        method = GetAlerts(self.config)
+        await method.ainvoke()
+        await method.ainvoke(timeout=1.5)
+
+        self.assertEqual([request["timeout"] for request in self.transport.requests], [None, 1.5])
+        # reserved for ainvoke(), not passed to build_request()
+        self.assertIsNone(self.transport.requests[1]["payload"])
+
+    async def test_transport_replaces_the_session_transport(self):
+        other = RecordingAsyncTransport(body=[])
+        self.assertEqual(await GetAlerts(self.config).ainvoke(transport=other), [])
+        self.assertEqual(len(other.requests), 1)
+        self.assertEqual(self.transport.requests, [])
+
+
+class TestOriginalStyleAinvoke(unittest.IsolatedAsyncioTestCase):
+    async def test_invoke_runs_in_a_worker_thread(self):
+        transport = RecordingTransport(body={"id": "7"})
+        config = FakeSessionConfig(transport=transport, async_transport=RecordingAsyncTransport())
+        method = OriginalStyleGetAlertByID(config)
+
+        self.assertEqual(await method.ainvoke("7"), {"id": "7"})
+        self.assertEqual(method.call_count, 1)
+        self.assertEqual(transport.requests[0].url, "https://five9.invalid/supsvcs/rs/svc/alerts/7")
+        # sent with the blocking transport, off the event loop's thread
+        self.assertIsNot(transport.threads[0], threading.current_thread())
+        self.assertEqual(config.async_transport.requests, [])
+
+    async def test_transport_is_not_passed_to_invoke(self):
+        transport = RecordingTransport(body={"id": "7"})
+        method = OriginalStyleGetAlertByID(FakeSessionConfig(transport=transport))
+        self.assertEqual(
+            await method.ainvoke("7", transport=RecordingAsyncTransport()), {"id": "7"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
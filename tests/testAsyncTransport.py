@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import unittest
+
+from five9_agent_sup_rest.async_transport import Five9AsyncHttpTransport
+
+from benchmarks.standin import StandInServer
+
+
+class TestFive9AsyncHttpTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(use_tls=False).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__()
+
+    def setUp(self):
+        self.transport = Five9AsyncHttpTransport()
+        self.addCleanup(asyncio.run, self.transport.close())
+
+    async def send(self):
+        response = await self.transport.send("GET", f"{self.server.base_url}/supsvcs/rs/svc/alerts")
+        return response.status_code
+
+    def test_session_of_a_closed_loop_is_closed(self):
+        self.assertEqual(asyncio.run(self.send()), 200)
+        first = self.transport.session
+
+        self.assertEqual(asyncio.run(self.send()), 200)
+        self.assertIsNot(self.transport.session, first)
+        self.assertTrue(first.closed)
+
+    def test_session_of_a_running_loop_is_closed_on_that_loop(self):
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        self.addCleanup(other_loop.close)
+        self.addCleanup(thread.join)
+        self.addCleanup(other_loop.call_soon_threadsafe, other_loop.stop)
+
+        self.assertEqual(asyncio.run_coroutine_threadsafe(self.send(), other_loop).result(), 200)
+        first = self.transport.session
+
+        self.assertEqual(asyncio.run(self.send()), 200)
+        self.assertIsNot(self.transport.session, first)
+        # closed by a task on the other loop
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), other_loop).result()
+        self.assertTrue(first.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+
+import unittest
+
+from five9_agent_sup_rest.decoding import Five9FrameDecoder, LazyEvent, frame_size
+
+
+FRAME = json.dumps(
+    {
+        "context": {"eventId": "5012", "eventReason": "UPDATED"},
+        "payLoad": [{"dataSource": "ACD_STATUS", "updated": []}],
+    }
+)
+
+
+class TestFrameDecoder(unittest.TestCase):
+    def setUp(self):
+        self.decoder = Five9FrameDecoder(loads=json.loads)
+
+    def test_peek_event_id_without_decoding(self):
+        self.assertEqual(self.decoder.peek_event_id(FRAME), "5012")
+        self.assertEqual(self.decoder.peek_event_id('{"context": {"eventId": 70}}'), "70")
+        self.assertIsNone(self.decoder.peek_event_id('{"pong": true}'))
+
+    def test_peek_reads_the_context_not_the_payload(self):
+        frame = json.dumps(
+            {
+                "payLoad": [{"eventId": "99", "queue": "sales"}],
+                "context": {"eventReason": "UPDATED", "eventId": "5012"},
+            }
+        )
+        self.assertEqual(self.decoder.peek_event_id(frame), "5012")
+
+    def test_peek_gives_up_past_the_start_of_the_frame(self):
+        frame = json.dumps(
+            {"payLoad": [{"eventId": "99", "data": "x" * 2000}], "context": {"eventId": "5012"}}
+        )
+        self.assertIsNone(self.decoder.peek_event_id(frame))
+        # and the decoded fallback gives the same string eventId
+        self.assertEqual(self.decoder.event_id(self.decoder.decode(frame)), "5012")
+
+    def test_numeric_event_ids_are_strings_on_both_paths(self):
+        frame = '{"context": {"eventId": 70}}'
+        self.assertEqual(self.decoder.peek_event_id(frame), "70")
+        self.assertEqual(self.decoder.event_id(self.decoder.decode(frame)), "70")
+
+    def test_frame_size_counts_utf8_bytes(self):
+        self.assertEqual(frame_size(FRAME), len(FRAME))
+        frame = json.dumps({"payLoad": {"name": "Soporte técnico"}}, ensure_ascii=False)
+        self.assertEqual(frame_size(frame), len(frame) + 1)
+        self.assertEqual(frame_size(frame.encode()), len(frame) + 1)
+
+    def test_lazy_event_decodes_on_first_access(self):
+        event = self.decoder.lazy(FRAME, "5012")
+        self.assertIsInstance(event, LazyEvent)
+        self.assertFalse(event.is_decoded)
+        self.assertEqual(event.eventId, "5012")
+
+        self.assertEqual(event["context"]["eventReason"], "UPDATED")
+        self.assertTrue(event.is_decoded)
+        self.assertEqual(dict(event), json.loads(FRAME))
+
+    def test_default_backend_decodes_the_same_result(self):
+        self.assertEqual(Five9FrameDecoder().decode(FRAME), json.loads(FRAME))
@@ -0,0 +1,58 @@
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.methods.default_socket_handlers import DefaultEventHandler1002
+
+from benchmarks.standin import Five9StandIn
+
+
+class TestDefaultEventHandler1002(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = Five9StandIn().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.__exit__(None, None, None)
+
+    def setUp(self):
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        # a user of its own per test, the stand-in keeps login states by user
+        self.client = Five9RestClient(
+            username=self.id(), password="x", **self.standin.client_options()
+        )
+        self.addAsyncCleanup(self.client.aclose)
+        self.handler = DefaultEventHandler1002(client=self.client)
+
+    def migration_event(self, host):
+        return {
+            "context": {"eventId": "1002", "eventReason": "UPDATED"},
+            "payLoad": {
+                "dataCenters": [{"apiUrls": [{"host": host, "port": self.standin.port}]}]
+            },
+        }
+
+    async def test_migration_applies_the_metadata_and_starts_the_session(self):
+        config = self.client.session_configuration
+        user_id = config.userId
+
+        result = await self.handler.handle(self.migration_event("localhost"))
+
+        self.assertEqual(result, "reconnect")
+        self.assertEqual(config.host, "localhost")
+        self.assertEqual(config.base_api_url, f"https://localhost:{self.standin.port}")
+        # the session keeps its token
+        self.assertEqual(config.userId, user_id)
+        self.assertEqual(self.standin.login_states[user_id], "WORKING")
+
+    async def test_a_working_session_is_not_reconnected(self):
+        await self.client.supervisor.SupervisorSessionStart.ainvoke()
+        result = await self.handler.handle(self.migration_event(self.standin.host))
+        self.assertIsNone(result)
+
+
+if __name__ == "__main__":
+    unittest.main()
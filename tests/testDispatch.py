@@ -0,0 +1,92 @@
+import asyncio
+
+import unittest
+
+from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+from five9_agent_sup_rest.methods.default_socket_handlers import SocketEventHandler
+
+
+def make_event(eventId, sequence):
+    return {"context": {"eventId": eventId}, "payLoad": sequence}
+
+
+class RecordingHandler(SocketEventHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def handle(self, event):
+        await self.release.wait()
+        self.received.append(event["payLoad"])
+
+
+class TestEventDispatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_events_stay_in_order_per_event_id(self):
+        dispatcher = Five9EventDispatcher()
+        handler = RecordingHandler(eventId="5012")
+        for sequence in range(100):
+            await dispatcher.dispatch("5012", handler, make_event("5012", sequence))
+        await dispatcher.close(drain=True)
+        self.assertEqual(handler.received, list(range(100)))
+
+    async def test_slow_handler_does_not_block_other_event_ids(self):
+        dispatcher = Five9EventDispatcher(queue_size=10, overflow_policy="spill")
+        slow = RecordingHandler(eventId="5012")
+        slow.release.clear()
+        fast = RecordingHandler(eventId="1202")
+
+        for sequence in range(50):
+            await dispatcher.dispatch("5012", slow, make_event("5012", sequence))
+        await dispatcher.dispatch("1202", fast, make_event("1202", "pong"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        self.assertEqual(fast.received, ["pong"])
+        self.assertEqual(slow.received, [])
+        self.assertEqual(dispatcher.stats()["5012"]["depth"], 49)
+
+        slow.release.set()
+        await dispatcher.close(drain=True)
+        self.assertEqual(slow.received, list(range(50)))
+
+    async def test_drop_oldest_keeps_newest_events(self):
+        dispatcher = Five9EventDispatcher(queue_size=5, overflow_policy="drop_oldest")
+        handler = RecordingHandler(eventId="5012")
+        handler.release.clear()
+
+        for sequence in range(20):
+            await dispatcher.dispatch("5012", handler, make_event("5012", sequence))
+        await asyncio.sleep(0)
+
+        handler.release.set()
+        await dispatcher.join()
+        self.assertGreater(dispatcher.stats()["5012"]["dropped"], 0)
+        await dispatcher.close()
+        self.assertEqual(handler.received[-5:], list(range(15, 20)))
+
+    async def test_handler_exception_does_not_stop_worker(self):
+        class FailingHandler(RecordingHandler):
+            async def handle(self, event):
+                if event["payLoad"] == 1:
+                    raise ValueError("boom")
+                await super().handle(event)
+
+        dispatcher = Five9EventDispatcher()
+        handler = FailingHandler(eventId="5012")
+        for sequence in range(3):
+            await dispatcher.dispatch("5012", handler, make_event("5012", sequence))
+        with self.assertLogs(level="ERROR"):
+            await dispatcher.join()
+        await dispatcher.close()
+        self.assertEqual(handler.received, [0, 2])
+
+    def test_unknown_overflow_policy_is_rejected(self):
+        dispatcher = Five9EventDispatcher(overflow_policy="ignore")
+
+        async def dispatch():
+            await dispatcher.dispatch("1", SocketEventHandler(eventId="1"), {})
+
+        with self.assertRaises(ValueError):
+            asyncio.run(dispatch())
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import unittest
+
+from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+from five9_agent_sup_rest.event_bus import Five9EventBus, event_data_sources
+from five9_agent_sup_rest.exceptions import Five9SubscriberError
+from five9_agent_sup_rest.methods.default_socket_handlers import SocketEventHandler
+
+from tests.fakes import InMemoryWebSocket, make_socket, read
+
+
+def statistics_frame(*data_sources):
+    return json.dumps(
+        {
+            "context": {"eventId": "5012"},
+            "payLoad": [{"dataSource": source, "updated": []} for source in data_sources],
+        }
+    )
+
+
+class QueueHandler(SocketEventHandler):
+    eventId = "5012"
+    data_sources = ("ACD_STATUS",)
+    priority = 10
+    received = []
+
+    async def handle(self, event):
+        QueueHandler.received.append(("queues", event))
+
+
+class AgentHandler(SocketEventHandler):
+    eventId = "5012"
+    data_sources = ("AGENT_STATE",)
+    received = []
+
+    async def handle(self, event):
+        QueueHandler.received.append(("agents", event))
+
+
+class TestFive9EventBus(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        QueueHandler.received = []
+
+    async def test_every_custom_handler_receives_the_event_in_priority_order(self):
+        socket = make_socket([AgentHandler, QueueHandler])
+        await read(socket, [statistics_frame("ACD_STATUS", "AGENT_STATE")])
+
+        self.assertEqual([name for name, _ in QueueHandler.received], ["queues", "agents"])
+        # one decoded event, shared rather than copied
+        self.assertIs(QueueHandler.received[0][1], QueueHandler.received[1][1])
+
+    async def test_data_source_filters(self):
+        socket = make_socket([AgentHandler, QueueHandler])
+        await read(socket, [statistics_frame("ACD_STATUS"), statistics_frame("AGENT_STATE")])
+
+        self.assertEqual([name for name, _ in QueueHandler.received], ["queues", "agents"])
+        stats = socket.bus.stats()
+        queue_stats = next(s for name, s in stats.items() if name.startswith("QueueHandler"))
+        self.assertEqual((queue_stats["delivered"], queue_stats["filtered"]), (1, 1))
+
+    async def test_frames_are_routed_by_the_context_event_id(self):
+        socket = make_socket([QueueHandler])
+        late_context = json.dumps(
+            {
+                "payLoad": [{"dataSource": "ACD_STATUS", "eventId": "1", "data": "x" * 2000}],
+                "context": {"eventId": 5012, "queue": "Soporte técnico"},
+            },
+            ensure_ascii=False,
+        )
+        await read(socket, [late_context])
+
+        self.assertEqual([name for name, _ in QueueHandler.received], ["queues"])
+        # bytes as sent, not characters
+        self.assertEqual(
+            socket.metrics.snapshot()["events"]["5012"]["bytes_received"],
+            len(late_context.encode()),
+        )
+
+    async def test_a_failing_subscriber_does_not_stop_the_others(self):
+        socket = make_socket()
+        received = []
+
+        async def failing(event):
+            raise ValueError("bad subscriber")
+
+        async def working(event):
+            received.append(event["payLoad"])
+
+        failing_subscription = socket.subscribe("5012", failing, priority=1)
+        socket.subscribe("5012", working)
+        with self.assertLogs(level="ERROR") as logs:
+            await read(socket, [statistics_frame("ACD_STATUS")] * 3)
+
+        self.assertEqual(len(received), 3)
+        self.assertEqual(failing_subscription.failed, 3)
+        self.assertIn("Five9SubscriberError", "\n".join(logs.output))
+        self.assertEqual(socket.metrics.snapshot()["events"]["5012"]["failed"], 3)
+
+    async def test_a_failing_subscriber_does_not_drop_a_reconnect(self):
+        socket = make_socket()
+        results = []
+
+        async def failing(event):
+            raise ValueError("bad subscriber")
+
+        async def reconnecting(event):
+            return "reconnect"
+
+        async def on_result(handler, event, result):
+            results.append(result)
+
+        socket.subscribe("5012", failing, priority=1)
+        socket.subscribe("5012", reconnecting)
+        socket.build_handlers()
+        socket.dispatcher = Five9EventDispatcher(on_result=on_result, metrics=socket.metrics)
+        with self.assertLogs(level="ERROR"):
+            await socket.handle_messages(InMemoryWebSocket([statistics_frame("A")]))
+            await socket.dispatcher.close(drain=True)
+
+        self.assertEqual(results, ["reconnect"])
+        self.assertEqual(socket.metrics.snapshot()["events"]["5012"]["failed"], 1)
+
+    async def test_predicate_and_unsubscribe(self):
+        socket = make_socket()
+        received = []
+
+        async def working(event):
+            received.append(event)
+
+        subscription = socket.subscribe(
+            "5012", working, predicate=lambda event: len(event["payLoad"]) > 1
+        )
+        await read(socket, [statistics_frame("ACD_STATUS"), statistics_frame("A", "B")])
+        self.assertEqual(len(received), 1)
+
+        socket.unsubscribe(subscription)
+        await read(socket, [statistics_frame("A", "B")])
+        self.assertEqual(len(received), 1)
+
+    async def test_isolated_subscriber_gets_its_own_queue(self):
+        socket = make_socket()
+        release = asyncio.Event()
+        fast = []
+
+        async def slow(event):
+            await release.wait()
+
+        async def quick(event):
+            fast.append(event)
+
+        socket.subscribe("5012", slow, isolated=True, name="slow")
+        socket.subscribe("5012", quick)
+
+        socket.dispatcher = Five9EventDispatcher(metrics=socket.metrics)
+        await socket.handle_messages(InMemoryWebSocket([statistics_frame("A")] * 5))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # the shared subscribers are not held up by the slow one
+        self.assertEqual(len(fast), 5)
+        self.assertEqual(socket.dispatcher.stats()["5012:slow"]["depth"], 4)
+        release.set()
+        await socket.dispatcher.close(drain=True)
+
+    async def test_unsubscribed_event_ids_go_to_the_fallback(self):
+        socket = make_socket()
+        socket.build_handlers()
+        self.assertIs(socket.bus.route("9999"), socket.bus.fallback)
+        self.assertTrue(socket.bus.fallback.lazy_decode)
+
+
+class TestEventDataSources(unittest.TestCase):
+    def test_data_sources(self):
+        event = json.loads(statistics_frame("ACD_STATUS", "AGENT_STATE"))
+        self.assertEqual(event_data_sources(event), {"ACD_STATUS", "AGENT_STATE"})
+        self.assertEqual(event_data_sources({"payLoad": "pong"}), frozenset())
+
+    def test_subscriber_error_lists_failures(self):
+        bus = Five9EventBus()
+
+        async def failing(event):
+            raise KeyError("x")
+
+        subscription = bus.subscribe("5012", failing, name="failing")
+        group = bus.route("5012").targets[0][1]
+        with self.assertRaises(Five9SubscriberError) as raised:
+            asyncio.run(group.handle({"payLoad": []}))
+        self.assertEqual(raised.exception.failures[0][0], subscription)
+        self.assertIn("failing", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import types
+import unittest
+
+from five9_agent_sup_rest.handler_registry import FALLBACK_EVENT_ID
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.methods.default_socket_handlers import SocketEventHandler
+
+
+class CountingPongHandler(SocketEventHandler):
+    """Replaces the default 1202 handler and counts its instances"""
+
+    eventId = "1202"
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingPongHandler.created += 1
+
+
+def socket(context):
+    return types.SimpleNamespace(context=context)
+
+
+class TestSocketHandlerRegistry(unittest.TestCase):
+    def setUp(self):
+        CountingPongHandler.created = 0
+        self.registry = SocketHandlerRegistry(
+            client=None, custom_handlers=[CountingPongHandler, object]
+        )
+
+    def test_custom_handler_replaces_default(self):
+        self.assertEqual(self.registry.handler_classes["1202"], [CountingPongHandler])
+        self.assertIn("1010", self.registry.handler_classes)
+        self.assertNotIn(None, self.registry.handler_classes)
+
+    def test_custom_handlers_for_one_event_id_are_all_kept(self):
+        class SecondPongHandler(SocketEventHandler):
+            eventId = "1202"
+
+        self.registry.register(SecondPongHandler)
+        self.assertEqual(
+            self.registry.handler_classes["1202"],
+            [CountingPongHandler, SecondPongHandler],
+        )
+
+    def test_handlers_are_created_once_per_context(self):
+        first = self.registry.table_for(socket("supervisor"))
+        # a reconnect, or a new socket object for the same context
+        reconnected_socket = socket("supervisor")
+        again = self.registry.table_for(reconnected_socket)
+
+        self.assertIs(first["1202"][0], again["1202"][0])
+        self.assertIs(again["1202"][0].socket, reconnected_socket)
+        self.assertEqual(CountingPongHandler.created, 1)
+
+        self.registry.table_for(socket("agent"))
+        self.assertEqual(CountingPongHandler.created, 2)
+
+    def test_fallback_handler_is_shared_and_lazy(self):
+        self.assertEqual(self.registry.fallback.eventId, FALLBACK_EVENT_ID)
+        self.assertTrue(self.registry.fallback.lazy_decode)
+        self.assertNotIn(FALLBACK_EVENT_ID, self.registry.table_for(socket("supervisor")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import types
+import unittest
+
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.methods.default_socket_handlers import (
+    DefaultEventHandlerLoginStateUpdated,
+)
+from five9_agent_sup_rest.methods.supervisor_methods import GetAlerts, LogOut
+
+from tests.fakes import FakeClock, FakeSessionConfig
+
+
+class FakeTransport:
+    def send(self, prepared_request, timeout=None):
+        return types.SimpleNamespace(
+            status_code=200, headers={}, text="", content=b"[]", json=lambda: []
+        )
+
+
+class TestLoginStateCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LoginStateCache(ttl=30, clock=self.clock)
+
+    def test_entries_expire_after_the_ttl(self):
+        self.assertIsNone(self.cache.get("supervisor"))
+        self.cache.set("supervisor", "WORKING")
+
+        self.clock.now = 30
+        self.assertEqual(self.cache.get("supervisor"), "WORKING")
+        self.clock.now = 30.1
+        self.assertIsNone(self.cache.get("supervisor"))
+
+    def test_attached_entries_do_not_expire_until_detached(self):
+        self.cache.set("supervisor", "WORKING")
+        self.cache.set("agent", "SELECT_STATION")
+        self.cache.attach("supervisor")
+
+        self.clock.now = 300
+        self.assertEqual(self.cache.get("supervisor"), "WORKING")
+        self.assertIsNone(self.cache.get("agent"))
+
+        # back to the ttl, counted from the last update
+        self.cache.detach("supervisor")
+        self.assertIsNone(self.cache.get("supervisor"))
+        self.cache.set("supervisor", "WORKING")
+        self.assertEqual(self.cache.get("supervisor"), "WORKING")
+
+    def test_invalidate(self):
+        self.cache.set("supervisor", "WORKING")
+        self.cache.set("agent", "WORKING")
+        self.cache.invalidate("agent")
+        self.assertEqual(self.cache.get("supervisor"), "WORKING")
+        self.assertIsNone(self.cache.get("agent"))
+
+        self.cache.attach("supervisor")
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get("supervisor"))
+
+    def test_methods_that_change_the_login_state_invalidate(self):
+        config = FakeSessionConfig(
+            transport=FakeTransport(), login_state_cache=self.cache
+        )
+        self.cache.set("supervisor", "WORKING")
+
+        GetAlerts(config).invoke()
+        self.assertEqual(self.cache.get("supervisor"), "WORKING")
+        LogOut(config).invoke()
+        self.assertIsNone(self.cache.get("supervisor"))
+
+
+class TestLoginStateUpdatedHandler(unittest.IsolatedAsyncioTestCase):
+    async def test_events_update_the_socket_user_type(self):
+        cache = LoginStateCache(clock=FakeClock())
+        handler = DefaultEventHandlerLoginStateUpdated(
+            client=types.SimpleNamespace(login_state_cache=cache),
+            socket=types.SimpleNamespace(context="agent"),
+        )
+        await handler.handle({"context": {"eventId": "1"}, "payLoad": {"loginState": "WORKING"}})
+        await handler.handle({"context": {"eventId": "1"}, "payLoad": {}})
+
+        self.assertEqual(cache.get("agent"), "WORKING")
+        self.assertIsNone(cache.get("supervisor"))
+
+
+if __name__ == "__main__":
+    unittest.main()
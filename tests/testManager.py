@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.async_transport import Five9AsyncHttpTransport
+from five9_agent_sup_rest.manager import Five9SessionManager
+
+from benchmarks.standin import Five9StandIn
+
+
+class TestFive9SessionManager(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.standin = Five9StandIn().__enter__()
+        self.addCleanup(self.standin.__exit__, None, None, None)
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    async def asyncSetUp(self):
+        self.manager = Five9SessionManager(**self.standin.manager_options())
+        self.supervisor = await self.manager.add_session(
+            "supervisor", username="supervisor", password="x"
+        )
+        self.agent = await self.manager.add_session(
+            "agent", contexts=("agent",), username="agent", password="x"
+        )
+        self.assertTrue(await asyncio.wait_for(self.manager.wait_connected(), 10))
+
+    async def asyncTearDown(self):
+        await self.manager.close(logout=False)
+
+    async def test_add_session(self):
+        health = self.manager.health()
+        self.assertEqual(set(health), {"supervisor", "agent"})
+        self.assertEqual(set(health["agent"]["sockets"]), {"agent"})
+        self.assertTrue(health["supervisor"]["sockets"]["supervisor"]["connected"])
+        # the sessions share the manager's transports
+        self.assertIs(self.supervisor.client.transport, self.agent.client.transport)
+
+        with self.assertRaises(ValueError):
+            await self.manager.add_session("agent", username="agent", password="x")
+
+    async def test_remove_session_logs_out_by_user_type(self):
+        token = self.agent.client.session_configuration.tokenId
+        session = await self.manager.remove_session("agent")
+
+        self.assertIs(session, self.agent)
+        self.assertNotIn("agent", self.manager.sessions)
+        self.assertTrue(all(task.done() for task in session.tasks.values()))
+        self.assertEqual(self.standin.logouts, ["appsvcs"])
+        self.assertNotIn(token, self.standin.valid_tokens)
+        # the other session keeps running
+        self.assertTrue(self.manager.health()["supervisor"]["healthy"])
+
+    async def test_close_removes_every_session(self):
+        sessions = [self.supervisor, self.agent]
+        await self.manager.close()
+
+        self.assertEqual(self.manager.sessions, {})
+        for session in sessions:
+            self.assertTrue(all(task.done() for task in session.tasks.values()))
+        self.assertEqual(sorted(self.standin.logouts), ["appsvcs", "supsvcs"])
+        self.assertIsNone(self.manager.async_transport.session)
+
+    async def test_close_leaves_transports_passed_in_open(self):
+        async_transport = Five9AsyncHttpTransport(verify=False)
+        self.addAsyncCleanup(async_transport.close)
+        options = self.standin.manager_options()
+        del options["async_transport_options"]
+        manager = Five9SessionManager(async_transport=async_transport, **options)
+        self.assertTrue(manager.owns_transport)
+        self.assertFalse(manager.owns_async_transport)
+
+        session = await manager.add_session(
+            "caller", contexts=(), username="caller", password="x"
+        )
+        self.assertEqual(await session.client.supervisor.GetAlerts.ainvoke(), [])
+        await manager.close(logout=False)
+
+        self.assertIsNotNone(async_transport.session)
+        self.assertFalse(async_transport.session.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import types
+import unittest
+import urllib.request
+
+import requests
+
+from five9_agent_sup_rest.exceptions import Five9RequestError
+from five9_agent_sup_rest.methods.supervisor_methods import CreateAlert, GetAlerts
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+
+from tests.fakes import FakeSessionConfig
+
+
+class FakeTransport:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    def send(self, prepared_request, timeout=None):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def response(status_code, content=b"[]"):
+    return types.SimpleNamespace(
+        status_code=status_code, headers={}, text="", content=content, json=lambda: []
+    )
+
+
+class TestFive9MetricsRegistry(unittest.TestCase):
+    def test_record_and_snapshot(self):
+        metrics = Five9MetricsRegistry(latency_buckets=(0.1, 1))
+        metrics.record("Supervisor:GetAlerts", 200, 0.05, 0, 100)
+        metrics.record("Supervisor:GetAlerts", 503, 0.5, 0, 20)
+        metrics.record("Supervisor:GetAlerts", None, 3, 0, 0, TimeoutError())
+
+        snapshot = metrics.snapshot()["Supervisor:GetAlerts"]
+        self.assertEqual(snapshot["requests"], 3)
+        self.assertEqual(snapshot["statuses"], {"2xx": 1, "5xx": 1})
+        self.assertEqual(snapshot["errors"], {"TimeoutError": 1})
+        self.assertEqual(
+            snapshot["latency"]["buckets"], {0.1: 1, 1: 1, float("inf"): 1}
+        )
+        self.assertEqual(snapshot["latency"]["p50"], 1)
+        self.assertEqual(snapshot["bytes_in"], 120)
+
+    def test_exposition_buckets_are_cumulative(self):
+        metrics = Five9MetricsRegistry(latency_buckets=(0.1, 1))
+        metrics.record("Supervisor:GetAlerts", 200, 0.05)
+        metrics.record("Supervisor:GetAlerts", 200, 0.5)
+
+        text = metrics.exposition()
+        method = 'method="Supervisor:GetAlerts"'
+        self.assertIn(f'five9_rest_requests_total{{{method},status="2xx"}} 2', text)
+        self.assertIn(f'five9_rest_request_seconds_bucket{{{method},le="0.1"}} 1', text)
+        self.assertIn(f'five9_rest_request_seconds_bucket{{{method},le="1"}} 2', text)
+        self.assertIn(f'five9_rest_request_seconds_bucket{{{method},le="+Inf"}} 2', text)
+
+    def test_disabled_registry_records_nothing(self):
+        metrics = Five9MetricsRegistry(enabled=False)
+        metrics.record("Supervisor:GetAlerts", 200, 0.05)
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_serve_exposes_text(self):
+        metrics = Five9MetricsRegistry()
+        metrics.record("Supervisor:GetAlerts", 200, 0.05)
+        port = metrics.serve()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as page:
+                self.assertIn("five9_rest_requests_total", page.read().decode())
+        finally:
+            metrics.close()
+
+
+class TestMethodMetrics(unittest.TestCase):
+    def test_send_records_every_request(self):
+        metrics = Five9MetricsRegistry()
+        config = FakeSessionConfig(
+            transport=FakeTransport(response(200), requests.exceptions.ConnectionError()),
+            metrics=metrics,
+        )
+        method = GetAlerts(config)
+        method.invoke()
+        with self.assertRaises(Five9RequestError):
+            method.invoke()
+
+        snapshot = metrics.snapshot()["Supervisor:GetAlerts"]
+        self.assertEqual(snapshot["statuses"], {"2xx": 1})
+        self.assertEqual(snapshot["errors"], {"ConnectionError": 1})
+        self.assertEqual(method.call_count, 2)
+
+    def test_call_count_is_per_instance_and_resettable(self):
+        metrics = Five9MetricsRegistry()
+        config = FakeSessionConfig(
+            transport=FakeTransport(response(200), response(200), response(200)),
+            metrics=metrics,
+        )
+        method = GetAlerts(config)
+        other = GetAlerts(config)
+        method.invoke()
+        method.invoke()
+        other.invoke()
+
+        self.assertEqual((method.call_count, other.call_count), (2, 1))
+        self.assertEqual(metrics.requests_for("Supervisor:GetAlerts"), 3)
+        method.call_count = 0
+        self.assertEqual(method.call_count, 0)
+
+    def test_request_body_is_counted(self):
+        metrics = Five9MetricsRegistry()
+        config = FakeSessionConfig(
+            transport=FakeTransport(response(200, b"{}")), metrics=metrics
+        )
+        CreateAlert(config).invoke({"name": "alert"})
+        self.assertEqual(
+            metrics.snapshot()["Supervisor:CreateAlert"]["bytes_out"],
+            len(b'{"name": "alert"}'),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
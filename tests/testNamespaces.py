@@ -0,0 +1,39 @@
+import unittest
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.methods.base import SupervisorRestMethod
+
+from tests.fakes import FakeSessionConfig
+
+
+class DomainQueues(SupervisorRestMethod):
+    """Custom method replacing a built in one"""
+
+
+class TestRESTNamespace(unittest.TestCase):
+    def setUp(self):
+        self.config = FakeSessionConfig()
+        self.namespace = Five9RestClient.RESTNamespace(
+            "supervisor_methods", self.config
+        )
+
+    def test_methods_are_created_on_first_access(self):
+        self.assertEqual(self.config.observers, [])
+
+        method = self.namespace.SupervisorLoginState
+        self.assertIs(self.namespace.SupervisorLoginState, method)
+        self.assertEqual(self.config.observers, [method])
+        self.assertIn("DomainQueues", dir(self.namespace))
+
+    def test_custom_method_replaces_registry_method(self):
+        self.namespace.add_method(DomainQueues)
+        self.assertIsInstance(self.namespace.DomainQueues, DomainQueues)
+
+    def test_unknown_method_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            self.namespace.NotAMethod
+        self.assertFalse(hasattr(self.namespace, "_private"))
+
+
+if __name__ == "__main__":
+    unittest.main()
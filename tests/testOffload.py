@@ -0,0 +1,139 @@
+import json
+import os
+import random
+import time
+import unittest
+
+from five9_agent_sup_rest.decoding import LazyEvent
+from five9_agent_sup_rest.methods.default_socket_handlers import ProcessPoolEventHandler
+from five9_agent_sup_rest.offload import (
+    offload_payload,
+    run_offloaded,
+    shutdown_process_pools,
+)
+
+from tests.fakes import make_socket, read
+
+
+def snapshot_frame(queue, sequence, calls):
+    return json.dumps(
+        {
+            "context": {"eventId": "5000", "queue": queue, "sequence": sequence},
+            "payLoad": [{"dataSource": "ACD_STATUS", "data": [{"callsInQueue": calls}] * 3}],
+        }
+    )
+
+
+class SnapshotHandler(ProcessPoolEventHandler):
+    eventId = "5000"
+    processes = 2
+    results = []
+
+    @staticmethod
+    def process_event(event):
+        if event["context"]["queue"] == "broken":
+            raise ValueError("bad snapshot")
+        # a little CPU time, so events overlap in the pool
+        time.sleep(random.uniform(0, 0.01))
+        calls = sum(row["callsInQueue"] for row in event["payLoad"][0]["data"])
+        return os.getpid(), event["context"]["queue"], event["context"]["sequence"], calls
+
+    async def handle_result(self, event, result):
+        SnapshotHandler.results.append((event.is_decoded, result))
+
+
+class KeyedSnapshotHandler(SnapshotHandler):
+    workers = 3
+
+    def dispatch_key(self, event):
+        return event["context"]["queue"]
+
+
+def tearDownModule():
+    shutdown_process_pools()
+
+
+class TestProcessPoolEventHandler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        SnapshotHandler.results = []
+
+    async def test_events_are_handled_in_a_pool_process(self):
+        socket = make_socket([SnapshotHandler])
+        await read(socket, [snapshot_frame("sales", sequence, 2) for sequence in range(4)])
+
+        self.assertEqual(len(SnapshotHandler.results), 4)
+        for decoded_on_loop, (pid, queue, sequence, calls) in SnapshotHandler.results:
+            self.assertFalse(decoded_on_loop)
+            self.assertNotEqual(pid, os.getpid())
+            self.assertEqual(calls, 6)
+        # one worker, in the order received
+        self.assertEqual(
+            [result[2] for _, result in SnapshotHandler.results], [0, 1, 2, 3]
+        )
+
+    async def test_events_with_the_same_key_stay_in_order(self):
+        socket = make_socket([KeyedSnapshotHandler])
+        frames = [
+            snapshot_frame(queue, sequence, 1)
+            for sequence in range(10)
+            for queue in ("sales", "support", "billing")
+        ]
+        await read(socket, frames)
+
+        self.assertEqual(len(SnapshotHandler.results), 30)
+        for queue in ("sales", "support", "billing"):
+            sequences = [
+                result[2] for _, result in SnapshotHandler.results if result[1] == queue
+            ]
+            self.assertEqual(sequences, list(range(10)))
+
+    async def test_failures_are_reported_on_the_loop(self):
+        socket = make_socket([SnapshotHandler])
+        with self.assertLogs(level="ERROR") as logs:
+            await read(socket, [snapshot_frame("broken", 0, 1), snapshot_frame("sales", 1, 1)])
+
+        self.assertIn("bad snapshot", "\n".join(logs.output))
+        self.assertEqual(len(SnapshotHandler.results), 1)
+        self.assertEqual(socket.metrics.snapshot()["events"]["5000"]["failed"], 1)
+
+
+class TestProcessEventIsRequired(unittest.TestCase):
+    def test_subclasses_without_process_event_fail_when_defined(self):
+        with self.assertRaisesRegex(TypeError, "must implement process_event"):
+
+            class Forgotten(ProcessPoolEventHandler):
+                eventId = "5000"
+
+        with self.assertRaisesRegex(TypeError, "must be a staticmethod"):
+
+            class BoundMethod(ProcessPoolEventHandler):
+                def process_event(self, event):
+                    return event
+
+    def test_abstract_bases_and_inherited_implementations(self):
+        class Base(ProcessPoolEventHandler, abstract=True):
+            workers = 2
+
+        class Implemented(Base):
+            process_event = staticmethod(len)
+
+        class Inherited(Implemented):
+            eventId = "5012"
+
+        self.assertIs(Inherited.process_event, len)
+
+
+class TestOffloadPayload(unittest.TestCase):
+    def test_lazy_events_are_sent_as_their_frame(self):
+        frame = snapshot_frame("sales", 0, 1)
+        event = LazyEvent(frame, "5000", json.loads)
+        self.assertIs(offload_payload(event), frame)
+        self.assertEqual(offload_payload({"payLoad": []}), {"payLoad": []})
+
+        self.assertEqual(
+            run_offloaded(SnapshotHandler.process_event, frame)[1:], ("sales", 0, 3)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
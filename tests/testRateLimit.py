@@ -0,0 +1,78 @@
+import types
+import unittest
+
+from five9_agent_sup_rest.rate_limit import Five9RateLimiter, TokenBucket
+
+from tests.fakes import FakeClock
+
+
+class GetAlerts:
+    method_name = "Supervisor:GetAlerts"
+
+
+class DomainQueues:
+    method_name = "Supervisor:DomainQueues"
+
+
+def response(status_code, headers=None):
+    return types.SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        clock = FakeClock(100.0)
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+        clock.now += 1
+        self.assertEqual(bucket.reserve(), 0)
+
+
+class TestFive9RateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(100.0)
+
+    def test_retry_after_pauses_every_method_without_a_rate(self):
+        limiter = Five9RateLimiter(clock=self.clock)
+        self.assertEqual(limiter.reserve(GetAlerts()), 0)
+
+        limiter.record_response(GetAlerts(), response(429, {"Retry-After": "2"}))
+        self.assertAlmostEqual(limiter.reserve(DomainQueues()), 2)
+
+        stats = limiter.stats()
+        self.assertEqual(stats["throttled"], 1)
+        self.assertAlmostEqual(stats["wait_seconds"], 2)
+        self.assertAlmostEqual(stats["method_wait_seconds"]["Supervisor:DomainQueues"], 2)
+
+    def test_method_bucket_only_limits_its_method(self):
+        limiter = Five9RateLimiter(clock=self.clock, method_rates={"GetAlerts": (1, 1)})
+        self.assertEqual(limiter.reserve(GetAlerts()), 0)
+        self.assertAlmostEqual(limiter.reserve(GetAlerts()), 1)
+        self.assertEqual(limiter.reserve(DomainQueues()), 0)
+
+    def test_adaptive_rate_decreases_once_per_burst_and_recovers(self):
+        limiter = Five9RateLimiter(
+            clock=self.clock, rate=10, increase_step=1, decrease_factor=0.5
+        )
+        for _ in range(5):
+            limiter.record_response(GetAlerts(), response(503))
+        self.assertEqual(limiter.stats()["rate"], 5)
+
+        for _ in range(20):
+            limiter.record_response(GetAlerts(), response(200))
+        self.assertEqual(limiter.stats()["rate"], 10)
+
+    def test_http_date_retry_after(self):
+        limiter = Five9RateLimiter(clock=self.clock, default_retry_after=3)
+        self.assertEqual(limiter.retry_after(response(429)), 3)
+        self.assertEqual(
+            limiter.retry_after(response(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})),
+            0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
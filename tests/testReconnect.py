@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.reconnect import ReconnectMetrics, ReconnectPolicy
+
+from benchmarks.standin import Five9StandIn
+from tests.fakes import FakeClock
+
+
+class TestReconnectPolicy(unittest.TestCase):
+    def test_delay_grows_exponentially_up_to_max(self):
+        policy = ReconnectPolicy(
+            initial_delay=1, multiplier=2, max_delay=5, jitter=False
+        )
+        self.assertEqual(
+            [policy.delay(attempt) for attempt in range(5)], [1, 2, 4, 5, 5]
+        )
+
+    def test_jitter_stays_within_backoff(self):
+        policy = ReconnectPolicy(initial_delay=1, multiplier=2, max_delay=30)
+        for attempt in range(6):
+            delay = policy.delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(30, 2**attempt))
+
+    def test_max_attempts(self):
+        policy = ReconnectPolicy(max_attempts=2)
+        self.assertTrue(policy.should_retry(1))
+        self.assertFalse(policy.should_retry(2))
+        self.assertFalse(ReconnectPolicy(enabled=False).should_retry(0))
+
+
+class TestReconnectMetrics(unittest.TestCase):
+    def test_time_to_recover(self):
+        clock = FakeClock()
+        metrics = ReconnectMetrics(clock=clock)
+
+        metrics.connected()
+        clock.now = 10
+        metrics.disconnected()
+        clock.now = 11
+        # a failed attempt does not restart the outage
+        metrics.disconnected()
+        clock.now = 12.5
+        metrics.connected()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["connections"], 2)
+        self.assertEqual(snapshot["disconnects"], 1)
+        self.assertEqual(snapshot["reconnects"], 1)
+        self.assertEqual(snapshot["last_time_to_recover"], 2.5)
+        self.assertFalse(snapshot["down"])
+
+
+class TestSocketConnection(unittest.TestCase):
+    def test_a_failing_message_handler_stops_the_ping_task(self):
+        with Five9StandIn() as standin:
+            # the stand-in's certificate is self-signed
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            client = Five9RestClient(
+                username="ping", password="x", **standin.client_options()
+            )
+            self.addCleanup(client.close)
+            client.initialize_supervisor_session()
+            socket = client.get_socket("supervisor")
+
+            async def handle_messages(websocket):
+                await websocket.recv()
+                raise ValueError("handler failed")
+
+            socket.handle_messages = handle_messages
+
+            async def run():
+                with self.assertRaises(ValueError):
+                    await socket.run(reconnect=False)
+                await client.aclose()
+                return [
+                    task
+                    for task in asyncio.all_tasks()
+                    if task.get_coro().__name__ == "send_ping"
+                ]
+
+            self.assertEqual(asyncio.run(asyncio.wait_for(run(), timeout=10)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+import types
+import unittest
+
+from five9_agent_sup_rest.client import Five9Socket
+from five9_agent_sup_rest.handler_registry import SocketHandlerRegistry
+from five9_agent_sup_rest.login_state import LoginStateCache
+from five9_agent_sup_rest.methods.default_socket_handlers import SocketEventHandler
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry
+from five9_agent_sup_rest.recording import (
+    Five9FrameRecorder,
+    Five9FrameReplayer,
+    read_frames,
+)
+
+
+def frame(eventId, sequence, **context):
+    return json.dumps(
+        {"context": {"eventId": eventId, **context}, "payLoad": sequence}
+    )
+
+
+class StatisticsHandler(SocketEventHandler):
+    eventId = "5012"
+    received = []
+
+    async def handle(self, event):
+        self.received.append(event["payLoad"])
+
+
+def make_client(**kwargs):
+    client = types.SimpleNamespace(
+        session_configuration=types.SimpleNamespace(
+            host="127.0.0.1", port=443, username="replay"
+        ),
+        socket_json_loads=None,
+        socket_reconnect_options={},
+        socket_dispatch_options={},
+        socket_metrics_options={},
+        socket_record_path=None,
+        socket_record_options={},
+        metrics=Five9MetricsRegistry(),
+        login_state_cache=LoginStateCache(),
+        custom_socket_handlers=[StatisticsHandler],
+        **kwargs,
+    )
+    client.socket_handler_registry = SocketHandlerRegistry(
+        client, client.custom_socket_handlers
+    )
+    return client
+
+
+class TestFrameLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "frames.log.gz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_frames_are_read_back_exactly(self):
+        frames = [frame("5012", 1), '{"text": "two\nlines é"}', ""]
+        with Five9FrameRecorder(self.path) as recorder:
+            for index, raw in enumerate(frames):
+                recorder.record(raw, 1000 + index / 10)
+
+        self.assertEqual(
+            list(read_frames(self.path)),
+            [(1000 + index / 10, raw) for index, raw in enumerate(frames)],
+        )
+
+    def test_recorders_append_to_one_log(self):
+        for sequence in range(3):
+            with Five9FrameRecorder(self.path) as recorder:
+                recorder.record(frame("5012", sequence), 1000 + sequence)
+
+        self.assertEqual(
+            [raw for _, raw in read_frames(self.path)],
+            [frame("5012", sequence) for sequence in range(3)],
+        )
+
+    def test_incomplete_log_is_read_up_to_the_last_complete_frame(self):
+        with Five9FrameRecorder(self.path) as recorder:
+            for sequence in range(5):
+                recorder.record(frame("5012", sequence), 1000)
+        # the process died before the gzip trailer was written
+        with open(self.path, "rb") as log:
+            data = log.read()
+        with open(self.path, "wb") as log:
+            log.write(data[:-3])
+
+        with self.assertLogs(level="WARNING"):
+            frames = list(read_frames(self.path))
+        self.assertEqual(len(frames), 5)
+
+    def test_log_is_gzip(self):
+        with Five9FrameRecorder(self.path) as recorder:
+            recorder.record("ping", 1000)
+        with gzip.open(self.path, "rb") as log:
+            self.assertEqual(log.read(), b"1000.000000 4\nping\n")
+
+
+class TestReplay(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        StatisticsHandler.received = []
+
+    async def test_replay_feeds_the_socket_handlers_in_order(self):
+        frames = [(1000 + sequence, frame("5012", sequence)) for sequence in range(50)]
+        frames.append((1050, frame("9999", "unhandled")))
+        socket = Five9Socket(make_client(), "supervisor", "replay")
+
+        stats = await socket.replay(frames, speed=None)
+
+        self.assertEqual(StatisticsHandler.received, list(range(50)))
+        self.assertEqual(stats["frames"], 51)
+        events = socket.metrics.snapshot()["events"]
+        self.assertEqual(events["5012"]["handled"], 50)
+        self.assertEqual(events["9999"]["handled"], 1)
+
+    async def test_replay_follows_the_recorded_timing(self):
+        frames = [(1000 + sequence * 0.5, frame("5012", sequence)) for sequence in range(5)]
+        socket = Five9Socket(make_client(), "supervisor", "replay")
+
+        started = time.perf_counter()
+        await socket.replay(frames, speed=20)
+        # four half second gaps at twenty times real time
+        self.assertGreaterEqual(time.perf_counter() - started, 0.1)
+
+    async def test_long_gaps_are_shortened(self):
+        frames = [(1000, frame("5012", 0)), (4600, frame("5012", 1))]
+        replayer = Five9FrameReplayer(frames, speed=100, max_gap=1)
+
+        started = time.perf_counter()
+        received = [raw async for raw in replayer]
+        self.assertEqual(len(received), 2)
+        self.assertLess(time.perf_counter() - started, 1)
+
+    async def test_server_lag_is_measured_against_recorded_time(self):
+        frames = [(1_700_000_000.5, frame("5012", 0, timestamp=1_700_000_000_000))]
+        socket = Five9Socket(make_client(), "supervisor", "replay")
+
+        await socket.replay(frames, speed=None)
+        events = socket.metrics.snapshot()["events"]
+        self.assertAlmostEqual(events["5012"]["last_server_lag"], 0.5)
+
+    async def test_socket_records_received_frames(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.log.gz")
+            socket = Five9Socket(make_client(), "supervisor", "replay")
+            socket.start_recording(path)
+            await socket.replay([(1000, frame("5012", 0)), (1001, frame("5012", 1))], speed=None)
+            socket.stop_recording()
+
+            self.assertEqual(
+                [raw for _, raw in read_frames(path)],
+                [frame("5012", 0), frame("5012", 1)],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
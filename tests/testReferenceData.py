@@ -0,0 +1,112 @@
+import unittest
+
+from requests.structures import CaseInsensitiveDict
+
+from five9_agent_sup_rest.methods.base import SupervisorRestMethod
+from five9_agent_sup_rest.methods.supervisor_methods import DomainQueues
+
+from tests.fakes import FakeClock, FakeSessionConfig
+
+
+QUEUES = [{"id": "1", "name": "Sales"}, {"id": "2", "name": "Support"}]
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.text = ""
+        self.content = b""
+
+    def json(self):
+        return self.body
+
+
+class FakeTransport:
+    """Answers with 200 and an ETag, or 304 when the request carries that ETag"""
+
+    def __init__(self):
+        self.requests = []
+
+    def send(self, prepared_request, timeout=None):
+        self.requests.append(prepared_request)
+        if prepared_request.headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304, headers={"ETag": '"v1"'})
+        return FakeResponse(200, QUEUES, headers={"ETag": '"v1"'})
+
+
+class OriginalStyleDomainQueues(SupervisorRestMethod):
+    """Sets method and path in its invoke() override, as the original methods did"""
+
+    def invoke(self):
+        self.method = "GET"
+        self.path = f"/orgs/{self.config.orgId}/queues"
+        super().invoke()
+        return self.response.json()
+
+
+class TestReferenceDataCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.config = FakeSessionConfig(
+            transport=FakeTransport(),
+            clock=self.clock,
+            reference_data_ttl={"DomainQueues": 60},
+        )
+        self.method = DomainQueues(self.config)
+
+    def test_fresh_value_is_served_without_request(self):
+        first = self.method.invoke()
+        self.assertIs(self.method.invoke(), first)
+        self.assertEqual(len(self.config.transport.requests), 1)
+
+    def test_stale_value_is_revalidated_with_etag(self):
+        first = self.method.invoke()
+        self.clock.now = 61
+        self.assertIs(self.method.invoke(), first)
+
+        revalidation = self.config.transport.requests[-1]
+        self.assertEqual(revalidation.headers["If-None-Match"], '"v1"')
+        self.assertEqual(self.config.reference_data_cache.revalidated, 1)
+
+        # the 304 made the value fresh again
+        self.method.invoke()
+        self.assertEqual(len(self.config.transport.requests), 2)
+
+    def test_lookup_uses_index_of_cached_value(self):
+        self.assertEqual(self.method.lookup(2)["name"], "Support")
+        self.assertIsNone(self.method.lookup("3"))
+        self.assertIs(self.method.index(), self.method.index())
+        self.assertEqual(len(self.config.transport.requests), 1)
+
+    def test_index_keys_by_the_request_sent(self):
+        # timeout is reserved for the call, not part of the request
+        index = self.method.index(timeout=5)
+        self.assertIs(self.method.index(), index)
+        self.assertEqual(len(self.config.transport.requests), 1)
+
+    def test_index_of_an_original_style_method(self):
+        method = OriginalStyleDomainQueues(self.config)
+        self.assertEqual(method.lookup("1")["name"], "Sales")
+        self.assertEqual(set(method.index()), {"1", "2"})
+
+    def test_invalidate_forces_refetch(self):
+        self.method.invoke()
+        self.config.reference_data_cache.invalidate("DomainQueues")
+        self.method.invoke()
+        self.assertEqual(len(self.config.transport.requests), 2)
+        self.assertNotIn("If-None-Match", self.config.transport.requests[-1].headers)
+
+    def test_methods_without_ttl_are_not_cached(self):
+        config = FakeSessionConfig(
+            transport=FakeTransport(), reference_data_ttl={"DomainQueues": None}
+        )
+        method = DomainQueues(config)
+        method.invoke()
+        method.invoke()
+        self.assertEqual(len(config.transport.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
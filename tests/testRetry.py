@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+import types
+import unittest
+
+import requests
+
+from five9_agent_sup_rest.client import Five9RestClientSessionConfig
+from five9_agent_sup_rest.exceptions import Five9RequestError
+from five9_agent_sup_rest.methods.supervisor_methods import (
+    CreateAlert,
+    GetAlerts,
+)
+
+from tests.fakes import FakeSessionConfig
+
+
+def response(status_code, body=None):
+    return types.SimpleNamespace(
+        status_code=status_code,
+        headers={},
+        text="",
+        content=b"",
+        request_size=0,
+        json=lambda: body,
+    )
+
+
+class ScriptedTransport:
+    """Answers with the scripted responses in order, raising the exceptions"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def next_outcome(self):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def send(self, prepared_request, timeout=None):
+        self.requests.append((prepared_request, timeout))
+        return self.next_outcome()
+
+
+class ScriptedAsyncTransport(ScriptedTransport):
+    async def send(self, method, url, headers=None, timeout=None, **kwargs):
+        self.requests.append((headers, timeout))
+        return self.next_outcome()
+
+
+def session_config(transport, **retry_options):
+    return FakeSessionConfig(
+        transport=transport, retry_options={"initial_delay": 0, **retry_options}
+    )
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_retries_get_until_success(self):
+        transport = ScriptedTransport(response(503), response(502), response(200, []))
+        config = session_config(transport)
+        self.assertEqual(GetAlerts(config).invoke(), [])
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_does_not_retry_post(self):
+        transport = ScriptedTransport(response(503), response(200, {}))
+        config = session_config(transport)
+        method = CreateAlert(config)
+        self.assertEqual(method.send(method.build_request({})).status_code, 503)
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_connection_error_is_raised_after_attempts(self):
+        transport = ScriptedTransport(
+            requests.exceptions.ConnectionError("refused"),
+            requests.exceptions.ConnectTimeout("timed out"),
+        )
+        config = session_config(transport, max_attempts=2)
+        with self.assertRaises(Five9RequestError) as raised:
+            GetAlerts(config).invoke()
+        self.assertEqual(raised.exception.attempts, 2)
+        self.assertIsInstance(raised.exception.error, requests.exceptions.ConnectTimeout)
+
+    def test_post_error_is_not_retried(self):
+        transport = ScriptedTransport(requests.exceptions.ReadTimeout("timed out"))
+        config = session_config(transport)
+        with self.assertRaises(Five9RequestError) as raised:
+            CreateAlert(config).invoke({})
+        self.assertEqual(raised.exception.attempts, 1)
+
+    def test_method_can_declare_itself_idempotent(self):
+        class IdempotentCreateAlert(CreateAlert):
+            idempotent = True
+
+        transport = ScriptedTransport(response(503), response(200, {"id": "1"}))
+        config = session_config(transport)
+        self.assertEqual(IdempotentCreateAlert(config).invoke({}), {"id": "1"})
+
+    def test_client_error_is_returned_without_retry(self):
+        transport = ScriptedTransport(response(404, {"error": "not found"}))
+        config = session_config(transport)
+        self.assertEqual(GetAlerts(config).invoke(), {"error": "not found"})
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_401_logs_in_once_and_retries_with_new_token(self):
+        transport = ScriptedTransport(response(401), response(401), response(200, []))
+        config = session_config(transport)
+        self.assertEqual(GetAlerts(config).invoke(), None)
+        self.assertEqual(config.logins, 1)
+        # the retry after the login carries the new token, a second 401 is returned
+        self.assertEqual(
+            transport.requests[1][0].headers["Authorization"], "Bearer-token-2"
+        )
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_timeout_is_passed_to_transport(self):
+        transport = ScriptedTransport(response(200, []))
+        config = session_config(transport)
+        GetAlerts(config).invoke(timeout=1.5)
+        self.assertEqual(transport.requests[0][1], 1.5)
+
+    def test_total_timeout_stops_retrying(self):
+        transport = ScriptedTransport(response(503), response(200, []))
+        config = session_config(transport, total_timeout=0.5)
+        config.retry_policy.initial_delay = 1
+        config.retry_policy.jitter = False
+        method = GetAlerts(config)
+        self.assertEqual(method.send(method.build_request()).status_code, 503)
+
+    def test_async_retries_and_relogin(self):
+        transport = ScriptedAsyncTransport(
+            response(401), asyncio.TimeoutError(), response(200, [{"id": "1"}])
+        )
+        config = session_config(transport)
+        self.assertEqual(asyncio.run(GetAlerts(config).ainvoke()), [{"id": "1"}])
+        self.assertEqual(config.logins, 1)
+        self.assertEqual(transport.requests[2][0]["Authorization"], "Bearer-token-2")
+
+
+class CountingSessionConfig(Five9RestClientSessionConfig):
+    """Logs in without a server, slowly enough for concurrent refreshes to overlap"""
+
+    def login(self, *args, **kwargs):
+        time.sleep(0.05)
+        self.logins = getattr(self, "logins", 0) + 1
+        self.tokenId = f"token-{self.logins}"
+        return True
+
+
+class TestRefreshSession(unittest.TestCase):
+    def test_concurrent_refreshes_log_in_once(self):
+        config = CountingSessionConfig(username="user", password="secret")
+        stale_token = config.tokenId
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(config.refresh_session(stale_token))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [True] * 8)
+        # one login in the constructor, one refresh
+        self.assertEqual(config.logins, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
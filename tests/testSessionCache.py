@@ -0,0 +1,63 @@
+import os
+import tempfile
+import types
+import unittest
+
+from five9_agent_sup_rest import session_cache
+from five9_agent_sup_rest.session_cache import Five9SessionCache
+
+
+def logged_in_session():
+    return types.SimpleNamespace(
+        tokenId="token-1",
+        cookies_header="Authorization=Bearer-token-1",
+        host="app-atl.five9.com",
+        port=443,
+        orgId="100",
+        userId="200",
+        farmId="300",
+    )
+
+
+@unittest.skipIf(session_cache.Fernet is None, "cryptography is not installed")
+class TestFive9SessionCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.key = Five9SessionCache.generate_key()
+        self.cache = Five9SessionCache(directory=self.directory.name, key=self.key)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_is_encrypted(self):
+        self.cache.save("jdoe", "US", logged_in_session())
+
+        entry = self.cache.load("jdoe", "US")
+        self.assertEqual(entry["tokenId"], "token-1")
+        self.assertEqual(entry["port"], 443)
+        self.assertIsNone(self.cache.load("jdoe", "CA"))
+
+        with open(self.cache.path_for("jdoe", "US"), "rb") as cache_file:
+            self.assertNotIn(b"token-1", cache_file.read())
+        self.assertEqual(os.stat(self.cache.path_for("jdoe", "US")).st_mode & 0o077, 0)
+
+    def test_other_key_cannot_read_entry(self):
+        self.cache.save("jdoe", "US", logged_in_session())
+        other = Five9SessionCache(
+            directory=self.directory.name, key=Five9SessionCache.generate_key()
+        )
+        self.assertIsNone(other.load("jdoe", "US"))
+
+    def test_expired_and_deleted_entries_are_not_loaded(self):
+        self.cache.save("jdoe", "US", logged_in_session())
+        expired = Five9SessionCache(
+            directory=self.directory.name, key=self.key, max_age=-1
+        )
+        self.assertIsNone(expired.load("jdoe", "US"))
+
+        self.cache.delete("jdoe", "US")
+        self.assertIsNone(self.cache.load("jdoe", "US"))
+
+
+if __name__ == "__main__":
+    unittest.main()
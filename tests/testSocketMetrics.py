@@ -0,0 +1,119 @@
+import asyncio
+import json
+import unittest
+
+from five9_agent_sup_rest.decoding import LazyEvent
+from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+from five9_agent_sup_rest.metrics import Five9MetricsRegistry, Five9SocketMetrics
+
+from tests.fakes import FakeClock
+
+
+def event(eventId, **context):
+    return {"context": {"eventId": eventId, **context}, "payLoad": {}}
+
+
+class SlowHandler:
+    eventId = "5012"
+
+    async def handle(self, event):
+        await asyncio.sleep(0.01)
+
+
+class FailingHandler:
+    eventId = "3"
+
+    async def handle(self, event):
+        raise ValueError("bad event")
+
+
+class TestFive9SocketMetrics(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.wall_clock = FakeClock(1_700_000_000.0)
+        self.metrics = Five9SocketMetrics(
+            "supervisor", rate_window=10, clock=self.clock, wall_clock=self.wall_clock
+        )
+
+    def test_rate_is_counted_over_the_last_full_window(self):
+        for _ in range(50):
+            self.metrics.record_received("5012")
+        self.assertEqual(self.metrics.snapshot()["events"]["5012"]["rate"], 0)
+
+        self.clock.now = 10
+        self.metrics.record_received("5012", 2048)
+        events = self.metrics.snapshot()["events"]
+        self.assertEqual(events["5012"]["rate"], 5)
+        self.assertEqual(events["5012"]["received"], 51)
+        self.assertEqual(events["5012"]["bytes_received"], 2048)
+
+        # a quiet window in between drops the rate to zero
+        self.clock.now = 35
+        self.assertEqual(self.metrics.snapshot()["events"]["5012"]["rate"], 0)
+
+    def test_server_lag_from_epoch_milliseconds(self):
+        sent = event("5012", timestamp=int((self.wall_clock.now - 0.25) * 1000))
+        self.metrics.record_handled("5012", sent, 0.002, 0.01)
+
+        snapshot = self.metrics.snapshot()["events"]["5012"]
+        self.assertAlmostEqual(snapshot["last_server_lag"], 0.25, places=3)
+        self.assertEqual(snapshot["server_lag"]["p50"], 0.25)
+        self.assertEqual(snapshot["handler_seconds"]["count"], 1)
+
+    def test_undecoded_events_are_not_decoded_for_lag(self):
+        lazy = LazyEvent(json.dumps(event("5012", timestamp=1)), "5012", json.loads)
+        self.metrics.record_handled("5012", lazy, 0.001, 0.001)
+        self.assertFalse(lazy.is_decoded)
+        self.assertEqual(self.metrics.snapshot()["events"]["5012"]["server_lag"]["count"], 0)
+
+    def test_ping_rtt(self):
+        self.metrics.ping_sent()
+        self.clock.now = 0.04
+        self.assertAlmostEqual(self.metrics.record_pong(), 0.04)
+        # a pong without a ping in flight is not timed
+        self.assertIsNone(self.metrics.record_pong())
+        self.assertEqual(self.metrics.snapshot()["ping"]["count"], 1)
+
+    def test_exposition_through_registry(self):
+        registry = Five9MetricsRegistry()
+        registry.add_collector(self.metrics)
+        registry.add_collector(Five9SocketMetrics("agent", user="agent1"))
+        self.metrics.record_received("5012")
+
+        text = registry.exposition()
+        self.assertIn(
+            'five9_socket_events_received_total{context="supervisor",user="",event_id="5012"} 1',
+            text,
+        )
+        self.assertEqual(text.count("# TYPE five9_socket_events_received_total"), 1)
+
+
+class TestDispatcherMetrics(unittest.TestCase):
+    def test_handler_time_lag_failures_and_depth(self):
+        metrics = Five9SocketMetrics("supervisor")
+
+        async def run():
+            dispatcher = Five9EventDispatcher(metrics=metrics)
+            metrics.dispatcher = dispatcher
+            handler = SlowHandler()
+            for _ in range(5):
+                await dispatcher.dispatch("5012", handler, event("5012"))
+            # events for the fallback handler are recorded under their own eventId
+            await dispatcher.dispatch("*", FailingHandler(), event("3"), "3")
+            depth = metrics.snapshot()["queue_depths"]["5012"]
+            await dispatcher.join()
+            await dispatcher.close()
+            return depth
+
+        self.assertEqual(asyncio.run(run()), 5)
+
+        events = metrics.snapshot()["events"]
+        self.assertEqual(events["5012"]["handled"], 5)
+        self.assertGreaterEqual(events["5012"]["handler_seconds"]["mean"], 0.01)
+        # the last event waited for the four before it
+        self.assertGreaterEqual(events["5012"]["last_queue_lag"], 0.04)
+        self.assertEqual(events["3"]["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
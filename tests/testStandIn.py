@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+
+from benchmarks.standin import Five9StandIn
+
+
+class TestFive9StandIn(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = Five9StandIn(
+            notices=2, dispositions=5, payload_bytes=100, burst_frames=3
+        ).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.__exit__(None, None, None)
+
+    def make_client(self, username):
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        client = Five9RestClient(
+            username=username, password="x", **self.standin.client_options()
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_session_reaches_working_after_accepting_notices(self):
+        client = self.make_client("notices")
+        client.initialize_supervisor_session()
+        self.assertEqual(client.get_login_state("supervisor", refresh=True), "WORKING")
+        self.assertEqual(client.supervisor.MaintenanceNoticesGet.invoke(), [])
+
+    def test_payload_sizes(self):
+        client = self.make_client("payloads")
+        client.initialize_supervisor_session()
+        dispositions = client.supervisor.GetDomainDispositions.invoke()
+        self.assertEqual(len(dispositions), 5)
+        self.assertEqual(len(dispositions[0]["description"]), 100)
+
+    def test_logout_revokes_the_token(self):
+        client = self.make_client("logout")
+        client.initialize_supervisor_session()
+        token = client.session_configuration.tokenId
+        client.supervisor.LogOut.invoke()
+        self.assertNotIn(token, self.standin.valid_tokens)
+
+    def test_socket_receives_the_burst(self):
+        client = self.make_client("socket")
+        client.initialize_supervisor_session()
+        socket = client.get_socket("supervisor")
+
+        async def run():
+            run_task = asyncio.create_task(socket.run(reconnect=False))
+            # the 1010 connected event and the burst of 5012 updates
+            while socket.messages_received < 4:
+                await asyncio.sleep(0.01)
+            await socket.stop()
+            await run_task
+            await client.aclose()
+
+        with self.assertNoLogs(level=logging.ERROR):
+            asyncio.run(asyncio.wait_for(run(), timeout=10))
+        self.assertEqual(socket.metrics.snapshot()["events"]["5012"]["received"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
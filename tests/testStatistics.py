@@ -0,0 +1,73 @@
+import unittest
+
+from five9_agent_sup_rest.statistics import QueueStatisticsStore
+
+
+QUEUES = [{"id": "1", "name": "Sales"}, {"id": "2", "name": "Support"}]
+
+
+def snapshot():
+    return [
+        {"id": "1", "callsInQueue": 0, "longestQueueTime": 0},
+        {"id": "2", "callsInQueue": 3, "longestQueueTime": 40},
+    ]
+
+
+class TestQueueStatisticsStore(unittest.TestCase):
+    def setUp(self):
+        self.store = QueueStatisticsStore(queue_mapping_info=QUEUES)
+        self.store.load_snapshot(snapshot())
+
+    def test_snapshot_loads_every_queue(self):
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get("2", "callsInQueue"), 3)
+        self.assertEqual(self.store.queue_name("1"), "Sales")
+
+    def test_update_records_previous_values_only_for_changed_fields(self):
+        changed = self.store.apply_delta(
+            {"updated": [{"id": "1", "callsInQueue": 2, "longestQueueTime": 0}]}
+        )
+        self.assertEqual(changed, {"1"})
+        self.assertEqual(self.store.changed_fields("1"), {"callsInQueue": 0})
+        self.assertEqual(self.store.previous_value("1", "callsInQueue"), 0)
+        self.assertEqual(self.store.previous_value("2", "callsInQueue"), 3)
+        self.assertEqual(
+            list(self.store.iter_changes("callsInQueue")), [("1", "callsInQueue", 0, 2)]
+        )
+
+    def test_unchanged_update_reports_no_changes(self):
+        changed = self.store.apply_delta({"updated": [{"id": "2", "callsInQueue": 3}]})
+        self.assertEqual(changed, set())
+        self.assertEqual(list(self.store.iter_changes()), [])
+
+    def test_added_and_removed_queues(self):
+        changed = self.store.apply_delta(
+            {"added": [{"id": "3", "callsInQueue": 1}], "removed": [{"id": "2"}]}
+        )
+        self.assertEqual(changed, {"2", "3"})
+        self.assertNotIn("2", self.store)
+        self.assertIn("2", self.store.removed)
+        self.assertEqual(
+            list(self.store.iter_changes("callsInQueue")), [("3", "callsInQueue", None, 1)]
+        )
+
+    def test_event_rows_are_not_modified(self):
+        rows = snapshot()
+        added = {"id": "3", "callsInQueue": 1}
+        store = QueueStatisticsStore()
+        store.load_snapshot(rows)
+        store.apply_delta({"added": [added]})
+        store.apply_delta(
+            {"updated": [{"id": "1", "callsInQueue": 5}, {"id": "3", "callsInQueue": 2}]}
+        )
+
+        self.assertEqual(store.get("1", "callsInQueue"), 5)
+        self.assertEqual(store.get("3", "callsInQueue"), 2)
+        self.assertEqual(rows, snapshot())
+        self.assertEqual(added, {"id": "3", "callsInQueue": 1})
+
+    def test_changes_reset_between_updates(self):
+        self.store.apply_delta({"updated": [{"id": "1", "callsInQueue": 2}]})
+        self.store.apply_delta({"updated": [{"id": "2", "callsInQueue": 4}]})
+        self.assertEqual(self.store.changed, {"2"})
+        self.assertEqual(self.store.previous_value("1", "callsInQueue"), 2)
@@ -0,0 +1,153 @@
+import asyncio
+import types
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.exceptions import Five9ResponseError
+from five9_agent_sup_rest.methods.supervisor_methods import SetStatisticsViewSettings
+from five9_agent_sup_rest.statistics_subscription import StatisticsSubscription
+
+from benchmarks.standin import Five9StandIn
+
+
+QUEUES = [{"id": "1", "name": "Sales"}, {"id": "2", "name": "Support"}]
+
+
+class RejectedSubscription(StatisticsSubscription):
+    def apply(self, client):
+        SetStatisticsViewSettings(client.session_configuration).process_response(
+            types.SimpleNamespace(status_code=404, text="Not Found", content=b"")
+        )
+
+
+class TestStatisticsSubscription(unittest.TestCase):
+    def test_settings_left_unset_are_not_sent(self):
+        subscription = StatisticsSubscription()
+        self.assertIsNone(subscription.view_settings())
+        self.assertIsNone(subscription.filter_settings(QUEUES))
+
+    def test_view_settings(self):
+        subscription = StatisticsSubscription(
+            data_sources=("ACD_STATUS",), columns={"ACD_STATUS": ("callsInQueue",)}
+        )
+        self.assertEqual(
+            subscription.view_settings(),
+            {"dataSources": ["ACD_STATUS"], "columns": {"ACD_STATUS": ["callsInQueue"]}},
+        )
+
+    def test_skills_by_name_or_id(self):
+        subscription = StatisticsSubscription(skills=["Support", 1])
+        self.assertEqual(subscription.filter_settings(QUEUES), {"skillIds": ["2", "1"]})
+
+        with self.assertRaises(ValueError):
+            StatisticsSubscription(skills=["Billing"]).filter_settings(QUEUES)
+
+
+class TestStatisticsSubscriptionSession(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = Five9StandIn(
+            queues=5, acd_columns=3, agents=4, burst_frames=2
+        ).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.__exit__(None, None, None)
+
+    def make_client(self, username, **options):
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        client = Five9RestClient(
+            username=username, password="x", **self.standin.client_options(), **options
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def read_burst(self, client):
+        socket = client.get_socket("supervisor")
+        events = []
+
+        async def on_statistics(event):
+            events.append(event)
+
+        socket.subscribe("5012", on_statistics)
+
+        async def run():
+            run_task = asyncio.create_task(socket.run(reconnect=False))
+            while socket.messages_received < 3:
+                await asyncio.sleep(0.01)
+            await socket.dispatcher.join()
+            await socket.stop()
+            await run_task
+            await client.aclose()
+
+        asyncio.run(asyncio.wait_for(run(), timeout=10))
+        return events
+
+    def test_the_server_only_streams_what_is_subscribed(self):
+        client = self.make_client(
+            "subscribed",
+            statistics_subscription={
+                "data_sources": ["ACD_STATUS"],
+                "skills": ["Queue 2", "Queue 4"],
+                "columns": {"ACD_STATUS": ["callsInQueue"]},
+            },
+        )
+        client.initialize_supervisor_session()
+        self.assertEqual(
+            client.supervisor.GetStatisticsFilterSettings.invoke(),
+            {"skillIds": ["2", "4"]},
+        )
+
+        events = self.read_burst(client)
+        self.assertEqual(len(events), 2)
+        for event in events:
+            (acd_status,) = event["payLoad"]
+            self.assertEqual(acd_status["dataSource"], "ACD_STATUS")
+            self.assertEqual([row["id"] for row in acd_status["updated"]], ["2", "4"])
+            self.assertEqual(set(acd_status["updated"][0]), {"id", "callsInQueue"})
+
+    def test_everything_is_streamed_without_a_subscription(self):
+        client = self.make_client("everything")
+        client.initialize_supervisor_session()
+        events = self.read_burst(client)
+        self.assertEqual(
+            [source["dataSource"] for source in events[0]["payLoad"]],
+            ["ACD_STATUS", "AGENT_STATE"],
+        )
+        self.assertEqual(len(events[0]["payLoad"][0]["updated"]), 5)
+
+    def test_applied_once_per_session(self):
+        client = self.make_client(
+            "once", statistics_subscription=StatisticsSubscription(data_sources=[])
+        )
+        client.initialize_supervisor_session()
+        self.assertFalse(client.apply_statistics_subscription())
+        client.initialize_supervisor_session()
+        self.assertEqual(
+            client.metrics.requests_for("Supervisor:SetStatisticsViewSettings"), 1
+        )
+
+        # a new session gets the subscription again
+        client.restore_session()
+        self.assertEqual(
+            client.metrics.requests_for("Supervisor:SetStatisticsViewSettings"), 2
+        )
+
+    def test_a_rejected_subscription_does_not_fail_the_session(self):
+        client = self.make_client(
+            "rejected", statistics_subscription=RejectedSubscription(data_sources=[])
+        )
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertTrue(client.initialize_supervisor_session())
+
+        self.assertIn("Supervisor:SetStatisticsViewSettings - Error: 404", "\n".join(logs.output))
+        self.assertIsNone(client.statistics_subscription_token)
+        with self.assertRaises(Five9ResponseError):
+            client.statistics_subscription.apply(client)
+
+
+if __name__ == "__main__":
+    unittest.main()
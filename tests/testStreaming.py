@@ -0,0 +1,146 @@
+import asyncio
+import json
+import unittest
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.dispatch import Five9EventDispatcher
+
+from benchmarks.standin import Five9StandIn
+from tests.fakes import InMemoryWebSocket, make_socket
+
+
+def statistics_frame(sequence):
+    return json.dumps({"context": {"eventId": "5012"}, "payLoad": sequence})
+
+
+class TestFive9EventStream(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = Five9StandIn(burst_frames=3).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.__exit__(None, None, None)
+
+    def make_socket(self, username, **options):
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        client = Five9RestClient(
+            username=username, password="x", **self.standin.client_options(), **options
+        )
+        self.addCleanup(client.close)
+        client.initialize_supervisor_session()
+        return client.get_socket("supervisor")
+
+    def run_until_complete(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+    def test_async_iteration_connects_and_disconnects(self):
+        socket = self.make_socket("iterate")
+
+        async def consume():
+            received = []
+            async with socket.stream(event_ids={"5012"}) as events:
+                async for event in events:
+                    received.append(event["context"]["eventId"])
+                    if len(received) == 3:
+                        break
+                self.assertTrue(socket.running)
+            await socket.client.aclose()
+            return received
+
+        self.assertEqual(self.run_until_complete(consume()), ["5012"] * 3)
+        self.assertFalse(socket.running)
+        self.assertEqual(socket.streams, [])
+
+    def test_close_ends_the_iteration(self):
+        socket = self.make_socket("close")
+
+        async def consume():
+            received = []
+            async with socket.stream(event_ids={"5012"}) as events:
+
+                async def iterate():
+                    async for event in events:
+                        received.append(event)
+
+                consumer = asyncio.create_task(iterate())
+                while len(received) < 3:
+                    await asyncio.sleep(0.01)
+                # the consumer is waiting for the next event
+                await events.close()
+                await consumer
+            await socket.client.aclose()
+            return received
+
+        self.assertEqual(len(self.run_until_complete(consume())), 3)
+        self.assertFalse(socket.running)
+
+    def test_leaving_the_stream_right_away(self):
+        socket = self.make_socket("leave")
+
+        async def enter_and_leave():
+            # the run task has not started when the stream is closed
+            async with socket.stream():
+                pass
+            await socket.client.aclose()
+
+        self.run_until_complete(enter_and_leave())
+        self.assertFalse(socket.running)
+        self.assertFalse(socket.disconnect_requested)
+        self.assertEqual(socket.reconnect_metrics.connections, 0)
+
+    def test_a_connection_error_reaches_the_consumer(self):
+        socket = self.make_socket(
+            "error", socket_reconnect_options={"max_attempts": 0}
+        )
+        # nothing listens on port 1
+        socket.client.session_configuration.port = 1
+
+        async def consume():
+            async with socket.stream() as events:
+                async for event in events:
+                    pass
+
+        with self.assertLogs(level="WARNING"):
+            with self.assertRaises(OSError):
+                self.run_until_complete(consume())
+
+
+class TestFive9EventStreamQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_a_full_queue_holds_the_reader(self):
+        socket = make_socket()
+        socket.build_handlers()
+        socket.dispatcher = Five9EventDispatcher(metrics=socket.metrics)
+        # attach to a socket that is already running, as under a session manager
+        socket.running = True
+        events = socket.stream(max_queue=2)
+        await events.__aenter__()
+
+        reader = asyncio.create_task(
+            socket.handle_messages(InMemoryWebSocket([statistics_frame(n) for n in range(5)]))
+        )
+        await asyncio.sleep(0.05)
+        # two events queued and the reader waiting to queue the third
+        self.assertFalse(reader.done())
+        self.assertTrue(events.queue.full())
+        self.assertEqual(socket.messages_received, 3)
+
+        received = [(await events.__anext__())["payLoad"] for _ in range(5)]
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+        await reader
+        await socket.dispatcher.close(drain=True)
+
+        # attached streams leave the socket running, close() still ends them
+        consumer = asyncio.create_task(events.__anext__())
+        await asyncio.sleep(0.01)
+        await events.close()
+        with self.assertRaises(StopAsyncIteration):
+            await consumer
+        self.assertTrue(socket.running)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.methods.base import SupervisorRestMethod
+from five9_agent_sup_rest.methods.supervisor_methods import GetAlertByID
+from five9_agent_sup_rest.transport import Five9HttpTransport
+
+from benchmarks.standin import StandInServer, StandInSessionConfig
+
+
+THREADS = 16
+CALLS_PER_THREAD = 50
+
+
+class LegacyGetAlertByID(SupervisorRestMethod):
+    """Written against the original pattern, with per-call state on the instance"""
+
+    def invoke(self, alert_id):
+        self.method = "GET"
+        self.path = f"/alerts/{alert_id}"
+        # let other threads run between setting the state and using it
+        time.sleep(0.001)
+        return super().invoke()
+
+    def process_response(self, response):
+        return response.json()
+
+
+class ResponseReadingGetAlertByID(SupervisorRestMethod):
+    """Written as the original README showed, reading self.response after
+    super().invoke()"""
+
+    def invoke(self, alert_id):
+        self.method = "GET"
+        self.path = f"/alerts/{alert_id}"
+        super().invoke()
+        time.sleep(0.001)
+        return self.response.json()
+
+
+class TestConcurrentInvoke(unittest.TestCase):
+    """Many threads share one method instance against the echoing stand-in, which
+    answers every request with its own path"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(use_tls=False).__enter__()
+        cls.transport = Five9HttpTransport(pool_maxsize=THREADS)
+        cls.config = StandInSessionConfig(
+            cls.server.base_url, transport=cls.transport
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.transport.close()
+        cls.server.__exit__()
+
+    def hammer(self, method):
+        def worker(thread_index):
+            mismatches = []
+            for call in range(CALLS_PER_THREAD):
+                alert_id = f"{thread_index}-{call}"
+                result = method.invoke(alert_id)
+                if not result["path"].endswith(f"/alerts/{alert_id}"):
+                    mismatches.append((alert_id, result["path"]))
+            return mismatches
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(worker, range(THREADS)))
+        return [mismatch for mismatches in results for mismatch in mismatches]
+
+    def test_responses_are_not_cross_wired(self):
+        self.assertEqual(self.hammer(GetAlertByID(self.config)), [])
+
+    def test_original_style_methods_are_serialized(self):
+        self.assertEqual(self.hammer(LegacyGetAlertByID(self.config)), [])
+
+    def test_original_style_methods_can_read_the_response(self):
+        self.assertEqual(self.hammer(ResponseReadingGetAlertByID(self.config)), [])
+
+
+class TestConcurrentNamespaceAccess(unittest.TestCase):
+    def test_threads_share_one_method_instance(self):
+        namespace = Five9RestClient.RESTNamespace(
+            "supervisor_methods", StandInSessionConfig("https://five9.invalid")
+        )
+        barrier = threading.Barrier(THREADS)
+
+        def first_access(_):
+            barrier.wait()
+            return namespace.GetAlertByID
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            methods = list(pool.map(first_access, range(THREADS)))
+        self.assertEqual(len({id(method) for method in methods}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
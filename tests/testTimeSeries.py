@@ -0,0 +1,85 @@
+import math
+import unittest
+
+from five9_agent_sup_rest import timeseries
+from five9_agent_sup_rest.timeseries import QueueTimeSeries
+
+
+def row(queue_id, calls, longest=0):
+    return {"id": queue_id, "callsInQueue": calls, "longestQueueTime": longest}
+
+
+@unittest.skipIf(timeseries.numpy is None, "numpy is not installed")
+class TestQueueTimeSeries(unittest.TestCase):
+    def setUp(self):
+        self.series = QueueTimeSeries(capacity=5, initial_queues=2)
+
+    def test_queues_an_update_leaves_out_carry_their_value_forward(self):
+        self.series.load_snapshot([row("1", 4), row("2", 10)], at=100)
+        self.series.apply_delta({"updated": [row("1", 6)]}, at=101)
+
+        times, values = self.series.window("callsInQueue")
+        self.assertEqual(times.tolist(), [100, 101])
+        self.assertEqual(values.tolist(), [[4, 6], [10, 10]])
+        self.assertEqual(self.series.by_queue(self.series.mean("callsInQueue")), {"1": 5, "2": 10})
+
+    def test_updates_within_the_resolution_share_a_sample(self):
+        self.series.load_snapshot([row("1", 4)], at=100.2)
+        self.series.apply_delta({"updated": [row("1", 8)]}, at=100.7)
+        self.assertEqual(self.series.samples, 1)
+        self.assertEqual(self.series.latest("callsInQueue").tolist(), [8])
+        self.assertEqual(self.series.window("callsInQueue")[1].tolist(), [[8]])
+
+    def test_memory_is_fixed_and_the_oldest_samples_are_overwritten(self):
+        self.series.load_snapshot([row("1", 0)], at=0)
+        nbytes = self.series.nbytes
+        for second in range(1, 12):
+            self.series.apply_delta({"updated": [row("1", second)]}, at=second)
+
+        self.assertEqual(self.series.nbytes, nbytes)
+        times, values = self.series.window("callsInQueue")
+        self.assertEqual(times.tolist(), [7, 8, 9, 10, 11])
+        self.assertEqual(values.tolist(), [[7, 8, 9, 10, 11]])
+        self.assertEqual(self.series.window("callsInQueue", seconds=2)[0].tolist(), [10, 11])
+        self.assertEqual(self.series.max("callsInQueue", seconds=2).tolist(), [11])
+
+    def test_aggregates_across_queues(self):
+        for second in range(5):
+            self.series.apply_delta(
+                {"updated": [row("up", 2 * second, 30), row("flat", 3, 10 * second)]},
+                at=1000 + second,
+            )
+
+        slopes = self.series.by_queue(self.series.slope("callsInQueue"))
+        self.assertAlmostEqual(slopes["up"], 2, places=5)
+        self.assertAlmostEqual(slopes["flat"], 0, places=5)
+        self.assertEqual(self.series.by_queue(self.series.min("callsInQueue"))["up"], 0)
+        self.assertEqual(
+            self.series.by_queue(self.series.percentile("longestQueueTime", 50))["flat"], 20
+        )
+
+        # the newest sample counts fully, one halflife back half as much
+        ewma = self.series.by_queue(self.series.ewma("callsInQueue", halflife=1, seconds=1.5))
+        self.assertAlmostEqual(ewma["up"], (8 + 6 * 0.5) / 1.5, places=5)
+
+    def test_added_and_removed_queues(self):
+        self.series.load_snapshot([row("1", 1)], at=0)
+        # more queues than reserved
+        self.series.apply_delta({"added": [row("2", 2), row("3", 3)]}, at=1)
+        self.series.apply_delta({"removed": [{"id": "1"}]}, at=2)
+
+        self.assertEqual(len(self.series), 3)
+        self.assertEqual(
+            self.series.by_queue(self.series.mean("callsInQueue")),
+            {"1": 1, "2": 2, "3": 3},
+        )
+        self.assertTrue(math.isnan(self.series.mean("callsInQueue", seconds=0.5)[0]))
+        self.assertTrue(math.isnan(self.series.slope("callsInQueue", seconds=1)[0]))
+
+    def test_empty(self):
+        self.assertEqual(self.series.mean("callsInQueue").tolist(), [])
+        self.assertEqual(self.series.ewma("callsInQueue", halflife=60).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
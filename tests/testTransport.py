@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+
+import urllib3
+
+from five9_agent_sup_rest.client import Five9RestClient
+from five9_agent_sup_rest.transport import Five9HttpTransport
+
+from benchmarks.standin import Five9StandIn
+
+
+class TestFive9HttpTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = Five9StandIn().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.__exit__(None, None, None)
+
+    def setUp(self):
+        # the stand-in's certificate is self-signed
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.transport = Five9HttpTransport(verify=False)
+        self.addCleanup(self.transport.close)
+
+    def make_client(self, username, **options):
+        client = Five9RestClient(
+            username=username, password="x", **self.standin.client_options(), **options
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_clients_share_one_pooled_connection(self):
+        first = self.make_client("first", transport=self.transport)
+        second = self.make_client("second", transport=self.transport)
+        self.assertIs(first.session_configuration.transport, self.transport)
+        self.assertIs(second.supervisor.GetAlerts.config.transport, self.transport)
+
+        for _ in range(3):
+            first.supervisor.GetAlerts.invoke()
+            second.supervisor.GetAlerts.invoke()
+
+        base_api_url = first.session_configuration.base_api_url
+        pool_manager = self.transport.session.get_adapter(base_api_url).poolmanager
+        self.assertEqual(len(pool_manager.pools), 1)
+        # the logins and every call went over one keep-alive connection
+        self.assertEqual(pool_manager.connection_from_url(base_api_url).num_connections, 1)
+
+    def test_close_only_closes_an_owned_transport(self):
+        shared = self.make_client("shared", transport=self.transport)
+        owner = self.make_client("owner")
+        self.assertFalse(shared.owns_transport)
+        self.assertTrue(owner.owns_transport)
+
+        with patch.object(self.transport, "close") as shared_close:
+            shared.close()
+        shared_close.assert_not_called()
+
+        with patch.object(owner.transport, "close", wraps=owner.transport.close) as owned_close:
+            owner.close()
+        owned_close.assert_called_once()
+
+    def test_sessions_do_not_share_cookies(self):
+        first = self.make_client("first", transport=self.transport)
+        second = self.make_client("second", transport=self.transport)
+        first_token = first.session_configuration.tokenId
+        second_token = second.session_configuration.tokenId
+
+        # the login cookies stay with each session, not on the shared transport
+        self.assertEqual(len(self.transport.session.cookies), 0)
+        self.assertIn(first_token, first.session_configuration.cookies_header)
+        self.assertNotIn(second_token, first.session_configuration.cookies_header)
+        self.assertIn(second_token, second.session_configuration.cookies_header)
+
+        # requests through the session would carry any cookies it had stored
+        response = self.transport.get(
+            f"{first.session_configuration.base_api_url}/appsvcs/rs/svc/auth/metadata",
+            headers=first.session_configuration.api_header,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Cookie", response.request.headers)
+
+if __name__ == "__main__":
+    unittest.main()